@@ -1,259 +1,245 @@
+"""
+Get the WRAL weather of one or more zipcodes from the command line.
+
+  python3 app_wral.py 27513 27606 ...
+  python3 app_wral.py --file zipcodes.txt --concurrency 16
+  python3 app_wral.py --profile --iterations 50 [--payload weather.json]
+
+Prints one compact JSON line per zipcode (as each one completes) with
+  its current, daily and hourly data plus the matching HA conditions,
+  or with the error if it could not be fetched.  '--text' prints one
+  zipcode's data as readable lines instead.
+'--profile' instead updates one zipcode a number of times (or only
+  parses a saved '/api/weather' response, with '--payload') and prints
+  the time of each stage, plus a cProfile of it with '--pstats'.
+"""
+import argparse
 import asyncio
 import aiohttp
-from datetime import timedelta, datetime
-import pytz
+import cProfile
+import json
+import pstats
 import logging
 import sys
-from wral_weather import WralWeather
+import time
+from wral_weather import (
+    NUM_FORECAST_HOURS, RollingHistogram, WralMetrics, WralWeather,
+    apparent_temperatures_hourly, wral2ha_condition)
 
 ZIPCODE = '27513'
+CONCURRENCY = 8
+PROFILE_ITERATIONS = 10
+# Stages of an update, as timed by WralWeather.metrics
+PROFILE_STAGES = ("city_lookup", "ttfb", "weather_fetch", "decode",
+                  "current", "daily", "hourly", "index")
 
 # Setup Logger for wral_weather.
 #   Use the same Logger for this app.
-#   If you want to see output from the
-#   wral_weather.py debug and this app's debug
-#   then change the _LOGGER.setLevel from NOTSET to DEBUG.
+#   Logs go to stderr, so they don't mix with the JSON lines;
+#   use '--debug' to see the wral_weather.py debug and this app's debug.
 _LOGGER = logging.getLogger('wral_weather')
 formatter = \
     logging.Formatter('%(levelname)s %(asctime)s %(filename)s - %(message)s')
-handler1 = logging.StreamHandler(sys.stdout)
+handler1 = logging.StreamHandler(sys.stderr)
 handler1.setFormatter(formatter)
 handler1.setLevel(logging.DEBUG)
 _LOGGER.addHandler(handler1)
-_LOGGER.setLevel(logging.DEBUG)
-
-# The following dictionary is needed for HA
-WRAL_CONDITION_CLASSES = {
-      "exceptional": ["very-cold", "very-hot", "freezing",
-                      "frost", "humid", "smoke"],
-      "snowy": ["snow", "day-chance-snow", "night-chance-snow",
-                "snow-sleet", "day-chance-snow-sleet",
-                "night-chance-snow-sleet"],
-      "snowy-rainy": ["day-chance-sleet", "night-chance-sleet",
-                      "day-chance-snow-and-sleet",
-                      "night-chance-snow-and-sleet",
-                      "rain-snow", "day-chance-rain-and-snow",
-                      "night-chance-rain-and-snow",
-                      "rain-sleet", "day-chance-rain-and-sleet",
-                      "night-chance-rain-and-sleet", "sleet",
-                      "freezing-rain", "day-chance-freezing-rain",
-                      "night-chance-freezing-rain"],
-      "hail": [],
-      "lightning-rainy": ["thunderstorms-rain",
-                          "day-chance-rain-and-tstorms",
-                          "night-chance-rain-and-tstorms"],
-      "lightning": ["thunderstorm", "day-chance-tstorm",
-                    "night-chance-tstorm"],
-      "pouring": [],
-      "rainy": ["rain", "day-chance-rain", "night-chance-rain",
-                "rain-showers", "day-chance-rain-showers",
-                "night-chance-rain-showers",
-                "drizzle", "day-chance-drizzle", "night-chance-drizzle"],
-      "windy-variant": [],
-      "windy": ["windy"],
-      "fog": ["misc-fog"],
-      "clear": ["day-clear", "night-clear",
-                "day-dry", "night-dry"],
-      "cloudy": ["cloudy", "day-mostly-cloudy", "night-mostly-cloudy"],
-      "partlycloudy": ["day-mostly-clear", "night-mostly-clear",
-                       "day-partly-cloudy", "night-partly-cloudy"
-                       "day-haze", "night-haze",
-                       "day-dust", "night-dust"],
-    }
-
-
-def wral2ha_condition(wral_cond):
-    """
-    Convert WRAL Condition (current or forecast) to
-    HA hui-weather-forecast-card weatherIcons.
-    """
-    for key, value in WRAL_CONDITION_CLASSES.items():
-        if wral_cond in value:
-            break
-    found = wral_cond.find("night")
-    if found != -1:
-        time = "night"
-    else:
-        time = "day"
-    _LOGGER.debug("Icon Day or Night: %s", time)
-    cond = key
-    if cond == "clear":
-        if time == "day":
-            return "sunny"
-        if time == "night":
-            return "clear-night"
-    return cond
+_LOGGER.setLevel(logging.WARNING)
 
 
-def forecast_day2iso(day, offset_from_today):
+# Reference for Apparent Temperature:
+# https://digital.weather.gov/staticpages/definitions.php
+def weather_record(wral):
     """
-       Convert WRAL forecast day string to time in UTC ISO format.
-       Pass in that day's day string and how many days from today.
-       Check to make sure the day string being converted is
-       the correct day from today. If not, then force to be current time.
-       The incoming day string is assumed to be 3 alpha Chars.
-       This is for use with HA.
+    Return the current, daily and hourly data of an updated WralWeather
+      with the HA condition of each (and the hourly apparent temperature).
     """
-    today = datetime.now()
-    current_day_name = (today.strftime("%A"))[:3]
-    _LOGGER.debug("Current Day: %s", current_day_name)
-    _LOGGER.debug("Num days from today: %i", offset_from_today)
-    offset_datetime = today + timedelta(days=offset_from_today)
-    offset_day_name = (offset_datetime.strftime("%A"))[:3]
-    _LOGGER.debug("Offset Day Name: %s", offset_day_name)
-
-    if offset_day_name == day:
-        tempstring = offset_datetime.strftime("%Y-%m-%d") + "T05:00:00"
-        _LOGGER.debug("%s", tempstring)
-        temp_datetime = datetime.strptime(tempstring, "%Y-%m-%dT%H:%M:%S")
-        utc_datetime_iso = pytz.utc.localize(temp_datetime).isoformat()
-        _LOGGER.debug("%s", utc_datetime_iso)
-        return utc_datetime_iso
-    else:
-        utc_datetime_iso = pytz.utc.localize(today).isoformat()
-        return utc_datetime_iso
+    current = dict(wral.curr_dict, ha_condition=wral2ha_condition(
+        wral.curr_dict.get("current_icon_conditions")))
+    daily = [dict(day, ha_condition=wral2ha_condition(day["icon_condition"]))
+             for day in wral.forecast_daily_list]
+    apparent_temps = apparent_temperatures_hourly(wral.forecast_hourly_list)
+    hourly = [dict(hour, ha_condition=wral2ha_condition(hour["icon_condition"]),
+                   apparent_temperature=apparent_temp)
+              for hour, apparent_temp
+              in zip(wral.forecast_hourly_list, apparent_temps)]
+    return {"current": current, "daily": daily, "hourly": hourly}
+
+def api_urls(api):
+    """Return the WralWeather urls of a WRAL API (ex. a local stand-in)."""
+    if api is None:
+        return None
+    api = api.rstrip("/")
+    return {
+        "city_search_pre": f"{api}/api/city/search?query=",
+        "weather_pre": f"{api}/api/weather?city=",
+    }
 
-def forecast_hour2iso(hour):
+async def fetch_zipcode(client, semaphore, zipcode, args):
+    """Update one zipcode, return the record for its line."""
+    wral = WralWeather(client, zipcode=zipcode, num_hours=args.hours,
+                       urls=api_urls(args.api))
+    async with semaphore:
+        try:
+            await wral.update_observation_and_forecast()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Failed to update %s: %r", zipcode, err)
+            return {"zipcode": zipcode, "ok": False,
+                    "error": f"{type(err).__name__}: {err}"}
+    return dict({"zipcode": zipcode, "ok": True}, **weather_record(wral))
+
+def print_text(record):
+    """Print one zipcode's record as readable lines."""
+    for key, value in record["current"].items():
+        print(f"Current {key:<27}", value)
+    print("")
+    for i, day in enumerate(record["daily"]):
+        for key, value in day.items():
+            print(f"Day  {i:<3} {key:<22}", value)
+        print("")
+    for i, hour in enumerate(record["hourly"]):
+        for key, value in hour.items():
+            print(f"Hour {i:<3} {key:<22}", value)
+        print("")
+
+def read_zipcodes(args):
+    """Return the zipcodes of the arguments and '--file', in order."""
+    zipcodes = list(args.zipcodes)
+    if args.file:
+        with (sys.stdin if args.file == "-"
+              else open(args.file, encoding="utf-8")) as zip_file:
+            for line in zip_file:
+                zipcode = line.split("#", 1)[0].strip()
+                if zipcode:
+                    zipcodes.append(zipcode)
+    return zipcodes or [ZIPCODE]
+
+def parse_args(argv=None):
+    """Return the command line options."""
+    parser = argparse.ArgumentParser(
+        description="Get the WRAL weather of zipcodes as JSON lines.")
+    parser.add_argument("zipcodes", nargs="*",
+                        help=f"zipcodes to get (default {ZIPCODE})")
+    parser.add_argument("-f", "--file",
+                        help="file of zipcodes, one per line ('-' for stdin)")
+    parser.add_argument("-c", "--concurrency", type=int, default=CONCURRENCY,
+                        help="zipcodes fetched at once (default %(default)s)")
+    parser.add_argument("--hours", type=int, default=NUM_FORECAST_HOURS,
+                        help="hourly forecasts to keep (default %(default)s)")
+    parser.add_argument("--api",
+                        help="WRAL API to use instead, ex. a local stand-in "
+                        "(http://127.0.0.1:8080)")
+    parser.add_argument("--text", action="store_true",
+                        help="print readable lines instead of JSON")
+    parser.add_argument("--debug", action="store_true",
+                        help="log the wral_weather debug to stderr")
+    profile = parser.add_argument_group("profiling")
+    profile.add_argument("--profile", action="store_true",
+                         help="time the update stages of the first zipcode")
+    profile.add_argument("-n", "--iterations", type=int,
+                         default=PROFILE_ITERATIONS,
+                         help="updates to time (default %(default)s)")
+    profile.add_argument("--payload",
+                         help="only parse this saved /api/weather response")
+    profile.add_argument("--pstats", nargs="?", const="", metavar="FILE",
+                         help="also cProfile the updates, printing the "
+                         "slowest calls (by cumulative time) and dumping "
+                         "the stats to FILE if given")
+    profile.add_argument("--top", type=int, default=25,
+                         help="calls printed with --pstats "
+                         "(default %(default)s)")
+    return parser.parse_args(argv)
+
+def print_stage_times(wral, totals):
+    """Print the count, mean, p50 and max time of each stage."""
+    print(f"{'stage':<14} {'count':>6} {'mean ms':>9} {'p50 ms':>9} "
+          f"{'max ms':>9}")
+    histograms = dict(wral.metrics.histograms, total=totals)
+    for stage in PROFILE_STAGES + ("total",):
+        summary = histograms[stage].summary()
+        if not summary["count"]:
+            continue
+        print(f"{stage:<14} {summary['count']:>6} "
+              + " ".join(f"{summary[stat] * 1000:>9.3f}"
+                         for stat in ("mean", "p50", "max")))
+    payload = histograms["payload_bytes"].last
+    if payload is not None:
+        print(f"payload {payload / 1024:.1f} KiB")
+
+async def profile(args):
     """
-       Convert WRAL forecast hour string to time in UTC ISO format.
-       This is for use with HA.
+    Update the first zipcode (or parse the '--payload') 'iterations'
+      times, printing the stage times and the cProfile if asked for.
     """
-    tz = datetime.now().astimezone().tzinfo
-    return datetime.fromtimestamp(hour, tz).isoformat()
-
-async def main():
-# Reference for Apparent Temperature:
-# https://digital.weather.gov/staticpages/definitions.php
-
+    zipcode = read_zipcodes(args)[0]
+    body = None
+    if args.payload:
+        with open(args.payload, "rb") as payload_file:
+            body = payload_file.read()
+    profiler = cProfile.Profile() if args.pstats is not None else None
+    totals = RollingHistogram(args.iterations)
     async with aiohttp.ClientSession() as client:
-        wral = WralWeather(client, zipcode=ZIPCODE)
-        results = await wral.update_observation_and_forecast()
-
-        curr_cond = wral.curr_dict["current_icon_conditions"]
-        print('Current WRAL Condition:    ',
-              wral.curr_dict["current_conditions"])
-        print('Current WRAL IconCondition:',
-              wral.curr_dict["current_icon_conditions"])
-        curr_ha_cond = wral2ha_condition(curr_cond)
-        print('Current HA Condition:      ', curr_ha_cond)
-        print('Current Temperature:       ',
-              wral.curr_dict["current_temperature"])
-        print('Current Dew Point:         ',
-              wral.curr_dict["current_dew_point"])
-        print('Current Relative Humidity: ',
-              wral.curr_dict["current_relative_humidity"])
-        print('Current Wind Direction:    ',
-              wral.curr_dict["current_wind_direction"])
-        print('Current Wind Speed:        ',
-              wral.curr_dict["current_wind_speed"])
-        print('Current Wind Gusts:        ',
-              wral.curr_dict["current_wind_gusts"])
-        print('Current Wind Bearing:      ',
-              wral.curr_dict["current_wind_bearing"])
-        print('Current Wind Chill:        ',
-              wral.curr_dict["current_wind_chill"])
-        print('Current Heat Index:        ',
-              wral.curr_dict["current_heat_index"])
-        print('Current Pressure:          ',
-              wral.curr_dict["current_pressure"])
-        print('Current Visibility:        ',
-              wral.curr_dict["current_visibility"])
-        print('Current Hourly Precip:     ',
-              wral.curr_dict["current_hourly_precip"])
-        _LOGGER.debug("Current Dictionary: %s", wral.curr_dict)
-        print('')
-
-        i = 0
-        for todays_forecast in wral.forecast_daily_list:
-            _LOGGER.debug("Today's Forecast %s ", todays_forecast)
-            print("Day  ", i, "  Which Day      ",
-                  todays_forecast["which_day"])
-           #iso_day = forecast_day2iso(todays_forecast["which_day"], i)
-           #_LOGGER.debug("Day %i Which ISO Day %s ", i, iso_day)
-            print("Day  ", i, "  Datetime       ", 
-                 todays_forecast["which_day_dt"])
-            print("Day  ", i, "  Condition      ",
-                  todays_forecast["condition"])
-            print("Day  ", i, "  Icon Condition ",
-                  todays_forecast["icon_condition"])
-            forecast_cond = todays_forecast["icon_condition"]
-            forecast_ha_cond = wral2ha_condition(forecast_cond)
-            print("Day  ", i, "  HA Condition   ", forecast_ha_cond)
-            print("Day  ", i, "  High Temp      ",
-                  todays_forecast["high_temperature"])
-            print("Day  ", i, "  Low Temp       ",
-                  todays_forecast["low_temperature"])
-            print("Day  ", i, "  Sunrise        ",
-                  todays_forecast["sunrise"])
-            print("Day  ", i, "  Sunset:        ",
-                  todays_forecast["sunset"])
-            print("Day  ", i, "  Precip Prob    ",
-                  todays_forecast["precipitation"])
-            print("Day  ", i, "  Wind Direction ",
-                  todays_forecast["wind_direction"])
-            print("Day  ", i, "  Wind Speed     ",
-                  todays_forecast["wind_speed"])
-            print("Day  ", i, "  Wind Bearing   ",
-                  todays_forecast["wind_bearing"])
-            print("Day  ", i, "  Heat Index     ",
-                  todays_forecast["heat_index"])
-            print("Day  ", i, "  Wind Chill     ",
-                  todays_forecast["wind_chill"])
-            print("Day  ", i, "  Dew Point      ",
-                  todays_forecast["dew_point"])
-            print("Day  ", i, "  Details:       ")
-            print(" -", todays_forecast["detailed_description"])
-            print("")
-            i = i + 1
-
-        i = 0
-        for hours_forecast in wral.forecast_hourly_list:
-            _LOGGER.debug("Today's Hourly Forecast %s ", hours_forecast)
-            print("Hour ", i, "  Which Hour DT  ",
-                  hours_forecast["which_hour_dt"])
-            print("Hour ", i, "  Condition      ",
-                  hours_forecast["condition"])
-            print("Hour ", i, "  Icon Condition ",
-                  hours_forecast["icon_condition"])
-            forecast_cond = hours_forecast["icon_condition"]
-            forecast_ha_cond = wral2ha_condition(forecast_cond)
-            print("Hour ", i, "  HA Condition   ", forecast_ha_cond)
-            print("Hour ", i, "  Temperature    ",
-                  hours_forecast["temperature"])
-            print("Hour ", i, "  Precip Prob    ",
-                  hours_forecast["precipitation"])
-            print("Hour ", i, "  Wind Direction ",
-                  hours_forecast["wind_direction"])
-            print("Hour ", i, "  Wind Speed     ",
-                  hours_forecast["wind_speed"])
-            print("Hour ", i, "  Wind Bearing   ",
-                  hours_forecast["wind_bearing"])
-            print("Hour ", i, "  Humidity       ",
-                  hours_forecast["humidity"])
-            print("Hour ", i, "  Dew Point      ",
-                  hours_forecast["dew_point"])
-            print("Hour ", i, "  Heat Index     ",
-                  hours_forecast["heat_index"])
-            print("Hour ", i, "  Wind Chill     ",
-                  hours_forecast["wind_chill"])
-            print("Hour ", i, "  Cloud Cover    ",
-                  hours_forecast["cloud_cover"])
-
-            #Compute Apparent Temperature            
-            if hours_forecast["temperature"] <= 50:
-                apparent_temp = hours_forecast["wind_chill"]
-            elif hours_forecast["temperature"] > 80:
-                apparent_temp = hours_forecast["heat_index"]
+        wral = WralWeather(client, zipcode=zipcode, num_hours=args.hours,
+                           urls=api_urls(args.api))
+        # Keep every iteration, not only the last METRICS_WINDOW
+        wral.metrics = WralMetrics(args.iterations)
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            if profiler is not None:
+                profiler.enable()
+            if body is None:
+                await wral.update_observation_and_forecast()
             else:
-                apparent_temp = hours_forecast["temperature"]
-            print("Hour ", i, "  Apparent Temp  ",
-                   apparent_temp)
-
-            print("")
-            i = i + 1
+                await wral.async_parse_weather(body)
+            if profiler is not None:
+                profiler.disable()
+            totals.add(time.perf_counter() - start)
+
+    print(f"{'parse' if body is not None else 'fetch+parse'} of "
+          f"{args.payload if body is not None else zipcode}, "
+          f"{args.iterations} iterations, {args.hours} hours")
+    print_stage_times(wral, totals)
+    if profiler is not None:
+        print("")
+        stats = pstats.Stats(profiler, stream=sys.stdout)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(args.top)
+        if args.pstats:
+            stats.dump_stats(args.pstats)
+            print(f"cProfile stats written to {args.pstats}")
+
+async def main(args):
+    """Fetch all the zipcodes, printing a line for each as it completes."""
+    zipcodes = read_zipcodes(args)
+    semaphore = asyncio.Semaphore(max(args.concurrency, 1))
+    failed = 0
+    start = time.perf_counter()
+    connector = aiohttp.TCPConnector(limit=max(args.concurrency, 1))
+    async with aiohttp.ClientSession(connector=connector) as client:
+        tasks = [fetch_zipcode(client, semaphore, zipcode, args)
+                 for zipcode in zipcodes]
+        for task in asyncio.as_completed(tasks):
+            record = await task
+            if not record["ok"]:
+                failed += 1
+            if args.text:
+                print(f"Zipcode {record['zipcode']}" +
+                      ("" if record["ok"] else f": {record['error']}"))
+                if record["ok"]:
+                    print_text(record)
+            else:
+                print(json.dumps(record, separators=(",", ":"), default=str),
+                      flush=True)
+    _LOGGER.info("%d zipcodes in %.2f s, %d failed", len(zipcodes),
+                 time.perf_counter() - start, failed)
+    return failed
 
 if __name__ == '__main__':
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(main())
-
-_LOGGER.debug("Finished Running App")
+    options = parse_args()
+    if options.debug:
+        _LOGGER.setLevel(logging.DEBUG)
+    if options.profile:
+        asyncio.run(profile(options))
+        sys.exit(0)
+    num_failed = asyncio.run(main(options))
+    _LOGGER.debug("Finished Running App")
+    sys.exit(1 if num_failed else 0)
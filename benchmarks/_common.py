@@ -0,0 +1,32 @@
+"""Shared helpers for the WRAL Weather benchmark scripts.
+
+The scripts are run directly, ex. `python3 benchmarks/bench_parse.py`.
+Importing this module puts the repository root and the integration
+directory on sys.path, so a script can either import the HA integration
+as `custom_components.wral_weather.xxx` or the stand alone modules
+(ex. `wral_weather`) the same way `app_wral.py` does.
+"""
+import os
+import sys
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPONENT_DIR = os.path.join(REPO_ROOT, "custom_components", "wral_weather")
+
+for _path in (REPO_ROOT, COMPONENT_DIR):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+
+def best_of(func, number=1000, repeat=5):
+    """Return the best time per call (in seconds) of func()."""
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def report(label, seconds, baseline=None):
+    """Print one result line, optionally relative to a baseline time."""
+    line = f"{label:<44} {seconds * 1e6:10.2f} us"
+    if baseline:
+        line += f"   x{baseline / seconds:5.2f}"
+    print(line)
@@ -0,0 +1,49 @@
+"""Benchmark of the apparent temperature engine over multi-day horizons.
+
+Compares a per-hour loop over the scalar apparent_temperature() with
+the batched apparent_temperatures_hourly(), for one zipcode at 1, 3
+and 7 days of hours and for 50 zipcodes' worth of hours in one call.
+
+A NumPy path was measured here too and dropped: with the hours coming
+in as dicts and going out as a list, building the arrays and turning
+the result back into Python numbers cost more than the vectorised
+selection saved, 2 to 7 times slower than the scalar loop from 24
+hours up to 8400 values (50 zipcodes of 168 hours).
+
+Run: `python3 benchmarks/bench_apparent.py`
+"""
+from _common import best_of, report
+from payloads import make_weather_payload
+
+from wral_weather import (
+    apparent_temperature,
+    apparent_temperatures_hourly,
+    parse_forecast_hourly,
+)
+
+HORIZONS = (("24 hours", 24, 1), ("72 hours", 72, 1), ("168 hours", 168, 1),
+            ("168 hours x 50 zipcodes", 168, 50))
+
+
+def main():
+    """Time each way of computing the hours' apparent temperatures."""
+    for label, num_hours, copies in HORIZONS:
+        forecast = make_weather_payload(num_hours)["data"]["forecast"]
+        hours = parse_forecast_hourly(forecast, num_hours) * copies
+        print(f"--- {label} ({len(hours)} values)")
+
+        def scalar():
+            return [apparent_temperature(hour.get("temperature"),
+                                         hour.get("heat_index"),
+                                         hour.get("wind_chill"))
+                    for hour in hours]
+        baseline = best_of(scalar, number=100)
+        report("scalar loop", baseline)
+
+        assert apparent_temperatures_hourly(hours) == scalar()
+        report("batched", best_of(lambda: apparent_temperatures_hourly(hours),
+                                  number=100), baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Memory of the WralWeather entries against per entry budgets.
+
+Brings up 1, 50 and 500 WralWeather instances (one per zipcode) and
+has each parse one weather body the way an update does (WRAL always
+sends the whole week, the instances keep 12, 72 or 168 hours of it).
+For each case, tracemalloc measures:
+- retained: what the entries hold once parsed (curr_dict, the daily
+  and hourly lists, the forecast index, metrics, the shared caches)
+  per entry
+- peak: the most memory above that while an update runs
+
+The shared caches (strings, timestamps) start empty in every case.
+Exits with status 1 when a case is over MEMORY_BUDGETS_KIB, so it can
+be used as a check.
+
+Run: `python3 benchmarks/bench_budget.py [--zipcodes 1 50 500]
+      [--hours 12 72 168]`
+"""
+import argparse
+import asyncio
+import gc
+import sys
+import tracemalloc
+
+import _common  # noqa: F401  (sets up sys.path)
+from payloads import make_weather_bytes
+
+import wral_weather
+from wral_weather import WralWeather
+
+# Hours kept -> (retained per entry, peak of an update) budgets, in KiB,
+#   about 20% over what they took when set (one entry alone, with the
+#   shared caches to itself, takes the most).  The peak is mostly the
+#   decode of the whole week, whatever the hours kept (see bench_peak.py)
+MEMORY_BUDGETS_KIB = {
+    12: (60, 600),
+    72: (150, 650),
+    168: (290, 700),
+}
+ZIPCODE_COUNTS = (1, 50, 500)
+
+
+def reset_shared_caches():
+    """Empty the caches shared by all the entries."""
+    wral_weather.STRINGS.clear()
+    wral_weather.TIMESTAMPS.clear()
+
+
+def measure(num_entries, num_hours, bodies):
+    """Return (retained bytes per entry, peak bytes over the retained)."""
+    loop = asyncio.new_event_loop()
+    reset_shared_caches()
+    gc.collect()
+    tracemalloc.start()
+    wrals = []
+    peak_over = 0
+    try:
+        for i in range(num_entries):
+            wral = WralWeather(None, str(27000 + i), num_hours)
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            loop.run_until_complete(
+                wral.async_parse_weather(bodies[i % len(bodies)]))
+            _, peak = tracemalloc.get_traced_memory()
+            peak_over = max(peak_over, peak - before)
+            wrals.append(wral)
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        loop.close()
+    del wrals
+    return retained / num_entries, peak_over
+
+
+def main():
+    """Measure every case, report it against its budget."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--zipcodes", type=int, nargs="+",
+                        default=ZIPCODE_COUNTS)
+    parser.add_argument("--hours", type=int, nargs="+",
+                        default=sorted(MEMORY_BUDGETS_KIB))
+    args = parser.parse_args()
+
+    # A different (full week) body per zipcode, made before tracing
+    bodies = [make_weather_bytes(seed=seed) for seed in range(max(args.zipcodes))]
+    print(f"{'zipcodes':>8} {'hours':>5}   {'retained/entry':>14} "
+          f"{'budget':>7}   {'peak':>9} {'budget':>7}")
+    over = []
+    for num_hours in args.hours:
+        retained_budget, peak_budget = MEMORY_BUDGETS_KIB.get(
+            num_hours, MEMORY_BUDGETS_KIB[max(MEMORY_BUDGETS_KIB)])
+        for num_entries in args.zipcodes:
+            retained, peak = measure(num_entries, num_hours, bodies)
+            flags = ""
+            if retained > retained_budget * 1024:
+                flags += "  RETAINED OVER"
+            if peak > peak_budget * 1024:
+                flags += "  PEAK OVER"
+            if flags:
+                over.append((num_entries, num_hours))
+            print(f"{num_entries:>8} {num_hours:>5}   "
+                  f"{retained / 1024:>10.1f} KiB {retained_budget:>7}   "
+                  f"{peak / 1024:>5.1f} KiB {peak_budget:>7}{flags}")
+
+    if over:
+        print(f"{len(over)} case(s) over budget")
+        sys.exit(1)
+    print("all cases within budget")
+
+
+if __name__ == "__main__":
+    main()
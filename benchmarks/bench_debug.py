@@ -0,0 +1,87 @@
+"""Poll cost with debug logging off and on.
+
+Times WralWeather.async_parse_weather() (parse on the loop) on one
+weather body with the integration's logger at WARNING and at DEBUG,
+the debug records going through a formatter into memory.  The
+"dump every entry" row adds what the parsers used to log: every raw
+day and hour of the payload.  Also reports how much log text a poll
+writes.
+
+Run: `python3 benchmarks/bench_debug.py [num_hours]`
+"""
+import asyncio
+import io
+import json
+import logging
+import sys
+
+import _common  # noqa: F401  (sets up sys.path)
+from _common import best_of, report
+from payloads import make_weather_bytes
+
+import wral_weather
+from wral_weather import WralWeather
+
+LOGGER = logging.getLogger(wral_weather.__name__)
+
+
+def dump_every_entry(body):
+    """Log every raw day and hour the way the parsers used to."""
+    forecast = json.loads(body)['data']['forecast']
+    for i, entry in enumerate(forecast['forecastDetails']):
+        LOGGER.debug("========Forecast Day %i Details======== ", i)
+        LOGGER.debug("%s", entry)
+        LOGGER.debug("")
+    for i, entry in enumerate(forecast['forecastHourlyDetails']):
+        LOGGER.debug("========Forecast Hour %i Details======== ", i)
+        LOGGER.debug("%s", entry)
+        LOGGER.debug("")
+
+
+def measure(wral, body, level, dump=False):
+    """Return (seconds per poll, log characters per poll) at 'level'."""
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s (%(name)s) %(message)s"))
+    LOGGER.addHandler(handler)
+    LOGGER.setLevel(level)
+    LOGGER.propagate = False
+    loop = asyncio.new_event_loop()
+
+    def poll():
+        loop.run_until_complete(wral.async_parse_weather(body))
+        if dump:
+            dump_every_entry(body)
+
+    try:
+        poll()
+        stream.seek(0)
+        stream.truncate()
+        poll()
+        chars = stream.tell()
+        seconds = best_of(poll, number=20, repeat=5)
+    finally:
+        loop.close()
+        LOGGER.removeHandler(handler)
+    return seconds, chars
+
+
+def main():
+    """Report the poll cost and log volume per logging level."""
+    num_hours = int(sys.argv[1]) if len(sys.argv) > 1 else 168
+    body = make_weather_bytes(num_hours)
+    wral = WralWeather(None, num_hours=num_hours)
+    print(f"{num_hours} hours, {len(body) // 1024} KiB body")
+
+    off, _ = measure(wral, body, logging.WARNING)
+    report("debug off", off)
+    for label, dump in (("debug on, sampled summaries", False),
+                        ("debug on, dump every entry", True)):
+        seconds, chars = measure(wral, body, logging.DEBUG, dump)
+        report(label, seconds, off)
+        print(f"{'':<44} {chars / 1024:10.1f} KiB logged per poll")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""End to end load against the local WRAL stand-in, all offline.
+
+Starts benchmarks/stub_server.py in its own thread, then updates N
+WralWeather instances (one per zipcode, sharing one client session
+like the entries do in HA) for a number of rounds, all the zipcodes of
+a round at once.  With `--coordinator` each update goes through a
+WralDataUpdateCoordinator, on a minimal stand-in for hass, the way the
+integration refreshes.
+
+Reports the requests/sec served, the p50/p99 update latency, the
+update outcomes and the lag of the client's event loop (how late a
+5 ms sleep wakes up while the updates run).
+
+Run: `python3 benchmarks/bench_load.py [--zipcodes 50] [--rounds 5]
+      [--coordinator] [--latency 0.05 --error-rate 0.05 ...]`
+"""
+import argparse
+import asyncio
+import collections
+import datetime
+import logging
+import time
+
+import aiohttp
+
+import _common  # noqa: F401  (sets up sys.path)
+from stub_server import StubServer, add_config_arguments, \
+    config_from_arguments
+
+from wral_weather import (
+    CITY_IDS,
+    PARSE_MODES,
+    PARSE_MODE_LOOP,
+    RollingHistogram,
+    WralWeather,
+)
+
+LAG_INTERVAL = 0.005
+
+
+class HassStandIn:
+    """The little of hass a coordinator uses for a refresh."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.data = {}
+        self.is_stopping = False
+
+    def async_create_task(self, target, name=None, eager_start=False):
+        return self.loop.create_task(target, name=name)
+
+    def async_add_executor_job(self, target, *args):
+        return self.loop.run_in_executor(None, target, *args)
+
+
+async def watch_loop_lag(lags, stop):
+    """Add how late each LAG_INTERVAL sleep wakes up, until stopped."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.add(time.perf_counter() - start - LAG_INTERVAL)
+
+
+def make_updaters(wrals, coordinator):
+    """Return an update coroutine function per WralWeather."""
+    if not coordinator:
+        return [wral.update_observation_and_forecast for wral in wrals]
+
+    # Only needs HA installed when asked for
+    # pylint: disable=import-outside-toplevel
+    from custom_components.wral_weather import WralDataUpdateCoordinator
+
+    hass = HassStandIn()
+    logger = logging.getLogger("bench_load")
+    coordinators = [
+        WralDataUpdateCoordinator(
+            hass, logger, name=f"WRAL observation for {wral.zipcode}",
+            update_method=wral.update_observation_and_forecast,
+            update_interval=datetime.timedelta(minutes=10),
+            failed_update_interval=datetime.timedelta(minutes=1))
+        for wral in wrals]
+    return [coordinator.async_refresh for coordinator in coordinators]
+
+
+async def timed_update(update, latencies, outcomes):
+    """Run one update, adding its latency and outcome."""
+    start = time.perf_counter()
+    try:
+        await update()
+        outcomes["ok"] += 1
+    except Exception as err:  # pylint: disable=broad-except
+        outcomes[type(err).__name__] += 1
+    latencies.add(time.perf_counter() - start)
+
+
+async def run_load(server, args):
+    """Run the rounds, returning (seconds, latencies, lags, outcomes)."""
+    CITY_IDS.clear()
+    # Unbounded windows, every sample counts
+    latencies = RollingHistogram(None)
+    lags = RollingHistogram(None)
+    outcomes = collections.Counter()
+    stop = asyncio.Event()
+    async with aiohttp.ClientSession() as session:
+        wrals = [WralWeather(session, str(27000 + i), args.hours,
+                             args.parse_mode, urls=server.urls())
+                 for i in range(args.zipcodes)]
+        updaters = make_updaters(wrals, args.coordinator)
+        watcher = asyncio.create_task(watch_loop_lag(lags, stop))
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            await asyncio.gather(*(timed_update(update, latencies, outcomes)
+                                   for update in updaters))
+        seconds = time.perf_counter() - start
+        stop.set()
+        await watcher
+    if args.coordinator:
+        # The coordinators catch the errors, count the WralWeather ones
+        failures = sum(wral.metrics.failures for wral in wrals)
+        outcomes["ok"] -= failures
+        outcomes["failed"] = failures
+    return seconds, latencies.summary(), lags.summary(), outcomes
+
+
+def main():
+    """Run the load and report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--zipcodes", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--hours", type=int, default=168)
+    parser.add_argument("--parse-mode", choices=PARSE_MODES,
+                        default=PARSE_MODE_LOOP)
+    parser.add_argument("--coordinator", action="store_true",
+                        help="update through WralDataUpdateCoordinator")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    # The coordinators log every failed update
+    logging.basicConfig(level=logging.CRITICAL)
+
+    with StubServer(config_from_arguments(args)) as server:
+        seconds, latencies, lags, outcomes = asyncio.run(
+            run_load(server, args))
+        served = dict(sorted(server.served.items()))
+
+    requests = sum(served.values())
+    print(f"{args.zipcodes} zipcodes x {args.rounds} rounds, "
+          f"{args.hours} hours, parse mode {args.parse_mode}"
+          f"{', through the coordinator' if args.coordinator else ''}")
+    print(f"{'requests':<20} {requests} in {seconds:.2f} s, "
+          f"{requests / seconds:.1f} req/s")
+    print(f"{'served':<20} {served}")
+    print(f"{'updates':<20} {dict(outcomes)}")
+    for label, summary in (("update latency", latencies),
+                           ("event loop lag", lags)):
+        print(f"{label:<20} " + "   ".join(
+            f"{stat} {summary.get(stat, 0) * 1000:8.1f} ms"
+            for stat in ("p50", "p99", "max")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Memory used by the parsed forecasts of many zipcodes.
+
+Parses one freshly decoded payload per zipcode (as each WralWeather
+instance would on a poll), drops the raw payloads and reports the
+memory still held by the parsed results, with the shared string table
+on and off.
+
+Run: `python3 benchmarks/bench_memory.py`
+"""
+import gc
+import json
+import tracemalloc
+
+import _common  # noqa: F401  (sets up sys.path)
+from payloads import make_weather_bytes
+
+import wral_weather
+from wral_weather import (
+    StringTable,
+    parse_current_conditions,
+    parse_forecast_daily,
+    parse_forecast_hourly,
+)
+
+NUM_ENTRIES = 50
+NUM_HOURS = 168
+
+
+def parse_entries(num_entries, num_hours):
+    """Return the parsed results of num_entries payloads."""
+    bodies = [make_weather_bytes(num_hours, seed=seed)
+              for seed in range(num_entries)]
+    gc.collect()
+    tracemalloc.start()
+    results = []
+    for body in bodies:
+        weather_json = json.loads(body)
+        data = weather_json['data']
+        results.append((
+            parse_current_conditions(data['currentObservations']),
+            parse_forecast_daily(data['forecast']),
+            parse_forecast_hourly(data['forecast'], num_hours),
+        ))
+        del weather_json, data
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, retained, peak
+
+
+def measure(table_size):
+    """Return (retained, peak) bytes with a string table of table_size."""
+    wral_weather.STRINGS = StringTable(table_size)
+    results, retained, peak = parse_entries(NUM_ENTRIES, NUM_HOURS)
+    del results
+    return retained, peak
+
+
+def main():
+    """Report the retained memory with and without interning."""
+    print(f"{NUM_ENTRIES} entries, {NUM_HOURS} hours")
+    without, without_peak = measure(0)
+    with_, with_peak = measure(wral_weather.STRING_TABLE_SIZE)
+    print(f"{'interning off':<20} retained {without / 1024:9.1f} KiB"
+          f"   peak {without_peak / 1024:9.1f} KiB")
+    print(f"{'interning on':<20} retained {with_ / 1024:9.1f} KiB"
+          f"   peak {with_peak / 1024:9.1f} KiB")
+    print(f"saved {(without - with_) / 1024:.1f} KiB "
+          f"({100 * (without - with_) / without:.1f}%) "
+          f"shared strings: {len(wral_weather.STRINGS)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Event loop stall per poll with the parse on the loop vs offloaded.
+
+For each parse mode, runs WralWeather.async_parse_weather() on a
+recorded-size weather body for several entries while a heartbeat task
+measures how late the event loop gets back to it.  Reports the stall
+WralWeather itself measured (loop_stall) and the worst heartbeat lag.
+
+Run: `python3 benchmarks/bench_offload.py [num_hours] [num_entries]`
+"""
+import asyncio
+import sys
+import time
+
+import _common  # noqa: F401  (sets up sys.path)
+from payloads import make_weather_bytes
+
+from wral_weather import PARSE_MODES, WralWeather
+
+HEARTBEAT = 0.001
+
+
+async def heartbeat(stop, lags):
+    """Record how late each short sleep wakes up."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT)
+        lags.append(time.perf_counter() - start - HEARTBEAT)
+
+
+async def run_mode(parse_mode, body, num_hours, num_entries, polls=5):
+    """Return (mean loop_stall, max heartbeat lag) in seconds."""
+    entries = [WralWeather(None, str(27501 + i), num_hours, parse_mode)
+               for i in range(num_entries)]
+    # Warm up (starts the process pool, fills the caches)
+    await entries[0].async_parse_weather(body)
+
+    stop = asyncio.Event()
+    lags = []
+    beat = asyncio.create_task(heartbeat(stop, lags))
+    stalls = []
+    for _ in range(polls):
+        await asyncio.gather(*(wral.async_parse_weather(body)
+                               for wral in entries))
+        stalls.extend(wral.loop_stall for wral in entries)
+    stop.set()
+    await beat
+    return sum(stalls) / len(stalls), max(lags)
+
+
+async def main(num_hours, num_entries):
+    """Compare the parse modes."""
+    body = make_weather_bytes(num_hours)
+    print(f"{num_entries} entries, {num_hours} hours, "
+          f"{len(body) / 1024:.0f} KiB per body")
+    for parse_mode in PARSE_MODES:
+        stall, lag = await run_mode(parse_mode, body, num_hours, num_entries)
+        print(f"{parse_mode:<8} loop_stall per poll {stall * 1000:8.2f} ms"
+              f"   worst heartbeat lag {lag * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(main(*(args + [168, 10][len(args):])))
@@ -0,0 +1,72 @@
+"""Benchmark of the forecast parsers over 12, 72 and 168 hour horizons.
+
+Times parse_forecast_daily and parse_forecast_hourly with a cold
+timestamp cache (first poll) and a warm one (later polls, where most
+forecast timestamps repeat), next to the per-entry time zone lookup
+and ISO conversion the parsers used to do.
+
+Run: `python3 benchmarks/bench_parse.py`
+"""
+import datetime
+
+from _common import best_of, report
+from payloads import make_weather_payload
+
+from wral_weather import (
+    TIMESTAMPS,
+    parse_forecast_daily,
+    parse_forecast_hourly,
+)
+
+HORIZONS = (12, 72, 168)
+
+
+def legacy_convert(timestamps):
+    """Resolve the zone and convert for every entry, as before."""
+    isos = []
+    for timestamp in timestamps:
+        tz = datetime.datetime.now().astimezone().tzinfo
+        isos.append(datetime.datetime.fromtimestamp(timestamp, tz).isoformat())
+    return isos
+
+
+def main():
+    """Time the parsers for each horizon."""
+    for num_hours in HORIZONS:
+        forecast = make_weather_payload(num_hours)["data"]["forecast"]
+        timestamps = [hour["forecastDate"]["timestamp"]
+                      for hour in forecast["forecastHourlyDetails"]]
+        print(f"--- {num_hours} hours")
+
+        legacy = best_of(lambda: legacy_convert(timestamps), number=200)
+        report("timestamps: per-entry zone + convert", legacy)
+
+        def batch_cold():
+            TIMESTAMPS.clear()
+            TIMESTAMPS.refresh()
+            TIMESTAMPS.isoformat_many(timestamps)
+        report("timestamps: batch, cold cache", best_of(batch_cold, number=200),
+               legacy)
+
+        def batch_warm():
+            TIMESTAMPS.refresh()
+            TIMESTAMPS.isoformat_many(timestamps)
+        report("timestamps: batch, warm cache", best_of(batch_warm, number=200),
+               legacy)
+
+        def parse_cold():
+            TIMESTAMPS.clear()
+            parse_forecast_daily(forecast)
+            parse_forecast_hourly(forecast, num_hours)
+        cold = best_of(parse_cold, number=50)
+        report("parse daily + hourly, cold cache", cold)
+
+        def parse_warm():
+            parse_forecast_daily(forecast)
+            parse_forecast_hourly(forecast, num_hours)
+        report("parse daily + hourly, warm cache", best_of(parse_warm, number=50),
+               cold)
+
+
+if __name__ == "__main__":
+    main()
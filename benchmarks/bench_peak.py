@@ -0,0 +1,70 @@
+"""Peak memory of one weather update, per entry, against a budget.
+
+Traces (tracemalloc) the peak memory of decoding and parsing one
+weather body the way WralWeather does (the decoded document is
+projected and released before parsing), next to parsing straight out
+of the decoded document as it was before.  Exits with status 1 when
+the projected peak of an entry is over PEAK_BUDGET_KIB, so it can be
+used as a check.
+
+Run: `python3 benchmarks/bench_peak.py [num_hours] [num_entries]`
+"""
+import gc
+import json
+import sys
+import tracemalloc
+
+import _common  # noqa: F401  (sets up sys.path)
+from payloads import make_weather_bytes
+
+from wral_weather import decode_and_parse_weather, parse_sections
+
+# Peak budget of one entry, for the 168 hours WRAL sends.
+PEAK_BUDGET_KIB = 700
+
+
+def parse_unprojected(body, num_hours):
+    """Parse straight out of the decoded document, keeping it to the end."""
+    weather_json = json.loads(body)
+    data = weather_json['data']
+    return parse_sections(
+        (data['currentObservations'], data['forecast'], data['forecast']),
+        num_hours)
+
+
+def traced_peak(func, body, num_hours):
+    """Return the peak bytes allocated while running func(body, num_hours)."""
+    gc.collect()
+    tracemalloc.start()
+    result = func(body, num_hours)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    """Report the worst peak per entry of both ways and check the budget."""
+    num_hours = int(sys.argv[1]) if len(sys.argv) > 1 else 168
+    num_entries = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    bodies = [make_weather_bytes(num_hours, seed=seed)
+              for seed in range(num_entries)]
+    print(f"{num_entries} entries, {num_hours} hours, "
+          f"{len(bodies[0]) // 1024} KiB per body")
+
+    unprojected = max(traced_peak(parse_unprojected, body, num_hours)
+                      for body in bodies)
+    projected = max(traced_peak(decode_and_parse_weather, body, num_hours)
+                    for body in bodies)
+    print(f"{'raw document kept':<20} peak {unprojected / 1024:9.1f} KiB")
+    print(f"{'projected':<20} peak {projected / 1024:9.1f} KiB"
+          f"   ({100 * (unprojected - projected) / unprojected:.1f}% less)")
+
+    if projected > PEAK_BUDGET_KIB * 1024:
+        print(f"over the {PEAK_BUDGET_KIB} KiB per entry budget")
+        sys.exit(1)
+    print(f"within the {PEAK_BUDGET_KIB} KiB per entry budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Per-section parse timings, one after another vs at the same time.
+
+Parses a long-horizon weather body with each parse mode and reports
+the decode/section/index timings WralWeather recorded, the serial
+total of the stages, the critical path when the sections run
+together, and the wall clock time of the whole parse.
+
+Run: `python3 benchmarks/bench_sections.py [num_hours]`
+"""
+import asyncio
+import sys
+import time
+
+import _common  # noqa: F401  (sets up sys.path)
+from payloads import make_weather_bytes
+
+from wral_weather import PARSE_MODES, WralWeather
+
+STAGES = ("decode", "current", "daily", "hourly", "index",
+          "serial", "critical_path")
+
+
+async def run_mode(parse_mode, body, num_hours, polls=20):
+    """Return (mean stage timings, mean wall time) in seconds."""
+    wral = WralWeather(None, "27606", num_hours, parse_mode)
+    await wral.async_parse_weather(body)  # warm up
+    totals = dict.fromkeys(STAGES, 0.0)
+    wall = 0.0
+    for _ in range(polls):
+        start = time.perf_counter()
+        await wral.async_parse_weather(body)
+        wall += time.perf_counter() - start
+        for stage in STAGES:
+            totals[stage] += wral.parse_timings[stage]
+    return {stage: total / polls for stage, total in totals.items()}, \
+        wall / polls
+
+
+async def main(num_hours):
+    """Report the stage timings of each parse mode."""
+    body = make_weather_bytes(num_hours)
+    print(f"{num_hours} hours, {len(body) / 1024:.0f} KiB body (ms)")
+    print(f"{'mode':<8}" + "".join(f"{stage:>14}" for stage in STAGES)
+          + f"{'wall':>10}")
+    for parse_mode in PARSE_MODES:
+        timings, wall = await run_mode(parse_mode, body, num_hours)
+        print(f"{parse_mode:<8}"
+              + "".join(f"{timings[stage] * 1000:14.3f}" for stage in STAGES)
+              + f"{wall * 1000:10.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 168))
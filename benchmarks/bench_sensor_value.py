@@ -0,0 +1,109 @@
+"""Micro-benchmark of WRALSensor.native_value over all SENSOR_TYPES.
+
+Compares the per-read lookup the sensor used to do (resolve which_dict
+by string compare, then walk the unit if-chain) with the accessor that
+is now compiled once per sensor.
+
+Needs Home Assistant installed: `python3 benchmarks/bench_sensor_value.py`
+"""
+from types import SimpleNamespace
+
+from _common import best_of, report
+
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfLength,
+    UnitOfPressure,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.util.unit_conversion import (
+    DistanceConverter,
+    PressureConverter,
+    SpeedConverter,
+)
+
+from custom_components.wral_weather.wral_weather import ForecastIndex
+from custom_components.wral_weather.sensor import (
+    CURRENT_DICT,
+    FORECAST_DICT_0,
+    SENSOR_TYPES,
+    compile_native_value,
+)
+
+FORECAST_DAILY_LIST = [
+    {"which_day_ts": 1760000000, "precipitation": 20,
+     "high_temperature": 81, "low_temperature": 63},
+]
+
+WRAL = SimpleNamespace(
+    curr_dict={
+        "current_dew_point": 61,
+        "current_temperature": 72,
+        "current_wind_chill": None,
+        "current_heat_index": None,
+        "current_relative_humidity": 65,
+        "current_wind_speed": 7,
+        "current_wind_gusts": 12,
+        "current_wind_bearing": 203,
+        "current_pressure": 30.01,
+        "current_visibility": 10.0,
+        "current_hourly_precip": 0.0,
+    },
+    forecast_daily_list=FORECAST_DAILY_LIST,
+    forecast_index=ForecastIndex(FORECAST_DAILY_LIST, []),
+)
+
+
+def legacy_native_value(description, unit_of_measurement, wral):
+    """The pre-compiled lookup, kept here only to compare against."""
+    if description.which_dict == CURRENT_DICT:
+        dict_to_use = wral.curr_dict
+    elif description.which_dict == FORECAST_DICT_0:
+        dict_to_use = wral.forecast_daily_list[0]
+    else:
+        dict_to_use = wral.curr_dict
+    value = dict_to_use.get(description.key)
+    if dict_to_use is None or (value := dict_to_use.get(description.key)) is None:
+        return None
+    if unit_of_measurement == UnitOfSpeed.KILOMETERS_PER_HOUR:
+        return round(SpeedConverter.convert(
+            value, UnitOfSpeed.KILOMETERS_PER_HOUR, UnitOfSpeed.MILES_PER_HOUR))
+    if unit_of_measurement == UnitOfLength.METERS:
+        return round(DistanceConverter.convert(
+            value, UnitOfLength.METERS, UnitOfLength.MILES))
+    if unit_of_measurement == UnitOfPressure.PA:
+        return round(PressureConverter.convert(
+            value, UnitOfPressure.PA, UnitOfPressure.INHG), 2)
+    if unit_of_measurement == UnitOfTemperature.FAHRENHEIT:
+        return round(value, 1)
+    if unit_of_measurement == PERCENTAGE:
+        return round(value)
+    return value
+
+
+def main():
+    """Time one read of every sensor, legacy vs compiled."""
+    descriptions = [(d, d.native_unit_of_measurement) for d in SENSOR_TYPES]
+    compiled = [compile_native_value(d, unit) for d, unit in descriptions]
+
+    for (description, unit), value_fn in zip(descriptions, compiled):
+        assert value_fn(WRAL) == legacy_native_value(description, unit, WRAL), \
+            description.key
+
+    def run_legacy():
+        for description, unit in descriptions:
+            legacy_native_value(description, unit, WRAL)
+
+    def run_compiled():
+        for value_fn in compiled:
+            value_fn(WRAL)
+
+    print(f"{len(descriptions)} sensors per pass")
+    legacy = best_of(run_legacy, number=20000)
+    report("legacy native_value", legacy)
+    report("compiled native_value", best_of(run_compiled, number=20000), legacy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Parser benchmark suite over the recorded payloads, with baselines.
+
+Runs the parser functions over the payloads in benchmarks/fixtures/
+(weather and city search responses, including one with the odd values
+WRAL sends: empty strings, None winds, -1 wind directions, missing or
+unknown icons) and reports, per function, the time per call and the
+peak memory (tracemalloc) of one call.
+
+`--save` writes the results to benchmarks/baselines.json; `--check`
+compares them with the saved baselines and exits with status 1 when a
+function got slower than the baseline by more than `--threshold`
+(0.25 = 25%) so it can be used as a regression check.  Timings depend
+on the machine, so save the baselines on the machine doing the checks.
+
+Before timing anything it checks the forecast insights of the edge case
+payload: hours WRAL sent no temperature for must not count as 0 F (a
+false freeze), and exits with status 1 if they do.
+
+The fixtures are regenerated with `python3 benchmarks/payloads.py`.
+
+Run: `python3 benchmarks/bench_suite.py [--save | --check] [--threshold 0.25]`
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+import _common  # noqa: F401  (sets up sys.path)
+from _common import best_of
+
+from wral_weather import (
+    CURRENT_WEATHER_SEARCH_STRINGS,
+    ForecastIndex,
+    WIND_DEGREES_TABLE,
+    WRAL_CONDITION_LOOKUP,
+    decode_weather,
+    parse_city_search,
+    parse_current_conditions,
+    parse_forecast_daily,
+    parse_forecast_hourly,
+    search_for_item,
+    wind_degrees2direction,
+    wral2ha_condition,
+)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINES_FILE = os.path.join(BENCH_DIR, "baselines.json")
+WEATHER_FIXTURES = ("weather_12h", "weather_168h", "weather_edge_cases")
+DEFAULT_THRESHOLD = 0.25
+
+
+def load_fixture(name):
+    """Return the raw bytes of a fixture."""
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), "rb") as file:
+        return file.read()
+
+
+def build_cases():
+    """Return {case name: func()} for every function and fixture."""
+    cases = {}
+    for name in WEATHER_FIXTURES:
+        body = load_fixture(name)
+        num_hours = len(
+            json.loads(body)['data']['forecast']['forecastHourlyDetails'])
+        current, daily, hourly = decode_weather(body, num_hours)
+        cases[f"parse_current_conditions[{name}]"] = (
+            lambda current=current: parse_current_conditions(current))
+        cases[f"parse_forecast_daily[{name}]"] = (
+            lambda daily=daily: parse_forecast_daily(daily))
+        cases[f"parse_forecast_hourly[{name}]"] = (
+            lambda hourly=hourly, num_hours=num_hours:
+            parse_forecast_hourly(hourly, num_hours))
+
+    for name in ("city_search", "city_search_empty"):
+        body = load_fixture(name)
+        # Decoded as aiohttp's resp.json() does, then WralWeather's parse
+        cases[f"city_id[{name}]"] = (
+            lambda body=body: parse_city_search(json.loads(body)))
+
+    # Every icon URL of the edge case payload, known or not
+    forecast = json.loads(load_fixture("weather_edge_cases"))['data']['forecast']
+    icons = [day.get(key) for day in forecast['forecastDetails']
+             for key in ('dayIcon', 'nightIcon')]
+    icons = [icon for icon in icons if icon]
+    ss = CURRENT_WEATHER_SEARCH_STRINGS['conditions']
+    cases["search_for_item[icons]"] = lambda: [
+        search_for_item(0, None, ss[0], ss[1], ss[2], icon) for icon in icons]
+
+    degrees = list(range(len(WIND_DEGREES_TABLE))) + [-1, 361.5, 720, 11.25]
+    cases["wind_degrees2direction[0-360 and odd]"] = lambda: [
+        wind_degrees2direction(value) for value in degrees]
+
+    conditions = list(WRAL_CONDITION_LOOKUP) + [
+        "night-clear", "not-a-condition", "", None]
+    cases["wral2ha_condition[all and unknown]"] = lambda: [
+        wral2ha_condition(condition) for condition in conditions]
+    return cases
+
+
+def check_insights():
+    """Return what is wrong with the edge case payload's insights."""
+    body = load_fixture("weather_edge_cases")
+    num_hours = len(
+        json.loads(body)['data']['forecast']['forecastHourlyDetails'])
+    _, daily, hourly = decode_weather(body, num_hours)
+    hours = parse_forecast_hourly(hourly, num_hours)
+    index = ForecastIndex(parse_forecast_daily(daily), hours)
+    insights = index.insights()
+    temperatures = [hour["temperature"] for hour in hours
+                    if hour["temperature"] is not None]
+    problems = []
+    if len(temperatures) == len(hours):
+        problems.append("no hour without a temperature")
+    if min(temperatures) >= 32 and insights["first_freezing_hour"]:
+        problems.append(f"first_freezing_hour {insights['first_freezing_hour']}"
+                        f" but the lowest temperature is {min(temperatures)}")
+    if insights["min_temperature"] not in temperatures:
+        problems.append(f"min_temperature {insights['min_temperature']}"
+                        " is not one of the hours' temperatures")
+    return problems
+
+
+def traced_peak(func):
+    """Return the peak bytes allocated while running func()."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def run_cases(cases):
+    """Return {case name: {'seconds': ..., 'peak_bytes': ...}}."""
+    results = {}
+    for name, func in cases.items():
+        func()
+        seconds = best_of(func, number=50, repeat=5)
+        results[name] = {"seconds": seconds, "peak_bytes": traced_peak(func)}
+    return results
+
+
+def check(results, baselines, threshold):
+    """Print the change against the baselines, return the regressed cases."""
+    regressed = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            print(f"{name:<52} no baseline")
+            continue
+        change = result["seconds"] / baseline["seconds"] - 1
+        flag = ""
+        if change > threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<52} {change * 100:+7.1f}% time "
+              f"{result['peak_bytes'] - baseline['peak_bytes']:+8d} B peak"
+              f"{flag}")
+    return regressed
+
+
+def main():
+    """Run the suite, then save or check the baselines if asked."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save", action="store_true",
+                      help=f"save the results to {BASELINES_FILE}")
+    mode.add_argument("--check", action="store_true",
+                      help="fail on slowdowns against the saved baselines")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown, ex. 0.25 for 25%%")
+    args = parser.parse_args()
+
+    problems = check_insights()
+    for problem in problems:
+        print(f"insights[weather_edge_cases]: {problem}")
+    if problems:
+        sys.exit(1)
+
+    results = run_cases(build_cases())
+    for name, result in results.items():
+        print(f"{name:<52} {result['seconds'] * 1e6:10.2f} us "
+              f"{result['peak_bytes'] / 1024:9.1f} KiB peak")
+
+    if args.save:
+        with open(BASELINES_FILE, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"saved {BASELINES_FILE}")
+    elif args.check:
+        with open(BASELINES_FILE, encoding="utf-8") as file:
+            baselines = json.load(file)
+        print()
+        regressed = check(results, baselines, args.threshold)
+        if regressed:
+            print(f"{len(regressed)} case(s) over the "
+                  f"{args.threshold * 100:.0f}% threshold")
+            sys.exit(1)
+        print(f"no case over the {args.threshold * 100:.0f}% threshold")
+
+
+if __name__ == "__main__":
+    main()
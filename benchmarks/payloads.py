@@ -0,0 +1,188 @@
+"""Synthetic WRAL API payloads for the benchmark scripts.
+
+The payloads follow the shape of the WRAL `/api/weather` and
+`/api/city/search` responses that `wral_weather.py` parses, with
+values cycling through realistic ranges so the parsers see a mix of
+conditions, wind directions and empty strings.
+"""
+import itertools
+import json
+
+START_TIMESTAMP = 1760072400  # 2025-10-10 01:00 EDT
+
+ICON_URL = "https://webapi.wral.com/images/wx/legacy/weather-{}.png"
+
+CONDITIONS = (
+    ("day-partly-cloudy", "Partly Cloudy"),
+    ("day-clear", "Sunny"),
+    ("cloudy", "Cloudy"),
+    ("day-chance-rain", "Chance of Showers"),
+    ("rain", "Rain"),
+    ("night-clear", "Clear"),
+    ("night-mostly-cloudy", "Mostly Cloudy"),
+    ("thunderstorms-rain", "Thunderstorms"),
+)
+
+WIND_DIRECTIONS = (
+    "North", "North Northeast", "Northeast", "East Northeast",
+    "East", "East Southeast", "Southeast", "South Southeast",
+    "South", "South Southwest", "Southwest", "West Southwest",
+    "West", "West Northwest", "Northwest", "North Northwest",
+)
+
+
+def make_city_payload(city_id="8111", name="Raleigh"):
+    """Return a /api/city/search response."""
+    return {"data": [{"id": city_id, "name": name, "state": "NC"}]}
+
+
+def make_current(seed=0):
+    """Return a 'currentObservations' section."""
+    icon, condition = CONDITIONS[seed % len(CONDITIONS)]
+    return {
+        "skyCondition": condition,
+        "icon": ICON_URL.format(icon),
+        "temperature": str(55 + seed % 40),
+        "dewPoint": str(45 + seed % 20),
+        "relativeHumidity": 40 + seed % 50,
+        "windSpeed": str(seed % 15),
+        "windDirection": str((seed * 37) % 360),
+        "windGusts": None if seed % 3 else str(seed % 25),
+        "windChill": "",
+        "heatIndex": "" if seed % 2 else str(90 + seed % 10),
+        "hourlyPrecip": None if seed % 4 else "0.02",
+        "pressure": "30.0{}".format(seed % 10),
+        "visibility": "10",
+    }
+
+
+def make_day(day, seed=0):
+    """Return one 'forecastDetails' entry."""
+    icon, condition = CONDITIONS[(day + seed) % len(CONDITIONS)]
+    high = 60 + (day * 7 + seed) % 35
+    return {
+        "forecastDate": {"timestamp": START_TIMESTAMP + day * 86400},
+        "dayIcon": ICON_URL.format(icon),
+        "nightIcon": ICON_URL.format("night-partly-cloudy"),
+        "dayCondition": condition,
+        "high": str(high),
+        "low": "" if day == 6 else str(high - 18),
+        "textDay": f"{condition} with a high near {high}. ",
+        "textNight": "Partly cloudy. ",
+        "sunrise": {"string": "7:21 AM"},
+        "sunset": {"string": "6:52 PM"},
+        "dayPop": str((day * 20 + seed) % 100),
+        "windSpeed": str(5 + day % 10),
+        "windDirection": WIND_DIRECTIONS[(day * 3 + seed) % 16],
+        "heatIndex": "",
+        "windChill": "",
+        "dewPoint": str(50 + day % 10),
+        # The day's hours, which the integration ignores
+        "hours": [make_hour(day * 24 + hour, seed) for hour in range(24)],
+    }
+
+
+def make_hour(hour, seed=0):
+    """Return one 'forecastHourlyDetails' entry."""
+    icon, condition = CONDITIONS[(hour // 3 + seed) % len(CONDITIONS)]
+    temperature = 30 + (hour * 5 + seed) % 65
+    return {
+        "forecastDate": {"timestamp": START_TIMESTAMP + hour * 3600},
+        "icon": ICON_URL.format(icon),
+        "conditions": condition,
+        "temperature": str(temperature),
+        "pop": str((hour * 13 + seed) % 100),
+        "windSpeed": str(hour % 20),
+        "windDirection": WIND_DIRECTIONS[(hour + seed) % 16],
+        "humidity": 40 + hour % 55,
+        "dewPoint": str(temperature - 8),
+        "heatIndex": temperature + 3,
+        "windChill": temperature - 4,
+        "cloudCover": str((hour * 7) % 100),
+    }
+
+
+def make_weather_payload(num_hours=168, num_days=7, seed=0):
+    """Return a /api/weather response with num_days days and num_hours hours."""
+    return {
+        "data": {
+            "currentObservations": make_current(seed),
+            "forecast": {
+                "forecastDetails": [
+                    make_day(day, seed) for day in range(num_days)],
+                "forecastHourlyDetails": [
+                    make_hour(hour, seed) for hour in range(num_hours)],
+            },
+        }
+    }
+
+
+def make_weather_bytes(num_hours=168, num_days=7, seed=0):
+    """Return the encoded /api/weather response body."""
+    return json.dumps(
+        make_weather_payload(num_hours, num_days, seed)).encode()
+
+
+def zipcodes(count, start=27501):
+    """Return 'count' distinct zipcodes."""
+    return [str(zipcode) for zipcode in itertools.islice(
+        itertools.count(start), count)]
+
+
+def make_edge_case_payload(num_hours=48, seed=0):
+    """
+    Return a /api/weather response with the odd values WRAL sends from
+    time to time: empty strings, None winds and gusts, -1 wind
+    directions, missing night icons and unknown icons/directions.
+    """
+    payload = make_weather_payload(num_hours, seed=seed)
+    data = payload["data"]
+    data["currentObservations"].update({
+        "windSpeed": None,
+        "windDirection": "-1",
+        "windGusts": None,
+        "windChill": "",
+        "heatIndex": "",
+        "hourlyPrecip": None,
+    })
+    for day, day_data in enumerate(data["forecast"]["forecastDetails"]):
+        if day % 2:
+            day_data.update({"high": "", "windSpeed": "", "dewPoint": ""})
+        if day % 3 == 0:
+            del day_data["nightIcon"]
+        if day == 5:
+            day_data["dayIcon"] = ICON_URL.format("not-a-condition")
+            day_data["windDirection"] = "Variable"
+    for hour, hour_data in enumerate(
+            data["forecast"]["forecastHourlyDetails"]):
+        if hour % 4 == 0:
+            hour_data.update({"windSpeed": "", "windDirection": None})
+        if hour % 5 == 0:
+            hour_data.update({"heatIndex": None, "windChill": None,
+                              "cloudCover": ""})
+        if hour % 7 == 0:
+            hour_data["temperature"] = ""
+    return payload
+
+
+# benchmarks/fixtures/<name>.json, see write_fixtures()
+FIXTURES = {
+    "city_search": lambda: make_city_payload(),
+    "city_search_empty": lambda: {"data": []},
+    "weather_12h": lambda: make_weather_payload(12, seed=1),
+    "weather_168h": lambda: make_weather_payload(168, seed=2),
+    "weather_edge_cases": lambda: make_edge_case_payload(48, seed=3),
+}
+
+
+def write_fixtures(directory):
+    """Write the FIXTURES payloads as JSON files into directory."""
+    for name, make in FIXTURES.items():
+        with open(f"{directory}/{name}.json", "w", encoding="utf-8") as file:
+            json.dump(make(), file, indent=1)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    import os
+    write_fixtures(os.path.join(os.path.dirname(__file__), "fixtures"))
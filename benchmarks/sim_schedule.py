@@ -0,0 +1,264 @@
+"""Simulate the refresh scheduling of N entries on a virtual clock.
+
+Runs the observation coordinators' scheduling (the strategies of
+polling.py, as WralDataUpdateCoordinator._schedule_refresh uses them,
+with its success/failure intervals and the 60 s refresh request
+debouncer) against a scripted WRAL: new observations published once an
+hour (at a jittered minute) and outages during which every request
+fails.  A simulated week takes a second or so, nothing waits.
+
+Reports per strategy the requests made, how stale the entries'
+observations were (sampled every minute, from the publication of the
+first observation an entry has not got yet) and the most requests in
+flight at once, at setup (every entry refreshes then) and after.
+
+Run: `python3 benchmarks/sim_schedule.py [--zipcodes 50] [--days 7]
+      [--outage 30:1.5 --outage 100:4] [--manual-per-day 4]`
+"""
+import argparse
+import bisect
+import heapq
+import itertools
+import math
+import random
+
+import _common  # noqa: F401  (sets up sys.path)
+from payloads import START_TIMESTAMP
+
+from polling import (
+    POLLING_BACKOFF,
+    POLLING_MODES,
+    BackoffPolling,
+    make_polling,
+)
+from wral_weather import RollingHistogram
+
+# As in the integration (see __init__.py)
+UPDATE_INTERVAL = 10 * 60
+FAILED_UPDATE_INTERVAL = 60
+DEBOUNCE_TIME = 60
+SAMPLE_INTERVAL = 60
+
+
+class Upstream:
+    """The scripted WRAL: publication times and outages."""
+
+    def __init__(self, start, days, minute, jitter, outages, rng):
+        hours = int(days * 24) + 2
+        self.published = [
+            start + hour * 3600 + minute * 60 + rng.uniform(-jitter, jitter) * 60
+            for hour in range(-1, hours)]
+        self.outages = [(start + begin * 3600, start + (begin + hours) * 3600)
+                        for begin, hours in outages]
+
+    def version(self, now):
+        """Return how many observations were published by 'now'."""
+        return bisect.bisect_right(self.published, now)
+
+    def available(self, now):
+        """Return whether a request at 'now' succeeds."""
+        return not any(begin <= now < end for begin, end in self.outages)
+
+
+class Entry:
+    """One entry's observation coordinator, on the virtual clock."""
+
+    def __init__(self, key, polling):
+        self.key = key
+        self.polling = polling
+        self.version = 0
+        self.last_update_success = True
+        self.consecutive_failures = 0
+        # Scheduled refresh, a token in the event queue (None if none)
+        self.scheduled = None
+        # Debouncer: its timer is running / a request is waiting for it
+        self.cooldown = False
+        self.pending = False
+
+
+class Simulation:
+    """The event queue and the results of one strategy."""
+
+    def __init__(self, upstream, latency):
+        self.upstream = upstream
+        self.latency = latency
+        self.now = 0.0
+        self._queue = []
+        self._seq = itertools.count()
+        self.requests = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # Not counting the refreshes of the entries' setup
+        self.steady_after = 0.0
+        self.steady_peak_in_flight = 0
+
+    def at(self, when, action, *args):
+        """Queue action(*args) at 'when', return its (cancellable) token."""
+        token = [action, args]
+        heapq.heappush(self._queue, (when, next(self._seq), token))
+        return token
+
+    def run(self, until):
+        """Run the queued actions up to 'until'."""
+        while self._queue and self._queue[0][0] <= until:
+            self.now, _, (action, args) = heapq.heappop(self._queue)
+            if action is not None:
+                action(*args)
+
+    def refresh(self, entry):
+        """Start a refresh (the scheduled one is cancelled, as in HA)."""
+        if entry.scheduled is not None:
+            entry.scheduled[0] = None
+            entry.scheduled = None
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        if self.now > self.steady_after:
+            self.steady_peak_in_flight = max(self.steady_peak_in_flight,
+                                             self.in_flight)
+        success = self.upstream.available(self.now)
+        version = self.upstream.version(self.now)
+        self.at(self.now + self.latency, self._refreshed, entry, success,
+                version)
+
+    def _refreshed(self, entry, success, version):
+        """Finish a refresh and schedule the next one."""
+        self.in_flight -= 1
+        changed = None
+        if success:
+            changed = version > entry.version
+            entry.version = max(entry.version, version)
+            entry.consecutive_failures = 0
+        else:
+            self.failed += 1
+            entry.consecutive_failures += 1
+        entry.last_update_success = success
+        # utcnow().replace(microsecond=0) + the strategy's delay
+        now = math.floor(self.now)
+        delay = entry.polling.next_delay(now, success, changed,
+                                         entry.consecutive_failures)
+        entry.scheduled = self.at(now + delay, self.refresh, entry)
+
+    def request_refresh(self, entry):
+        """A refresh request through the debouncer (immediate, 60 s)."""
+        if entry.cooldown:
+            entry.pending = True
+            return
+        entry.cooldown = True
+        self.refresh(entry)
+        self.at(self.now + DEBOUNCE_TIME, self._cooldown_over, entry)
+
+    def _cooldown_over(self, entry):
+        entry.cooldown = False
+        if entry.pending:
+            entry.pending = False
+            self.request_refresh(entry)
+
+
+def simulate(mode, args):
+    """Run one strategy, return its results."""
+    rng = random.Random(args.seed)
+    start = START_TIMESTAMP
+    upstream = Upstream(start, args.days, args.publish_minute,
+                        args.publish_jitter, args.outage, rng)
+    sim = Simulation(upstream, args.latency)
+
+    entries = []
+    for i in range(args.zipcodes):
+        key = str(27000 + i)
+        if mode == POLLING_BACKOFF:
+            polling = BackoffPolling(UPDATE_INTERVAL, FAILED_UPDATE_INTERVAL,
+                                     rng=random.Random(f"{args.seed}{key}"))
+        else:
+            polling = make_polling(mode, UPDATE_INTERVAL,
+                                   FAILED_UPDATE_INTERVAL, key)
+        entries.append(Entry(key, polling))
+
+    end = start + args.days * 86400
+    # HA starts: every entry refreshes once at setup
+    setup = start + args.setup_offset
+    for entry in entries:
+        sim.at(setup, sim.refresh, entry)
+    sim.steady_after = setup + args.latency
+    # Manual refresh requests (ex. homeassistant.update_entity)
+    for entry in entries:
+        for _ in range(int(args.manual_per_day * args.days)):
+            when = rng.uniform(setup, end)
+            sim.at(when, sim.request_refresh, entry)
+            if rng.random() < args.manual_burst:
+                sim.at(when + rng.uniform(0, DEBOUNCE_TIME),
+                       sim.request_refresh, entry)
+
+    staleness = RollingHistogram(None)
+    sample = setup + SAMPLE_INTERVAL
+    while sample <= end:
+        sim.run(sample)
+        version = upstream.version(sample)
+        for entry in entries:
+            if entry.version < version:
+                staleness.add(sample - upstream.published[entry.version])
+            else:
+                staleness.add(0.0)
+        sample += SAMPLE_INTERVAL
+    return {
+        "requests": sim.requests,
+        "per_entry_day": sim.requests / args.zipcodes / args.days,
+        "failed": sim.failed,
+        "staleness": staleness.summary(),
+        "peak_in_flight": sim.peak_in_flight,
+        "steady_peak_in_flight": sim.steady_peak_in_flight,
+    }
+
+
+def parse_outage(value):
+    """'30:1.5' -> (30.0, 1.5), the start and length in hours."""
+    begin, hours = value.split(":")
+    return float(begin), float(hours)
+
+
+def main():
+    """Simulate every strategy and report them side by side."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--zipcodes", type=int, default=50)
+    parser.add_argument("--days", type=float, default=7)
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="seconds per request")
+    parser.add_argument("--publish-minute", type=float, default=52,
+                        help="minute of the hour WRAL publishes at")
+    parser.add_argument("--publish-jitter", type=float, default=3,
+                        help="+/- minutes around it")
+    parser.add_argument("--outage", type=parse_outage, action="append",
+                        help="START:HOURS hours after the start, repeatable")
+    parser.add_argument("--manual-per-day", type=float, default=0,
+                        help="refresh requests per entry per day")
+    parser.add_argument("--manual-burst", type=float, default=0.5,
+                        help="chance a request is followed by another")
+    parser.add_argument("--setup-offset", type=float, default=17.3,
+                        help="seconds after the hour HA starts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--strategy", choices=POLLING_MODES, action="append")
+    args = parser.parse_args()
+    if args.outage is None:
+        args.outage = [(30, 1.5), (100, 4)]
+
+    print(f"{args.zipcodes} entries, {args.days:g} days, outages "
+          f"{', '.join(f'{begin:g}h+{hours:g}h' for begin, hours in args.outage)}"
+          f", {args.manual_per_day:g} manual refreshes/entry/day")
+    print(f"{'strategy':<10} {'requests':>9} {'/entry/day':>10} "
+          f"{'failed':>7}   staleness min: {'p50':>5} {'p90':>5} "
+          f"{'p99':>5} {'max':>5}   peak in flight: {'setup':>5} {'after':>5}")
+    for mode in args.strategy or POLLING_MODES:
+        result = simulate(mode, args)
+        stale = result["staleness"]
+        print(f"{mode:<10} {result['requests']:>9} "
+              f"{result['per_entry_day']:>10.1f} {result['failed']:>7}"
+              f"   {'':>14} "
+              + " ".join(f"{stale[stat] / 60:>5.1f}"
+                         for stat in ("p50", "p90", "p99", "max"))
+              + f"   {'':>15} {result['peak_in_flight']:>5}"
+              f" {result['steady_peak_in_flight']:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Local stand-in for the WRAL API, for offline end to end runs.
+
+Serves `/api/city/search` and `/api/weather` like webapi.wral.com
+does, the weather from a fixture payload (benchmarks/fixtures/), with
+optional misbehaviour picked per request from a seeded random:
+latency (plus jitter), server errors, 304s, bodies cut off mid
+transfer and bodies trickled out in small slow chunks.
+
+WralWeather is pointed at it with its 'urls' argument (see urls()).
+It can also be run on its own, ex. for app_wral.py style tests:
+`python3 benchmarks/stub_server.py --port 8080 --latency 0.2`
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import random
+import threading
+
+from aiohttp import web
+
+import _common  # noqa: F401  (sets up sys.path)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "fixtures")
+DEFAULT_FIXTURE = "weather_168h"
+
+
+@dataclasses.dataclass
+class StubConfig:
+    """How the stand-in behaves; the rates are 0-1 per weather request."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    not_modified_rate: float = 0.0
+    truncate_rate: float = 0.0
+    slow_rate: float = 0.0
+    # Slow bodies are sent 'slow_chunk' bytes every 'slow_delay' seconds
+    slow_chunk: int = 4096
+    slow_delay: float = 0.005
+    fixture: str = DEFAULT_FIXTURE
+    seed: int = 0
+
+
+def city_id(zipcode):
+    """Return the (made up but stable) city id of a zipcode."""
+    return str(10000 + int(zipcode) % 90000) if zipcode.isdigit() else "8111"
+
+
+class StubServer:
+    """The stand-in, run in its own thread and event loop."""
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config if config is not None else StubConfig()
+        self.host = host
+        self.port = port
+        # Requests served, per endpoint and outcome
+        self.served = {}
+        with open(os.path.join(FIXTURES_DIR, f"{self.config.fixture}.json"),
+                  "rb") as file:
+            self._weather_body = file.read()
+        self._random = random.Random(self.config.seed)
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    def urls(self):
+        """Return the URLS to hand to WralWeather."""
+        base = f"http://{self.host}:{self.port}"
+        return {
+            "city_search_pre": f"{base}/api/city/search?query=",
+            "weather_pre": f"{base}/api/weather?city=",
+        }
+
+    def _count(self, endpoint, outcome):
+        key = f"{endpoint}.{outcome}"
+        self.served[key] = self.served.get(key, 0) + 1
+
+    async def _delay(self):
+        config = self.config
+        delay = config.latency + self._random.uniform(0, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def city_search(self, request):
+        """Answer a city search with one city for the zipcode."""
+        await self._delay()
+        query = request.query.get("query", "")
+        self._count("city_search", "ok")
+        return web.json_response({"data": [
+            {"id": city_id(query), "name": f"City {query}", "state": "NC"}]})
+
+    async def weather(self, request):
+        """Answer with the fixture weather, or misbehave."""
+        await self._delay()
+        config = self.config
+        roll = self._random.random()
+        for outcome, rate in (("error", config.error_rate),
+                              ("not_modified", config.not_modified_rate),
+                              ("truncated", config.truncate_rate),
+                              ("slow", config.slow_rate)):
+            if roll < rate:
+                break
+            roll -= rate
+        else:
+            outcome = "ok"
+        self._count("weather", outcome)
+
+        body = self._weather_body
+        if outcome == "error":
+            return web.Response(status=500, text="Internal Server Error")
+        if outcome == "not_modified":
+            return web.Response(status=304)
+        if outcome == "ok":
+            return web.Response(body=body, content_type="application/json")
+
+        response = web.StreamResponse(
+            headers={"Content-Type": "application/json"})
+        response.content_length = len(body)
+        await response.prepare(request)
+        if outcome == "truncated":
+            # Half the body, then drop the connection
+            await response.write(body[:len(body) // 2])
+            request.transport.close()
+            return response
+        for start in range(0, len(body), config.slow_chunk):
+            await response.write(body[start:start + config.slow_chunk])
+            await asyncio.sleep(config.slow_delay)
+        await response.write_eof()
+        return response
+
+    def make_app(self):
+        """Return the aiohttp application."""
+        app = web.Application()
+        app.router.add_get("/api/city/search", self.city_search)
+        app.router.add_get("/api/weather", self.weather)
+        return app
+
+    async def _start(self):
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    def start(self):
+        """Start serving in a thread; returns once it is listening."""
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="wral-stub",
+                                        daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        """Stop serving and wait for the thread."""
+        asyncio.run_coroutine_threadsafe(
+            self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+
+def add_config_arguments(parser):
+    """Add the StubConfig options to an argparse parser."""
+    defaults = StubConfig()
+    for field in dataclasses.fields(StubConfig):
+        parser.add_argument(f"--{field.name.replace('_', '-')}",
+                            type=field.type, default=getattr(defaults,
+                                                             field.name))
+
+
+def config_from_arguments(args):
+    """Return the StubConfig of parsed add_config_arguments() options."""
+    return StubConfig(**{field.name: getattr(args, field.name)
+                         for field in dataclasses.fields(StubConfig)})
+
+
+def main():
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    server = StubServer(config_from_arguments(args), args.host, args.port)
+    web.run_app(server.make_app(), host=args.host, port=args.port)
+    print(json.dumps(server.served, indent=1))
+
+
+if __name__ == "__main__":
+    main()
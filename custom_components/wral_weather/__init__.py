@@ -2,25 +2,54 @@
 from __future__ import annotations
 
 from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import datetime
 import logging
 import aiohttp #TJL Adder
-from typing import TYPE_CHECKING
-
-from .wral_weather import WralWeather  #TJL Adder
+from typing import Any
+
+from .wral_weather import WralWeather, NUM_FORECAST_HOURS, PARSE_MODE_LOOP  #TJL Adder
+from .wral_weather import (
+    NO_TRACER,
+    PARSE_MODE_PROCESS,
+    JsonLinesExporter,
+    OpenTelemetryExporter,
+    Tracer,
+    release_process_pool,
+)
+from .polling import POLLING_FIXED, FixedPolling, make_polling
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, Platform
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import (
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import debounce
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.event import async_track_point_in_utc_time
-from homeassistant.helpers.update_coordinator import TimestampDataUpdateCoordinator
+from homeassistant.helpers.update_coordinator import (
+    TimestampDataUpdateCoordinator,
+    UpdateFailed,
+)
 from homeassistant.util.dt import utcnow
 
-from .const import  DOMAIN, UPDATE_TIME_PERIOD, CONF_ZIPCODE
+from .const import  DOMAIN, UPDATE_TIME_PERIOD, CONF_ZIPCODE, CONF_NUM_HRS, CONF_PARSE_MODE
+from .const import (
+    CONF_LOOP_WATCHDOG,
+    CONF_POLLING,
+    CONF_TRACING,
+    TRACE_FILE,
+    TRACING_JSONL,
+    TRACING_OFF,
+    TRACING_OPENTELEMETRY,
+)
+from .metrics import async_register_metrics_view
+from .watchdog import LoopWatchdog
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,15 +69,30 @@ def base_unique_id( zipcode: int) -> str:
     return f"{zipcode}"
 
 
+def _tracer(hass: HomeAssistant, tracing: str) -> Tracer:
+    """Return the tracer for the configured tracing mode."""
+    if tracing == TRACING_JSONL:
+        return Tracer(JsonLinesExporter(hass.config.path(TRACE_FILE)))
+    if tracing == TRACING_OPENTELEMETRY:
+        try:
+            return Tracer(OpenTelemetryExporter())
+        except ImportError:
+            _LOGGER.warning("OpenTelemetry is not installed, tracing is off")
+    return NO_TRACER
+
+
 @dataclass
 class WRALData:
     """Data for the National Weather Service integration."""
 
     wral_api: WralWeather #TJL Adder
     coordinator_observation: WralDataUpdateCoordinator
-    coordinator_forecast_twice_daily: WralDataUpdateCoordinator
     coordinator_forecast_hourly: WralDataUpdateCoordinator
     coordinator_forecast_daily: WralDataUpdateCoordinator #TJL Adder
+    # Sensor state writes skipped because the value did not change
+    sensor_writes_suppressed: int = 0
+    # How long the entity callbacks hold the event loop (opt-in)
+    watchdog: LoopWatchdog = field(default_factory=LoopWatchdog)
 
 
 class WralDataUpdateCoordinator(TimestampDataUpdateCoordinator[None]):
@@ -67,8 +111,16 @@ class WralDataUpdateCoordinator(TimestampDataUpdateCoordinator[None]):
         failed_update_interval: datetime.timedelta,
         update_method: Callable[[], Awaitable[None]] | None = None,
         request_refresh_debouncer: debounce.Debouncer | None = None,
+        tracer: Tracer = NO_TRACER,
+        polling: FixedPolling | None = None,
+        changed: Callable[[], bool | None] | None = None,
     ) -> None:
-        """Initialize WRAL coordinator."""
+        """Initialize WRAL coordinator.
+
+        'polling' picks when to refresh next (see polling.py), by default
+        every update_interval or failed_update_interval; 'changed' tells
+        it whether the last update brought new data.
+        """
         super().__init__(
             hass,
             logger,
@@ -78,6 +130,44 @@ class WralDataUpdateCoordinator(TimestampDataUpdateCoordinator[None]):
             request_refresh_debouncer=request_refresh_debouncer,
         )
         self.failed_update_interval = failed_update_interval
+        self.tracer = tracer
+        if polling is None:
+            polling = FixedPolling(
+                update_interval.total_seconds(),
+                failed_update_interval.total_seconds(),
+            )
+        self.polling = polling
+        self._changed = changed
+        self.consecutive_failures = 0
+        # Seconds to the refresh last scheduled by the polling
+        self.last_delay: float | None = None
+        # Times all the listeners together (see LoopWatchdog), if enabled
+        self.watchdog = LoopWatchdog()
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data, traced as the root span of an update."""
+        with self.tracer.span("coordinator_tick", coordinator=self.name):
+            await super()._async_refresh(*args, **kwargs)
+        if self.tracer.enabled:
+            await self.hass.async_add_executor_job(self.tracer.exporter.flush)
+
+    async def _async_update_data(self) -> None:
+        """Fetch the data, counting the failed updates in a row."""
+        try:
+            data = await super()._async_update_data()
+        except Exception:
+            self.consecutive_failures += 1
+            raise
+        self.consecutive_failures = 0
+        return data
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners (the entity state writes)."""
+        with self.tracer.span(
+            "state_writes", listeners=len(self._listeners)
+        ), self.watchdog.measure("coordinator.update_listeners"):
+            super().async_update_listeners()
 
     @callback
     def _schedule_refresh(self) -> None:
@@ -90,17 +180,17 @@ class WralDataUpdateCoordinator(TimestampDataUpdateCoordinator[None]):
         # minimizing the time between the point and the real activation.
         # That way we obtain a constant update frequency,
         # as long as the update process takes less than a second
-        if self.last_update_success:
-            if TYPE_CHECKING:
-                # the base class allows None, but this one doesn't
-                assert self.update_interval is not None
-            update_interval = self.update_interval
-        else:
-            update_interval = self.failed_update_interval
+        now = utcnow().replace(microsecond=0)
+        delay = self.last_delay = self.polling.next_delay(
+            now.timestamp(),
+            self.last_update_success,
+            self._changed() if self._changed is not None else None,
+            self.consecutive_failures,
+        )
         self._unsub_refresh = async_track_point_in_utc_time(
             self.hass,
             self._handle_refresh_interval,
-            utcnow().replace(microsecond=0) + update_interval,
+            now + datetime.timedelta(seconds=delay),
         )
 
 
@@ -112,8 +202,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     #setup WRAL
     zipcode = entry.data[CONF_ZIPCODE]
     _LOGGER.debug("Setting up WRAL Service. Zipcode: %s", zipcode)
+    try:
+        num_hours = int(entry.data.get(CONF_NUM_HRS, NUM_FORECAST_HOURS))
+    except ValueError:
+        _LOGGER.warning("Invalid number of forecast hours, using %s",
+                        NUM_FORECAST_HOURS)
+        num_hours = NUM_FORECAST_HOURS
     wral_session = async_get_clientsession(hass)
-    wral_inst = WralWeather(wral_session, zipcode)
+    parse_mode = entry.data.get(CONF_PARSE_MODE, PARSE_MODE_LOOP)
+    tracer = _tracer(hass, entry.data.get(CONF_TRACING, TRACING_OFF))
+    polling = make_polling(
+        entry.data.get(CONF_POLLING, POLLING_FIXED),
+        DEFAULT_SCAN_INTERVAL.total_seconds(),
+        FAILED_SCAN_INTERVAL.total_seconds(),
+        zipcode,
+    )
+    wral_inst = WralWeather(wral_session, zipcode, num_hours, parse_mode, tracer)
+    if parse_mode == PARSE_MODE_PROCESS:
+        # The parse worker processes are not daemons, stop them with HA
+        async def _async_stop_process_pool(event: Event) -> None:
+            await async_shutdown_process_pool(hass)
+
+        entry.async_on_unload(
+            hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, _async_stop_process_pool)
+        )
 
     async def update_observation() -> None:
         """Retrieve recent observations."""
@@ -122,14 +234,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.debug("Updating WRAL Weather Data")
         try:
             await wral_inst.update_observation_and_forecast()
-            _LOGGER.debug("wral Curr Dict %s", wral_inst.curr_dict)
            #self._wral_forecast = self.wral.forecast_list
-            _LOGGER.debug("WRAL Forecast List %s",
-                          wral_inst.forecast_daily_list)
+            _LOGGER.debug("WRAL update %d: %d days, %d hours",
+                          wral_inst.generation,
+                          len(wral_inst.forecast_daily_list),
+                          len(wral_inst.forecast_hourly_list))
         except ERRORS as status:
-            _LOGGER.error("Error Updating WRAL Weather Data")
+            # Failed for the coordinator too, so it logs it and the
+            #   polling picks the failed (ex. backoff) delay
            #wral.curr_dict = None
            #self._wral_forecast = None
+            raise UpdateFailed(
+                f"Error Updating WRAL Weather Data: {status}"
+            ) from status
 
     async def place_holder() -> None:
         """Place holder for future outside world retrieval forecasts."""
@@ -145,19 +262,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         request_refresh_debouncer=debounce.Debouncer(
             hass, _LOGGER, cooldown=DEBOUNCE_TIME, immediate=True
         ),
-    )
-
-    coordinator_forecast_twice_daily = WralDataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"WRAL forecast twice_daily for {zipcode}",
-       #update_method=wral_data.update_forecast,
-        update_method=place_holder,
-        update_interval=DEFAULT_SCAN_INTERVAL,
-        failed_update_interval=FAILED_SCAN_INTERVAL,
-        request_refresh_debouncer=debounce.Debouncer(
-            hass, _LOGGER, cooldown=DEBOUNCE_TIME, immediate=True
-        ),
+        tracer=tracer,
+        polling=polling,
+        changed=lambda: wral_inst.observations_changed,
     )
 
     coordinator_forecast_hourly = WralDataUpdateCoordinator(
@@ -189,24 +296,32 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ),
     )
 
+    watchdog = LoopWatchdog(
+        enabled=entry.data.get(CONF_LOOP_WATCHDOG, False),
+        name=f"WRAL {zipcode}",
+    )
+    coordinator_observation.watchdog = watchdog
+
     wral_hass_data = hass.data.setdefault(DOMAIN, {})
     wral_hass_data[entry.entry_id] = WRALData(
        #wral_data,
         wral_inst, #TJL Adder
         coordinator_observation,
-        coordinator_forecast_twice_daily,
         coordinator_forecast_hourly,
         coordinator_forecast_daily, #TJL Adder
+        watchdog=watchdog,
     )
 
     # Fetch initial data so we have data when entities subscribe
     await coordinator_observation.async_refresh()
-    await coordinator_forecast_twice_daily.async_refresh()
     await coordinator_forecast_hourly.async_refresh()
     await coordinator_forecast_daily.async_refresh()  #Not needed
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Metrics of all the entries, for scraping
+    async_register_metrics_view(hass)
+
     return True
 
 
@@ -217,9 +332,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN].pop(entry.entry_id)
         if len(hass.data[DOMAIN]) == 0:
             hass.data.pop(DOMAIN)
+            await async_shutdown_process_pool(hass)
     return unload_ok
 
 
+async def async_shutdown_process_pool(hass: HomeAssistant) -> None:
+    """Shut down the shared parse process pool, if it was started."""
+    if (pool := release_process_pool()) is not None:
+        await hass.async_add_executor_job(pool.shutdown)
+
+
 def device_info(zipcode: int) -> DeviceInfo:
     """Return device registry information."""
     return DeviceInfo(
@@ -5,7 +5,7 @@ import logging
 from typing import Any
 
 import aiohttp
-from .wral_weather import WralWeather  #TJL Change
+from .wral_weather import WralWeather, PARSE_MODES, PARSE_MODE_LOOP  #TJL Change
 import voluptuous as vol
 
 from homeassistant import config_entries, core, exceptions
@@ -15,7 +15,10 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from . import base_unique_id
-from .const import  DOMAIN, CONF_ZIPCODE, CONF_NUM_HRS
+from .const import  DOMAIN, CONF_ZIPCODE, CONF_NUM_HRS, CONF_PARSE_MODE
+from .const import CONF_TRACING, TRACING_MODES, TRACING_OFF, CONF_LOOP_WATCHDOG
+from .const import CONF_POLLING, CONF_FORECAST_DAY_SENSORS, CONF_FORECAST_HOUR_SENSORS
+from .polling import POLLING_MODES, POLLING_FIXED
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -88,6 +91,15 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_NAME, default="WRAL Weather"): str,
                 vol.Optional(CONF_ZIPCODE, default="27606"): str,
                 vol.Optional(CONF_NUM_HRS, default="24"): str,
+                vol.Optional(CONF_PARSE_MODE, default=PARSE_MODE_LOOP):
+                    vol.In(PARSE_MODES),
+                vol.Optional(CONF_TRACING, default=TRACING_OFF):
+                    vol.In(TRACING_MODES),
+                vol.Optional(CONF_LOOP_WATCHDOG, default=False): bool,
+                vol.Optional(CONF_POLLING, default=POLLING_FIXED):
+                    vol.In(POLLING_MODES),
+                vol.Optional(CONF_FORECAST_DAY_SENSORS, default=False): bool,
+                vol.Optional(CONF_FORECAST_HOUR_SENSORS, default=False): bool,
             }
         )
 
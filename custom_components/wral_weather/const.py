@@ -24,6 +24,31 @@ DOMAIN = "wral_weather"
 
 CONF_ZIPCODE = "zipcode" # tjl adder
 CONF_NUM_HRS = "num_hrs" # tjl adder
+CONF_PARSE_MODE = "parse_mode"
+CONF_TRACING = "tracing"
+CONF_LOOP_WATCHDOG = "loop_watchdog"
+CONF_POLLING = "polling"  # see polling.POLLING_MODES
+# The forecast day / hour sensor families are only created when asked
+CONF_FORECAST_DAY_SENSORS = "forecast_day_sensors"
+CONF_FORECAST_HOUR_SENSORS = "forecast_hour_sensors"
+
+# Where the spans of each update go (see wral_weather.Tracer)
+TRACING_OFF = "off"
+TRACING_JSONL = "jsonl"
+TRACING_OPENTELEMETRY = "opentelemetry"
+TRACING_MODES = (TRACING_OFF, TRACING_JSONL, TRACING_OPENTELEMETRY)
+TRACE_FILE = f"{DOMAIN}_traces.jsonl"  # in the HA config directory
+
+SERVICE_GET_FORECAST_INSIGHTS = "get_forecast_insights"
+ATTR_PRECIPITATION_ABOVE = "precipitation_above"
+ATTR_TEMPERATURE_BELOW = "temperature_below"
+ATTR_HOURS = "hours"
+
+SERVICE_GET_FORECAST_RANGE = "get_forecast_range"
+ATTR_FORECAST_TYPE = "type"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_FIELDS = "fields"
 
 ATTRIBUTION = "Data provided by WRAL Weather"
 
@@ -0,0 +1,96 @@
+"""Diagnostics support for WRAL Weather."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+
+from . import WRALData, WralDataUpdateCoordinator
+from .const import DOMAIN
+from .wral_weather import CITY_IDS, PARSE_MODE_PROCESS, WralWeather
+
+# Samples of each fetch histogram to include
+DIAGNOSTICS_SAMPLES = 20
+# Caches the parse process pool workers keep their own copies of
+WORKER_CACHES = ("strings", "timestamps")
+
+
+def _coordinator_state(coordinator: WralDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the schedule state of a coordinator."""
+    last_success_time = coordinator.last_update_success_time
+    return {
+        "last_update_success": coordinator.last_update_success,
+        "last_update_success_time": last_success_time,
+        "data_age_seconds": (utcnow() - last_success_time).total_seconds()
+        if last_success_time
+        else None,
+        "consecutive_failures": coordinator.consecutive_failures,
+        "update_interval_seconds": coordinator.update_interval.total_seconds()
+        if coordinator.update_interval
+        else None,
+        "failed_update_interval_seconds": (
+            coordinator.failed_update_interval.total_seconds()
+        ),
+        # What actually picks the refreshes (see polling.py)
+        "polling": coordinator.polling.mode,
+        "last_delay_seconds": coordinator.last_delay,
+    }
+
+
+def _metrics(wral: WralWeather) -> dict[str, Any]:
+    """Return the metrics, without the cache stats that don't cover its parses."""
+    metrics = wral.metrics.as_dict()
+    if wral.parse_mode == PARSE_MODE_PROCESS:
+        # Parsed in the worker processes, with their own caches
+        for stats in (metrics["cache_hit_rates"], metrics["cache_evictions"]):
+            for cache in WORKER_CACHES:
+                stats.pop(cache, None)
+        metrics["cache_note"] = (
+            "string and timestamp caches are per parse worker process "
+            "in process parse mode, not reported"
+        )
+    return metrics
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    wral_data: WRALData = hass.data[DOMAIN][entry.entry_id]
+    wral = wral_data.wral_api
+    metrics = wral.metrics
+
+    def last_samples(name: str) -> list[float]:
+        """Return the latest samples of a histogram."""
+        return metrics.histograms[name].samples()[-DIAGNOSTICS_SAMPLES:]
+
+    return {
+        "entry_data": dict(entry.data),
+        "parse_mode": wral.parse_mode,
+        "num_hours": wral.num_hours,
+        "generation": wral.generation,
+        "forecast_days": len(wral.forecast_daily_list),
+        "forecast_hours": len(wral.forecast_hourly_list),
+        "coordinator": _coordinator_state(wral_data.coordinator_observation),
+        "fetch": {
+            "city_lookup_seconds": last_samples("city_lookup"),
+            "weather_fetch_seconds": last_samples("weather_fetch"),
+            "ttfb_seconds": last_samples("ttfb"),
+            "payload_bytes": last_samples("payload_bytes"),
+        },
+        "parse": {
+            "last_timings_seconds": wral.parse_timings,
+            "loop_stall_seconds": wral.loop_stall,
+            "last_errors": dict(wral.last_parse_errors),
+            "errors": dict(wral.parse_errors),
+        },
+        "metrics": _metrics(wral),
+        "sensor_writes_suppressed": wral_data.sensor_writes_suppressed,
+        "loop_watchdog": wral_data.watchdog.summary(),
+        "city_id_cache": [
+            {"zipcode": zipcode, "city_id": city_id, "age_seconds": age}
+            for zipcode, city_id, age in CITY_IDS.items()
+        ],
+    }
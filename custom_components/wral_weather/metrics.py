@@ -0,0 +1,121 @@
+"""Performance metrics of the WRAL Weather entries, for scraping."""
+from __future__ import annotations
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_ZIPCODE, DOMAIN
+
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+# Set once the view is registered; views can't be removed, so this
+#   outlives the entries (unlike hass.data[DOMAIN]).
+DATA_METRICS_VIEW = f"{DOMAIN}_metrics_view"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram name -> (metric name, help text)
+HISTOGRAM_METRICS = {
+    "city_lookup": ("city_lookup_seconds", "City id lookup latency"),
+    "weather_fetch": ("weather_fetch_seconds", "Weather fetch latency"),
+    "ttfb": ("weather_ttfb_seconds", "Weather fetch time to first byte"),
+    "payload_bytes": ("payload_bytes", "Weather response body size"),
+    "decode": ("decode_seconds", "Weather response decode time"),
+    "current": ("parse_current_seconds", "Current conditions parse time"),
+    "daily": ("parse_daily_seconds", "Daily forecast parse time"),
+    "hourly": ("parse_hourly_seconds", "Hourly forecast parse time"),
+    "index": ("index_seconds", "Forecast index build time"),
+}
+QUANTILES = (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99"))
+
+
+def _metric(name: str) -> str:
+    """Return the full name of a metric."""
+    return f"{DOMAIN}_{name}"
+
+
+def format_prometheus(hass: HomeAssistant) -> str:
+    """Return the metrics of all the entries in Prometheus text format."""
+    entries = [
+        (hass.config_entries.async_get_entry(entry_id), wral_data)
+        for entry_id, wral_data in hass.data.get(DOMAIN, {}).items()
+    ]
+    entries = [
+        (entry.data[CONF_ZIPCODE], wral_data)
+        for entry, wral_data in entries
+        if entry is not None
+    ]
+    lines: list[str] = []
+
+    def family(name: str, kind: str, help_text: str) -> str:
+        metric = _metric(name)
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        return metric
+
+    for key, (name, help_text) in HISTOGRAM_METRICS.items():
+        metric = family(name, "summary", help_text)
+        for zipcode, wral_data in entries:
+            histogram = wral_data.wral_api.metrics.histograms[key]
+            summary = histogram.summary()
+            for quantile, stat in QUANTILES:
+                if stat in summary:
+                    lines.append(
+                        f'{metric}{{zipcode="{zipcode}",quantile="{quantile}"}} '
+                        f"{summary[stat]}"
+                    )
+            lines.append(f'{metric}_sum{{zipcode="{zipcode}"}} {histogram.total}')
+            lines.append(f'{metric}_count{{zipcode="{zipcode}"}} {histogram.count}')
+
+    for name, kind, help_text, value_fn in (
+        ("updates_total", "counter", "Successful updates",
+         lambda wral_data: wral_data.wral_api.metrics.updates),
+        ("failures_total", "counter", "Failed updates",
+         lambda wral_data: wral_data.wral_api.metrics.failures),
+        ("consecutive_failures", "gauge", "Failed updates in a row",
+         lambda wral_data: wral_data.wral_api.metrics.consecutive_failures),
+        ("sensor_writes_suppressed_total", "counter",
+         "Sensor state writes skipped as the value did not change",
+         lambda wral_data: wral_data.sensor_writes_suppressed),
+    ):
+        metric = family(name, kind, help_text)
+        for zipcode, wral_data in entries:
+            lines.append(f'{metric}{{zipcode="{zipcode}"}} {value_fn(wral_data)}')
+
+    # The caches are shared by all the entries
+    if entries:
+        metric = family("cache_hit_ratio", "gauge", "Hit rate of the shared caches")
+        hit_rates = entries[0][1].wral_api.metrics.cache_hit_rates()
+        for cache, rate in hit_rates.items():
+            if rate is not None:
+                lines.append(f'{metric}{{cache="{cache}"}} {rate}')
+        metric = family("cache_evictions_total", "counter",
+                        "Entries dropped from the full shared caches")
+        evictions = entries[0][1].wral_api.metrics.cache_evictions()
+        for cache, count in evictions.items():
+            lines.append(f'{metric}{{cache="{cache}"}} {count}')
+
+    return "\n".join(lines) + "\n"
+
+
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the metrics view, once."""
+    if hass.data.get(DATA_METRICS_VIEW):
+        return
+    hass.http.register_view(WralMetricsView())
+    hass.data[DATA_METRICS_VIEW] = True
+
+
+class WralMetricsView(HomeAssistantView):
+    """Serve the metrics of all the entries for scraping."""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics in Prometheus text format."""
+        hass = request.app[KEY_HASS]
+        return web.Response(
+            body=format_prometheus(hass).encode(),
+            headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+        )
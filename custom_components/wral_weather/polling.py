@@ -0,0 +1,150 @@
+"""When to poll WRAL next, for the update coordinators.
+
+No Home Assistant imports here, so that benchmarks/sim_schedule.py can
+run the same scheduling on a virtual clock.  Times are in seconds
+(POSIX timestamps for 'now').
+"""
+import random
+import zlib
+
+POLLING_FIXED = "fixed"
+POLLING_STAGGERED = "staggered"
+POLLING_BACKOFF = "backoff"
+POLLING_ADAPTIVE = "adaptive"
+POLLING_MODES = (POLLING_FIXED, POLLING_STAGGERED, POLLING_BACKOFF,
+                 POLLING_ADAPTIVE)
+
+# Longest wait after failed updates in a row (see BackoffPolling)
+BACKOFF_MAX_INTERVAL = 30 * 60
+BACKOFF_JITTER = 0.1
+# WRAL publishes the current observations about once an hour
+#   (see AdaptivePolling)
+PUBLICATION_PERIOD = 60 * 60
+ADAPTIVE_RETRY = 2 * 60
+
+
+class FixedPolling:
+    """
+    Poll every 'interval', or every 'failed_interval' after a failure.
+    """
+    mode = POLLING_FIXED
+
+    def __init__(self, interval, failed_interval):
+        self.interval = interval
+        self.failed_interval = failed_interval
+
+    def next_delay(self, now, success, changed=None, failures=0):
+        """
+        Return the seconds to wait after an update at 'now'.
+        'changed' is whether the update brought new data (None if not
+          known) and 'failures' the failed updates in a row.
+        """
+        if not success:
+            return self.failed_interval
+        return self.interval
+
+
+def stagger_offset(key, interval):
+    """Return a stable offset (0 to 'interval') for 'key', ex. a zipcode."""
+    return zlib.crc32(str(key).encode()) % int(interval)
+
+
+class StaggeredPolling(FixedPolling):
+    """
+    Poll every 'interval', at a per entry offset into it, so entries set
+      up together don't all poll in the same second.
+    """
+    mode = POLLING_STAGGERED
+
+    def __init__(self, interval, failed_interval, key):
+        super().__init__(interval, failed_interval)
+        self.offset = stagger_offset(key, interval)
+
+    def next_delay(self, now, success, changed=None, failures=0):
+        if not success:
+            return self.failed_interval
+        delay = self.interval - (now - self.offset) % self.interval
+        # Too close to the update just done, wait for the next slot
+        if delay < self.interval / 2:
+            delay += self.interval
+        return delay
+
+
+class BackoffPolling(FixedPolling):
+    """
+    Poll every 'interval', backing off exponentially (from
+      'failed_interval' up to 'max_interval', with jitter) while the
+      updates fail, ex. during a WRAL outage.
+    """
+    mode = POLLING_BACKOFF
+
+    def __init__(self, interval, failed_interval,
+                 max_interval=BACKOFF_MAX_INTERVAL, jitter=BACKOFF_JITTER,
+                 rng=None):
+        super().__init__(interval, failed_interval)
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self._random = rng if rng is not None else random.Random()
+
+    def next_delay(self, now, success, changed=None, failures=0):
+        if success:
+            return self.interval
+        delay = min(self.failed_interval * 2 ** max(failures - 1, 0),
+                    self.max_interval)
+        return delay * (1 + self._random.uniform(-self.jitter, self.jitter))
+
+
+class AdaptivePolling(FixedPolling):
+    """
+    Poll right after WRAL is expected to publish new observations,
+      instead of every 'interval'.
+    An update bringing new data means it was published since the
+      previous poll, so the next one is expected a 'period' after that
+      poll (looking at most 'interval' earlier than this one).  Until it
+      shows up poll every 'retry', then every 'interval'; so the
+      expected time closes in on the publication time and most periods
+      take 2 polls.
+    Polls every 'interval' until the publication time is known, or when
+      it is not known whether updates bring new data.
+    """
+    mode = POLLING_ADAPTIVE
+
+    def __init__(self, interval, failed_interval,
+                 period=PUBLICATION_PERIOD, retry=ADAPTIVE_RETRY):
+        super().__init__(interval, failed_interval)
+        self.period = period
+        self.retry = retry
+        self.expected = None
+        self._last_poll = None
+
+    def next_delay(self, now, success, changed=None, failures=0):
+        if not success:
+            return self.failed_interval
+        last_poll, self._last_poll = self._last_poll, now
+        if changed is None:
+            return self.interval
+        if changed:
+            if last_poll is not None:
+                self.expected = max(last_poll, now - self.interval) + \
+                    self.period
+        elif self.expected is not None and self.expected <= now:
+            # Late, keep looking
+            if now < self.expected + self.interval:
+                return self.retry
+            return self.interval
+        if self.expected is None:
+            return self.interval
+        while self.expected <= now:
+            self.expected += self.period
+        return self.expected - now
+
+
+def make_polling(mode, interval, failed_interval, key=None):
+    """Return the polling of 'mode' (see POLLING_MODES)."""
+    if mode == POLLING_STAGGERED:
+        return StaggeredPolling(interval, failed_interval, key)
+    if mode == POLLING_BACKOFF:
+        return BackoffPolling(interval, failed_interval)
+    if mode == POLLING_ADAPTIVE:
+        return AdaptivePolling(interval, failed_interval)
+    return FixedPolling(interval, failed_interval)
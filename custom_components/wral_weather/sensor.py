@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import logging #TJL Adder
 
+from collections.abc import Callable
 from dataclasses import dataclass
 from types import MappingProxyType
 from typing import Any
@@ -19,16 +20,19 @@ from homeassistant.const import (
     CONF_LONGITUDE,
     DEGREE,
     PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
     UnitOfLength,
     UnitOfPressure,
     UnitOfSpeed,
     UnitOfTemperature,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util.dt import utcnow
+from homeassistant.util.dt import parse_datetime, utcnow
 from homeassistant.util.unit_conversion import (
     DistanceConverter,
     PressureConverter,
@@ -37,11 +41,24 @@ from homeassistant.util.unit_conversion import (
 from homeassistant.util.unit_system import US_CUSTOMARY_SYSTEM
 
 from . import WRALData, WralDataUpdateCoordinator, base_unique_id, device_info
+from .wral_weather import (
+    FORECAST_DAILY,
+    FORECAST_HOURLY,
+    FORECAST_INSIGHTS,
+    INSIGHT_FREEZING,
+    INSIGHT_HOURS,
+    INSIGHT_RAIN_POP,
+    NUM_FORECAST_DAYS,
+    RollingHistogram,
+    WralWeather,
+)
 from .const import (
     ATTRIBUTION, 
     DOMAIN, 
     OBSERVATION_VALID_TIME,
-    CONF_ZIPCODE  #TJL Adder
+    CONF_ZIPCODE,  #TJL Adder
+    CONF_FORECAST_DAY_SENSORS,
+    CONF_FORECAST_HOUR_SENSORS,
 )
 
 _LOGGER = logging.getLogger(__name__) #TJL Adder
@@ -52,6 +69,11 @@ PARALLEL_UPDATES = 0
 CURRENT_DICT = "current_dict" 
 FORECAST_DICT = "forecast" 
 FORECAST_DICT_0 = "forecast-day-0" 
+FORECAST_HOURLY_DICT = "forecast-hourly"
+FORECAST_INSIGHTS_DICT = "forecast-insights"
+
+# Marker for a sensor that has not written a state yet
+_NOT_WRITTEN = object()
 
 
 @dataclass
@@ -63,6 +85,18 @@ class WRALSensorEntityDescription(SensorEntityDescription):
     #TJL Adder. Note: Type hint has to be incl or won't compile
     which_dict: str | None = None  
 
+    # Changes smaller than this are not written to the state machine
+    # (and so not to the recorder). None means only skip exact repeats.
+    deadband: float | None = None
+    # Degrees that wrap around at 360 (ex. a wind bearing), so the
+    # deadband is measured the short way round.
+    circular: bool = False
+
+    # Forecast sensors: which day/hour, and the forecast key to read
+    #   (defaults to 'key').
+    forecast_offset: int = 0
+    value_key: str | None = None
+
 
 SENSOR_TYPES: tuple[WRALSensorEntityDescription, ...] = (
     WRALSensorEntityDescription(
@@ -153,6 +187,8 @@ SENSOR_TYPES: tuple[WRALSensorEntityDescription, ...] = (
         native_unit_of_measurement=DEGREE,
         unit_convert=DEGREE,
         which_dict=CURRENT_DICT,  #TJL Adder
+        deadband=1,
+        circular=True,
     ),
     WRALSensorEntityDescription(
        #key="barometricPressure",
@@ -164,6 +200,7 @@ SENSOR_TYPES: tuple[WRALSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfPressure.INHG,
         unit_convert=UnitOfPressure.INHG,
         which_dict=CURRENT_DICT,  #TJL Adder
+        deadband=0.01,
     ),
     WRALSensorEntityDescription(
        #key="visibility",
@@ -212,12 +249,231 @@ SENSOR_TYPES: tuple[WRALSensorEntityDescription, ...] = (
 )
 
 
+# Forecast sensor families, one sensor per field for each forecast
+#   day and each forecast hour, if the entry asks for them.
+#   The forecast keys must be among the ones the index keeps
+#   (see wral_weather.FORECAST_INDEX_KEYS).
+#   (forecast key, name, unit, icon)
+FORECAST_DAY_FIELDS = (
+    ("condition", "Condition", None, "mdi:weather-partly-cloudy"),
+    ("high_temperature", "High Temperature",
+     UnitOfTemperature.FAHRENHEIT, "mdi:thermometer"),
+    ("low_temperature", "Low Temperature",
+     UnitOfTemperature.FAHRENHEIT, "mdi:thermometer"),
+    ("precipitation", "Probability Precipitation",
+     PERCENTAGE, "mdi:water-percent"),
+    ("wind_speed", "Wind Speed", UnitOfSpeed.MILES_PER_HOUR, "mdi:weather-windy"),
+)
+FORECAST_HOUR_FIELDS = (
+    ("condition", "Condition", None, "mdi:weather-partly-cloudy"),
+    ("temperature", "Temperature",
+     UnitOfTemperature.FAHRENHEIT, "mdi:thermometer"),
+    ("precipitation", "Probability Precipitation",
+     PERCENTAGE, "mdi:water-percent"),
+    ("wind_speed", "Wind Speed", UnitOfSpeed.MILES_PER_HOUR, "mdi:weather-windy"),
+    ("humidity", "Humidity", PERCENTAGE, "mdi:water-percent"),
+    ("dew_point", "Dew Point", UnitOfTemperature.FAHRENHEIT, "mdi:thermometer"),
+    ("cloud_cover", "Cloud Cover", PERCENTAGE, "mdi:weather-cloudy"),
+)
+
+
+def forecast_sensor_types(
+    num_days: int, num_hours: int
+) -> tuple[WRALSensorEntityDescription, ...]:
+    """Generate the forecast day 0..num_days-1 and hour 0..num_hours-1 sensors."""
+    families = (
+        (FORECAST_DICT, "day", "Day", num_days, FORECAST_DAY_FIELDS),
+        (FORECAST_HOURLY_DICT, "hour", "Hour", num_hours, FORECAST_HOUR_FIELDS),
+    )
+    return tuple(
+        WRALSensorEntityDescription(
+            key=f"forecast_{family}_{offset}_{field}",
+            name=f"Forecast {family_name} {offset} {name}",
+            icon=icon,
+            native_unit_of_measurement=unit,
+            unit_convert=unit,
+            which_dict=which_dict,
+            forecast_offset=offset,
+            value_key=field,
+        )
+        for which_dict, family, family_name, count, fields in families
+        for offset in range(count)
+        for field, name, unit, icon in fields
+    )
+
+
+def insight_sensor_types(num_hours: int) -> tuple[WRALSensorEntityDescription, ...]:
+    """Generate the forecast insight sensors, over the hours actually kept."""
+    hours = min(INSIGHT_HOURS, num_hours)
+    return (
+        WRALSensorEntityDescription(
+            key="next_rain_hour",
+            name=f"Next Hour Precipitation Over {INSIGHT_RAIN_POP}%",
+            icon="mdi:weather-rainy",
+            device_class=SensorDeviceClass.TIMESTAMP,
+            which_dict=FORECAST_INSIGHTS_DICT,
+        ),
+        WRALSensorEntityDescription(
+            key="first_freezing_hour",
+            name=f"First Hour Below {INSIGHT_FREEZING}F",
+            icon="mdi:snowflake-thermometer",
+            device_class=SensorDeviceClass.TIMESTAMP,
+            which_dict=FORECAST_INSIGHTS_DICT,
+        ),
+        WRALSensorEntityDescription(
+            key="max_temperature",
+            name=f"Next {hours} Hours High Temperature",
+            icon="mdi:thermometer-chevron-up",
+            native_unit_of_measurement=UnitOfTemperature.FAHRENHEIT,
+            unit_convert=UnitOfTemperature.FAHRENHEIT,
+            which_dict=FORECAST_INSIGHTS_DICT,
+        ),
+        WRALSensorEntityDescription(
+            key="min_temperature",
+            name=f"Next {hours} Hours Low Temperature",
+            icon="mdi:thermometer-chevron-down",
+            native_unit_of_measurement=UnitOfTemperature.FAHRENHEIT,
+            unit_convert=UnitOfTemperature.FAHRENHEIT,
+            which_dict=FORECAST_INSIGHTS_DICT,
+        ),
+    )
+
+
+@dataclass
+class WRALMetricSensorEntityDescription(SensorEntityDescription):
+    """Class describing WRAL Weather performance metric sensors."""
+
+    value_fn: Callable[[WRALData], Any] = lambda wral_data: None
+    attributes_fn: Callable[[WRALData], dict[str, Any]] | None = None
+
+
+def _ms(seconds: float | None) -> float | None:
+    """Return seconds as milliseconds, rounded for display."""
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def _ms_summary(histogram: RollingHistogram) -> dict[str, Any]:
+    """Return the summary of a histogram of seconds in milliseconds."""
+    return {
+        stat: value if stat == "count" else _ms(value)
+        for stat, value in histogram.summary().items()
+    }
+
+
+def _percent(rate: float | None) -> float | None:
+    """Return a 0-1 rate as a percentage, rounded for display."""
+    return None if rate is None else round(rate * 100, 1)
+
+
+def _timing_description(
+    key: str, name: str, histogram: str
+) -> WRALMetricSensorEntityDescription:
+    """Describe a sensor of the median of a timing histogram."""
+    return WRALMetricSensorEntityDescription(
+        key=key,
+        name=name,
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda wral_data: _ms(
+            wral_data.wral_api.metrics.histograms[histogram].percentile(50)
+        ),
+        attributes_fn=lambda wral_data: _ms_summary(
+            wral_data.wral_api.metrics.histograms[histogram]
+        ),
+    )
+
+
+PARSE_STAGES = ("decode", "current", "daily", "hourly", "index")
+
+METRIC_SENSOR_TYPES: tuple[WRALMetricSensorEntityDescription, ...] = (
+    _timing_description("metric_city_lookup", "City Lookup Time", "city_lookup"),
+    _timing_description("metric_weather_fetch", "Weather Fetch Time", "weather_fetch"),
+    _timing_description("metric_ttfb", "Time To First Byte", "ttfb"),
+    WRALMetricSensorEntityDescription(
+        key="metric_payload_size",
+        name="Payload Size",
+        icon="mdi:download",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda wral_data: wral_data.wral_api.metrics.histograms[
+            "payload_bytes"
+        ].last,
+        attributes_fn=lambda wral_data: wral_data.wral_api.metrics.histograms[
+            "payload_bytes"
+        ].summary(),
+    ),
+    WRALMetricSensorEntityDescription(
+        key="metric_parse_time",
+        name="Parse Time",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        # Decode + all the sections + the index, of the last update
+        value_fn=lambda wral_data: _ms(
+            wral_data.wral_api.parse_timings.get("serial")
+        ),
+        attributes_fn=lambda wral_data: {
+            f"{stage}_p50": _ms(
+                wral_data.wral_api.metrics.histograms[stage].percentile(50)
+            )
+            for stage in PARSE_STAGES
+        },
+    ),
+    WRALMetricSensorEntityDescription(
+        key="metric_city_id_cache_hit_rate",
+        name="City Id Cache Hit Rate",
+        icon="mdi:cached",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda wral_data: _percent(
+            wral_data.wral_api.metrics.cache_hit_rates()["city_id"]
+        ),
+    ),
+    WRALMetricSensorEntityDescription(
+        key="metric_timestamp_cache_hit_rate",
+        name="Timestamp Cache Hit Rate",
+        icon="mdi:cached",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda wral_data: _percent(
+            wral_data.wral_api.metrics.cache_hit_rates()["timestamps"]
+        ),
+    ),
+    WRALMetricSensorEntityDescription(
+        key="metric_consecutive_failures",
+        name="Consecutive Failures",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda wral_data: wral_data.wral_api.metrics.consecutive_failures,
+        attributes_fn=lambda wral_data: {
+            "updates": wral_data.wral_api.metrics.updates,
+            "failures": wral_data.wral_api.metrics.failures,
+        },
+    ),
+    WRALMetricSensorEntityDescription(
+        key="metric_sensor_writes_suppressed",
+        name="Sensor Writes Suppressed",
+        icon="mdi:database-minus",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda wral_data: wral_data.sensor_writes_suppressed,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the WRAL weather platform."""
     wral_data: WRALData = hass.data[DOMAIN][entry.entry_id]
     zipcode = entry.data[CONF_ZIPCODE] #TJL Change
+    # Each family is up to hundreds of registry entries, so opt in
+    num_days = NUM_FORECAST_DAYS if entry.data.get(CONF_FORECAST_DAY_SENSORS) else 0
+    num_hours = wral_data.wral_api.num_hours
+    num_hour_sensors = num_hours if entry.data.get(CONF_FORECAST_HOUR_SENSORS) else 0
 
     async_add_entities(
         WRALSensor(
@@ -228,7 +484,100 @@ async def async_setup_entry(
             zipcode=zipcode,
         )
         for description in SENSOR_TYPES
+        + forecast_sensor_types(num_days, num_hour_sensors)
+        + insight_sensor_types(num_hours)
     )
+    async_add_entities(
+        WRALMetricSensor(wral_data, description, zipcode)
+        for description in METRIC_SENSOR_TYPES
+    )
+
+
+def _compile_value_fn(
+    description: WRALSensorEntityDescription,
+) -> Callable[[WralWeather], Any]:
+    """Return a function that reads this sensor's raw value from WRAL data."""
+    key = description.value_key or description.key
+    section = {
+        FORECAST_DICT_0: FORECAST_DAILY,
+        FORECAST_DICT: FORECAST_DAILY,
+        FORECAST_HOURLY_DICT: FORECAST_HOURLY,
+        FORECAST_INSIGHTS_DICT: FORECAST_INSIGHTS,
+    }.get(description.which_dict)
+    if section is not None:
+        # Forecast values come from the snapshot built once per update
+        lookup_key = (section, description.forecast_offset, key)
+
+        def _value(wral: WralWeather) -> Any:
+            return wral.forecast_index.values.get(lookup_key)
+    else:
+        def _value(wral: WralWeather) -> Any:
+            return wral.curr_dict.get(key)
+    return _value
+
+
+def _compile_converter(unit_of_measurement: str | None) -> Callable[[Any], Any]:
+    """Return the conversion/rounding function for a native unit."""
+    #TJL CHANGE: WRAL reports in US units, so only the metric
+    #  units are converted; the US units are rounded.
+    if unit_of_measurement == UnitOfSpeed.KILOMETERS_PER_HOUR:
+        return lambda value: round(
+            SpeedConverter.convert(
+                value, UnitOfSpeed.KILOMETERS_PER_HOUR, UnitOfSpeed.MILES_PER_HOUR
+            )
+        )
+    if unit_of_measurement == UnitOfLength.METERS:
+        return lambda value: round(
+            DistanceConverter.convert(value, UnitOfLength.METERS, UnitOfLength.MILES)
+        )
+    if unit_of_measurement == UnitOfPressure.PA:
+        return lambda value: round(
+            PressureConverter.convert(value, UnitOfPressure.PA, UnitOfPressure.INHG),
+            2,
+        )
+    if unit_of_measurement == UnitOfTemperature.FAHRENHEIT:
+        return lambda value: round(value, 1)
+    if unit_of_measurement == PERCENTAGE:
+        return round
+    return lambda value: value
+
+
+def compile_native_value(
+    description: WRALSensorEntityDescription, unit_of_measurement: str | None
+) -> Callable[[WralWeather], Any]:
+    """Compile a description into a single value accessor + converter call."""
+    value_fn = _compile_value_fn(description)
+    if description.device_class == SensorDeviceClass.TIMESTAMP:
+        # Forecast times are kept as ISO strings, HA wants datetimes
+        convert_fn = parse_datetime
+    else:
+        convert_fn = _compile_converter(unit_of_measurement)
+
+    def _native_value(wral: WralWeather) -> Any:
+        if (value := value_fn(wral)) is None:
+            return None
+        return convert_fn(value)
+
+    return _native_value
+
+
+def _within_deadband(
+    value: Any, last_value: Any, deadband: float | None, circular: bool = False
+) -> bool:
+    """Return True if value has moved less than the deadband from last_value."""
+    if value == last_value:
+        return True
+    if deadband is None or value is None or last_value is None:
+        return False
+    try:
+        change = abs(value - last_value)
+    except TypeError:
+        return False
+    if circular:
+        change %= 360
+        change = min(change, 360 - change)
+    # Small slack so a 0.01 step of a 2 decimal reading still counts
+    return change < deadband - 1e-9
 
 
 class WRALSensor(CoordinatorEntity[WralDataUpdateCoordinator], SensorEntity):
@@ -249,6 +598,11 @@ class WRALSensor(CoordinatorEntity[WralDataUpdateCoordinator], SensorEntity):
         super().__init__(wral_data.coordinator_observation)
        #self._wral = wral_data.api
         self._wral = wral_data.wral_api
+        self._wral_data = wral_data
+        self._watchdog = wral_data.watchdog
+        self._last_written_value: Any = _NOT_WRITTEN
+        self._last_written_available: bool | None = None
+        self.suppressed_writes = 0
        #self._latitude = entry_data[CONF_LATITUDE]
        #self._longitude = entry_data[CONF_LONGITUDE]
         self._zipcode = entry_data[CONF_ZIPCODE] #TJL Adder
@@ -258,61 +612,49 @@ class WRALSensor(CoordinatorEntity[WralDataUpdateCoordinator], SensorEntity):
         if hass.config.units is US_CUSTOMARY_SYSTEM:
             self._attr_native_unit_of_measurement = description.unit_convert
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the state."""
-        if (self.entity_description.which_dict == CURRENT_DICT ): #TJL Adder
-            dict_to_use = self._wral.curr_dict  #TJL Adder
-        elif (self.entity_description.which_dict == FORECAST_DICT_0 ): #TJL Adder
-            dict_to_use = self._wral.forecast_daily_list[0]  #TJL Adder
-        else:
-            dict_to_use = self._wral.curr_dict  #TJL Adder
+        # Resolve the dictionary lookup and unit conversion once here
+        # rather than on every state read.
+        self._native_value_fn = compile_native_value(
+            description, self.native_unit_of_measurement
+        )
 
-       #observation = self._wral.curr_dict  #TJL Adder
-        value = dict_to_use.get(self.entity_description.key)  #TJL Adder
-        _LOGGER.debug("Getting Sensor value %s for %s", value, self.entity_description.key) #TJL Adder
-        if (
-            dict_to_use == None 
-           #not (dict_to_use := self._wral.curr_dict)
-            or (value := dict_to_use.get(self.entity_description.key)) is None
-        ):
-            return None
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the value or availability has changed.
 
-        # Set alias to unit property -> prevent unnecessary hasattr calls
-        unit_of_measurement = self.native_unit_of_measurement
+        Every observation tick notifies all sensors; most of the values
+        do not change from one tick to the next, so skip those writes
+        to keep them out of the recorder.
+        """
+        with self._watchdog.measure("sensor._handle_coordinator_update", self._attr_name):
+            self._write_if_changed()
 
-        #TJL CHANGE
-       #if unit_of_measurement == UnitOfSpeed.MILES_PER_HOUR:
-        if unit_of_measurement == UnitOfSpeed.KILOMETERS_PER_HOUR:
-            return round(
-                SpeedConverter.convert(
-                    value, UnitOfSpeed.KILOMETERS_PER_HOUR, UnitOfSpeed.MILES_PER_HOUR
-                )
-            )
-        #TJL CHANGE
-       #if unit_of_measurement == UnitOfLength.MILES:
-        if unit_of_measurement == UnitOfLength.METERS:
-            return round(
-                DistanceConverter.convert(
-                    value, UnitOfLength.METERS, UnitOfLength.MILES
-                )
-            )
-        #TJL CHANGE
-       #if unit_of_measurement == UnitOfPressure.INHG:
-        if unit_of_measurement == UnitOfPressure.PA:
-            return round(
-                PressureConverter.convert(
-                    value, UnitOfPressure.PA, UnitOfPressure.INHG
-                ),
-                2,
+    def _write_if_changed(self) -> None:
+        """Write state unless it is unchanged (see _handle_coordinator_update)."""
+        value = self.native_value
+        available = self.available
+        if (
+            self._last_written_value is not _NOT_WRITTEN
+            and available == self._last_written_available
+            and _within_deadband(
+                value,
+                self._last_written_value,
+                self.entity_description.deadband,
+                self.entity_description.circular,
             )
-        #TJL CHANGE
-       #if unit_of_measurement == UnitOfTemperature.CELSIUS:
-        if unit_of_measurement == UnitOfTemperature.FAHRENHEIT:
-            return round(value, 1)
-        if unit_of_measurement == PERCENTAGE:
-            return round(value)
-        return value
+        ):
+            self.suppressed_writes += 1
+            self._wral_data.sensor_writes_suppressed += 1
+            return
+        self._last_written_value = value
+        self._last_written_available = available
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state."""
+        with self._watchdog.measure("sensor.native_value", self._attr_name):
+            return self._native_value_fn(self._wral)
 
     @property
     def unique_id(self) -> str:
@@ -343,3 +685,47 @@ class WRALSensor(CoordinatorEntity[WralDataUpdateCoordinator], SensorEntity):
        #return device_info(self._latitude, self._longitude)
        #return device_info(self._latitude, self._longitude, self._zipcode) #TJL CHANGE
         return device_info(self._zipcode) #TJL CHANGE
+
+
+class WRALMetricSensor(CoordinatorEntity[WralDataUpdateCoordinator], SensorEntity):
+    """A WRAL performance metric, updated after every observation update."""
+
+    entity_description: WRALMetricSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        wral_data: WRALData,
+        description: WRALMetricSensorEntityDescription,
+        zipcode: str,
+    ) -> None:
+        """Initialise the metric sensor."""
+        super().__init__(wral_data.coordinator_observation)
+        self._wral_data = wral_data
+        self._zipcode = zipcode
+        self.entity_description = description
+        self._attr_name = f"{zipcode} {description.name}"
+        self._attr_unique_id = f"{base_unique_id(zipcode)}_{description.key}"
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state."""
+        return self.entity_description.value_fn(self._wral_data)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the summary of the metric."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self._wral_data)
+
+    @property
+    def available(self) -> bool:
+        """Metrics are kept through failed updates too."""
+        return True
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info."""
+        return device_info(self._zipcode)
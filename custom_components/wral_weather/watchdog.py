@@ -0,0 +1,131 @@
+"""Event loop lag watchdog for the WRAL Weather callbacks.
+
+Measures how long the integration's callbacks (coordinator updates,
+forecast builders, sensor state reads) hold the event loop, keeping
+percentiles per callback and logging the ones over a threshold.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from .wral_weather import RollingHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+# A callback holding the loop longer than this (seconds) is logged
+LOOP_WATCHDOG_THRESHOLD = 0.02
+# But each callback at most once per this many seconds
+LOOP_WATCHDOG_LOG_INTERVAL = 60
+
+
+class _NoMeasure:
+    """Stands in for a measurement when the watchdog is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+
+_NO_MEASURE = _NoMeasure()
+
+
+class _Measure:
+    """Times one run of a callback."""
+
+    __slots__ = ("_watchdog", "_callback", "_detail", "_start")
+
+    def __init__(self, watchdog: LoopWatchdog, callback: str, detail: str | None):
+        self._watchdog = watchdog
+        self._callback = callback
+        self._detail = detail
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        self._watchdog.add(
+            self._callback, time.perf_counter() - self._start, self._detail
+        )
+        return False
+
+
+class LoopWatchdog:
+    """How long each integration callback holds the event loop."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        threshold: float = LOOP_WATCHDOG_THRESHOLD,
+        name: str = "",
+    ) -> None:
+        """Initialise the watchdog; it only measures when enabled."""
+        self.enabled = enabled
+        self.threshold = threshold
+        self.name = name
+        self.histograms: dict[str, RollingHistogram] = {}
+        # callback -> runs over the threshold, in all and since last logged
+        self.offenders: dict[str, int] = {}
+        self._unlogged: dict[str, int] = {}
+        self._last_logged: dict[str, float] = {}
+
+    def measure(self, callback: str, detail: str | None = None) -> Any:
+        """Return a context manager timing one run of 'callback'.
+
+        'detail' (ex. the entity) is only used when logging an offender.
+        """
+        if not self.enabled:
+            return _NO_MEASURE
+        return _Measure(self, callback, detail)
+
+    def add(self, callback: str, seconds: float, detail: str | None = None) -> None:
+        """Add a run of a callback, logging it if over the threshold."""
+        histogram = self.histograms.get(callback)
+        if histogram is None:
+            histogram = self.histograms[callback] = RollingHistogram()
+        histogram.add(seconds)
+        if seconds <= self.threshold:
+            return
+
+        self.offenders[callback] = self.offenders.get(callback, 0) + 1
+        self._unlogged[callback] = self._unlogged.get(callback, 0) + 1
+        now = time.monotonic()
+        if now - self._last_logged.get(callback, -LOOP_WATCHDOG_LOG_INTERVAL) < (
+            LOOP_WATCHDOG_LOG_INTERVAL
+        ):
+            return
+        _LOGGER.warning(
+            "%s %s%s held the event loop for %.1f ms (over %.0f ms %d times "
+            "since last logged, p50 %.1f ms, p99 %.1f ms)",
+            self.name,
+            callback,
+            f" ({detail})" if detail else "",
+            seconds * 1000,
+            self.threshold * 1000,
+            self._unlogged[callback],
+            histogram.percentile(50) * 1000,
+            histogram.percentile(99) * 1000,
+        )
+        self._unlogged[callback] = 0
+        self._last_logged[callback] = now
+
+    def summary(self) -> dict[str, Any]:
+        """Return the percentiles (in ms) and offenders of each callback."""
+        callbacks = {}
+        for callback, histogram in self.histograms.items():
+            stats = histogram.summary()
+            callbacks[callback] = {
+                stat: value if stat == "count" else round(value * 1000, 3)
+                for stat, value in stats.items()
+            }
+            callbacks[callback]["over_threshold"] = self.offenders.get(callback, 0)
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": self.threshold * 1000,
+            "callbacks": callbacks,
+        }
@@ -8,6 +8,8 @@ import pytz  #TJL Adder
 from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, cast
 
+import voluptuous as vol
+
 from homeassistant.components.weather import (
     ATTR_CONDITION_CLEAR_NIGHT,
     ATTR_CONDITION_SUNNY,
@@ -38,11 +40,15 @@ from homeassistant.const import (
     UnitOfTemperature,
     CONF_NAME,  #TJL adder
 )
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import entity_registry as er
+from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse, callback
+from homeassistant.helpers import (
+    config_validation as cv,
+    entity_platform,
+    entity_registry as er,
+)
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util.dt import utcnow
+from homeassistant.util.dt import as_utc, utcnow
 from homeassistant.util.unit_conversion import SpeedConverter, TemperatureConverter
 
 from . import WRALData, base_unique_id, device_info
@@ -58,73 +64,31 @@ from .const import (
     OBSERVATION_VALID_TIME,
     CONF_ZIPCODE, #TJL Adder
     CONF_NUM_HRS, #TJL Adder
+    SERVICE_GET_FORECAST_INSIGHTS,
+    ATTR_PRECIPITATION_ABOVE,
+    ATTR_TEMPERATURE_BELOW,
+    ATTR_HOURS,
+    SERVICE_GET_FORECAST_RANGE,
+    ATTR_FORECAST_TYPE,
+    ATTR_START,
+    ATTR_END,
+    ATTR_FIELDS,
+)
+from .wral_weather import (
+    apparent_temperature,
+    apparent_temperatures_hourly,
+    FORECAST_DAILY,
+    FORECAST_HOURLY,
+    INSIGHT_FREEZING,
+    INSIGHT_HOURS,
+    INSIGHT_RAIN_POP,
+    wral2ha_condition,
 )
 
 PARALLEL_UPDATES = 0
 
 _LOGGER = logging.getLogger(__name__) #TJL Adder
 
-#TJL ADDER
-WRAL_CONDITION_CLASSES = {
-      "exceptional": ["very-cold", "very-hot", "freezing",
-                      "frost", "humid", "smoke"],
-      "snowy": ["snow", "day-chance-snow", "night-chance-snow",
-                "snow-sleet", "day-chance-snow-sleet",
-                "night-chance-snow-sleet"],
-      "snowy-rainy": ["day-chance-sleet", "night-chance-sleet",
-                      "day-chance-snow-and-sleet",
-                      "night-chance-snow-and-sleet",
-                      "rain-snow", "day-chance-rain-and-snow",
-                      "night-chance-rain-and-snow",
-                      "rain-sleet", "day-chance-rain-and-sleet",
-                      "night-chance-rain-and-sleet", "sleet",
-                      "freezing-rain", "day-chance-freezing-rain",
-                      "night-chance-freezing-rain"],
-      "hail": [],
-      "lightning-rainy": ["thunderstorms-rain",
-                          "day-chance-rain-and-tstorms",
-                          "night-chance-rain-and-tstorms"],
-      "lightning": ["thunderstorm", "day-chance-tstorm",
-                    "night-chance-tstorm"],
-      "pouring": [],
-      "rainy": ["rain", "day-chance-rain", "night-chance-rain",
-                "rain-showers", "day-chance-rain-showers",
-                "night-chance-rain-showers",
-                "drizzle", "day-chance-drizzle", "night-chance-drizzle"],
-      "windy-variant": [],
-      "windy": ["windy"],
-      "fog": ["misc-fog"],
-      "clear": ["day-clear", "night-clear",
-                "day-dry", "night-dry"],
-      "cloudy": ["cloudy", "day-mostly-cloudy", "night-mostly-cloudy"],
-      "partlycloudy": ["day-mostly-clear", "night-mostly-clear",
-                       "day-partly-cloudy", "night-partly-cloudy"
-                       "day-haze", "night-haze",
-                       "day-dust", "night-dust"],
-    }
-
-#TJL ADDER
-def wral2ha_condition(wral_cond):
-    """
-    Convert WRAL Condition (current or forecast)
-    to HA hui-weather-forecast-card weatherIcons.
-    """
-    for key, value in WRAL_CONDITION_CLASSES.items():
-        if wral_cond in value:
-            break
-    found = wral_cond.find("night")
-    if found != -1:
-        time = "night"
-    else:
-        time = "day"
-    cond = key
-    if cond == "clear":
-        if time == "day":
-            return "sunny"
-        if time == "night":
-            return "clear-night"
-    return cond
-
 #TJL ADDER
 def wral_forecast_day2iso(day, offset_from_today):
     """
@@ -160,6 +124,34 @@ async def async_setup_entry(
 
     async_add_entities(entities, False)
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_GET_FORECAST_INSIGHTS,
+        {
+            vol.Optional(ATTR_PRECIPITATION_ABOVE, default=INSIGHT_RAIN_POP):
+                vol.Coerce(float),
+            vol.Optional(ATTR_TEMPERATURE_BELOW, default=INSIGHT_FREEZING):
+                vol.Coerce(float),
+            vol.Optional(ATTR_HOURS, default=INSIGHT_HOURS):
+                vol.All(vol.Coerce(int), vol.Range(min=1)),
+        },
+        "async_get_forecast_insights",
+        supports_response=SupportsResponse.ONLY,
+    )
+    platform.async_register_entity_service(
+        SERVICE_GET_FORECAST_RANGE,
+        {
+            vol.Optional(ATTR_FORECAST_TYPE, default=FORECAST_HOURLY):
+                vol.In([FORECAST_HOURLY, FORECAST_DAILY]),
+            vol.Required(ATTR_START): cv.datetime,
+            vol.Required(ATTR_END): cv.datetime,
+            vol.Optional(ATTR_FIELDS, default=[]):
+                vol.All(cv.ensure_list, [cv.string]),
+        },
+        "async_get_forecast_range",
+        supports_response=SupportsResponse.ONLY,
+    )
+
 
 def _calculate_unique_id(entry_data: MappingProxyType[str, Any], mode: str) -> str:
     """Calculate unique ID."""
@@ -179,7 +171,8 @@ class WRALWeather(CoordinatorWeatherEntity):
     _attr_supported_features = (
        #WeatherEntityFeature.FORECAST_HOURLY | WeatherEntityFeature.FORECAST_TWICE_DAILY  | WeatherEntityFeature.FORECAST_DAILY
        #WeatherEntityFeature.FORECAST_DAILY #TJL reduce to only daily forecast
-        WeatherEntityFeature.FORECAST_DAILY | WeatherEntityFeature.FORECAST_HOURLY 
+        WeatherEntityFeature.FORECAST_DAILY | WeatherEntityFeature.FORECAST_HOURLY
+        | WeatherEntityFeature.FORECAST_TWICE_DAILY
     )
 
 
@@ -193,14 +186,15 @@ class WRALWeather(CoordinatorWeatherEntity):
         super().__init__(
             observation_coordinator=wral_data.coordinator_observation,
             hourly_coordinator=wral_data.coordinator_forecast_hourly,
-            twice_daily_coordinator=wral_data.coordinator_forecast_twice_daily,
+            # The twice daily forecast is derived from the observation
+            #   coordinator's data, so it has no coordinator of its own.
             hourly_forecast_valid=FORECAST_VALID_TIME,
-            twice_daily_forecast_valid=FORECAST_VALID_TIME,
             daily_coordinator=wral_data.coordinator_forecast_daily, #TJL Adder
             daily_forecast_valid=OBSERVATION_VALID_TIME, #TJL Adder
         )
 
         self.wral = wral_data.wral_api  #TJL Adder
+        self._watchdog = wral_data.watchdog
         self.zipcode = entry_data[CONF_ZIPCODE] #TJL Adder
         self.wral_name = entry_data[CONF_NAME]
         self.mode = mode
@@ -208,7 +202,6 @@ class WRALWeather(CoordinatorWeatherEntity):
        #self.observation: dict[str, Any] | None = None  #TJL CHANGE wral now doing
         self._forecast_hourly: list[dict[str, Any]] | None = None
        #self._forecast_legacy: list[dict[str, Any]] | None = None
-        self._forecast_twice_daily: list[dict[str, Any]] | None = None
         self._forecast_daily: list[dict[str, Any]] | None = None #TJL Adder
 
         self._attr_unique_id = _calculate_unique_id(entry_data, mode)
@@ -220,7 +213,6 @@ class WRALWeather(CoordinatorWeatherEntity):
         _LOGGER.debug("Load initial data from coordinators") #TJL Adder
         self._handle_coordinator_update()
         self._handle_hourly_forecast_coordinator_update()
-        self._handle_twice_daily_forecast_coordinator_update()
        #self._handle_legacy_forecast_coordinator_update()  #TJL Remove legacy
         self._handle_daily_forecast_coordinator_update() #TJL Adder
 
@@ -228,9 +220,13 @@ class WRALWeather(CoordinatorWeatherEntity):
     def _handle_coordinator_update(self) -> None:
         """Load data from integration."""
         _LOGGER.debug("Handling Coordinator Update") #TJL Adder
-        self._forecast_daily = self.wral.forecast_daily_list #TJL Adder to refresh HA state
-        self._forecast_hourly = self.wral.forecast_hourly_list #TJL Adder to refresh HA state
-        self.async_write_ha_state()
+        with self._watchdog.measure("weather._handle_coordinator_update"):
+            self._forecast_daily = self.wral.forecast_daily_list #TJL Adder to refresh HA state
+            self._forecast_hourly = self.wral.forecast_hourly_list #TJL Adder to refresh HA state
+            self.async_write_ha_state()
+        # No coordinator drives the twice daily forecast, so let its
+        #   subscribers know there is new data here.
+        self.hass.async_create_task(self.async_update_listeners(("twice_daily",)))
 
     @callback
     def _handle_hourly_forecast_coordinator_update(self) -> None:
@@ -239,13 +235,6 @@ class WRALWeather(CoordinatorWeatherEntity):
        #TJL This for some reason only gets called a couple of times a day randomly
         self._forecast_hourly = self.wral.forecast_hourly_list #TJL Adder
 
-    @callback
-    def _handle_twice_daily_forecast_coordinator_update(self) -> None:
-        """Handle updated data from the twice daily forecast coordinator."""
-        _LOGGER.debug("Handling Coordinator Twice Daily") #TJL Adder
-       #TJL Place holder for twice daily. WRAL currently does not provide.
-       #self._forecast_twice_daily = self.wral.forecast_twicedaily 
-
     @callback #TJL Adder
     def _handle_daily_forecast_coordinator_update(self) -> None:
         """Handle updated data from the daily forecast coordinator."""
@@ -265,7 +254,6 @@ class WRALWeather(CoordinatorWeatherEntity):
         """Return the current temperature."""
         if self.wral.curr_dict:
             wral_curr_temp = self.wral.curr_dict.get("current_temperature")
-            _LOGGER.debug("WRAL Curr Temp %d", wral_curr_temp)
             return wral_curr_temp
         else:
             return None
@@ -281,23 +269,14 @@ class WRALWeather(CoordinatorWeatherEntity):
     def native_apparent_temperature(self) -> float | None:
         """Return the apparent temperature."""
         if self.wral.curr_dict:
-            temperature = self.wral.curr_dict.get("current_temperature")
-            heat_index = self.wral.curr_dict.get("current_heat_index")
-            wind_chill = self.wral.curr_dict.get("current_wind_chill")
-            if heat_index == None:
-               heat_index = temperature
-            if wind_chill == None:
-               wind_chill = temperature
-            if temperature <= 50:
-                apparent_temp = wind_chill
-            elif temperature > 80:
-                apparent_temp = heat_index
-            else:
-                apparent_temp = temperature
+            apparent_temp = apparent_temperature(
+                self.wral.curr_dict.get("current_temperature"),
+                self.wral.curr_dict.get("current_heat_index"),
+                self.wral.curr_dict.get("current_wind_chill"),
+            )
         else:
             apparent_temp = None
-            
-        _LOGGER.debug("WRAL Curr Apparent Temp %d", apparent_temp)
+
         return apparent_temp
 
     @property  #TJL ADDER
@@ -308,7 +287,6 @@ class WRALWeather(CoordinatorWeatherEntity):
         else:
             gust = None
 
-        _LOGGER.debug("WRAL Curr Wind Gusts %d", gust)
         return gust
 
     @property
@@ -317,7 +295,6 @@ class WRALWeather(CoordinatorWeatherEntity):
       # TJL CHANGE
         if self.wral.curr_dict:
             wral_curr_press = self.wral.curr_dict.get("current_pressure")
-            _LOGGER.debug("WRAL Curr Presssure %f", wral_curr_press)
             return wral_curr_press
         else:
             return None
@@ -336,7 +313,6 @@ class WRALWeather(CoordinatorWeatherEntity):
         if self.wral.curr_dict:
             wral_curr_hum =\
                 self.wral.curr_dict.get("current_relative_humidity")
-            _LOGGER.debug("WRAL Curr Relative Humidity %d", wral_curr_hum)
             return wral_curr_hum
         else:
             return None
@@ -348,7 +324,6 @@ class WRALWeather(CoordinatorWeatherEntity):
       # TJL CHANGE
         if self.wral.curr_dict:
             wral_curr_ws = self.wral.curr_dict.get("current_wind_speed")
-            _LOGGER.debug("WRAL Curr Wind Speed %d", wral_curr_ws)
             return round(wral_curr_ws)
         else:
             return None
@@ -365,7 +340,6 @@ class WRALWeather(CoordinatorWeatherEntity):
       # TJL CHANGE
         if self.wral.curr_dict:
             wral_curr_wb = self.wral.curr_dict.get("current_wind_bearing")
-            _LOGGER.debug("WRAL Curr Wind Bearing %d", wral_curr_wb)
             return wral_curr_wb
         else:
             return None
@@ -376,9 +350,7 @@ class WRALWeather(CoordinatorWeatherEntity):
         """Return current condition."""
         if self.wral.curr_dict:
             wral_cond = self.wral.curr_dict.get("current_icon_conditions")
-            _LOGGER.debug("WRAL Curr Icon Condition %s", wral_cond)
             wral_ha_cond = wral2ha_condition(wral_cond)
-            _LOGGER.debug("WRAL Curr HA Condition %s", wral_ha_cond)
             return wral_ha_cond
         else:
             return None
@@ -389,7 +361,6 @@ class WRALWeather(CoordinatorWeatherEntity):
       # TJL CHANGE
         if self.wral.curr_dict:
             wral_curr_visib = self.wral.curr_dict.get("current_visibility")
-            _LOGGER.debug("WRAL Curr Visibility %f", wral_curr_visib)
             return wral_curr_visib
         else:
             return None
@@ -442,13 +413,45 @@ class WRALWeather(CoordinatorWeatherEntity):
 
                 wral_forecast.append(data)
                 i = i + 1
-            _LOGGER.debug("WRAL Daily Forecast List for HA %s", wral_forecast)
+            _LOGGER.debug("WRAL Daily Forecast for HA: %d entries",
+                          len(wral_forecast))
 
             return wral_forecast
     
+        if mode == DAYNIGHT:
+            _LOGGER.debug("Building WRAL twice daily forecast for HA")
+            for forecast_entry in generic_forecast:
+                data = {
+                    ATTR_FORECAST_TIME: forecast_entry.get("which_dt"),
+                    ATTR_FORECAST_IS_DAYTIME: forecast_entry.get("is_daytime"),
+                    ATTR_FORECAST_DETAILED_DESCRIPTION: forecast_entry.get(
+                        "detailed_description"
+                    ),
+                    ATTR_FORECAST_NATIVE_TEMP:
+                        forecast_entry.get("temperature"),
+                    ATTR_FORECAST_PRECIPITATION_PROBABILITY:
+                        forecast_entry.get("precipitation"),
+                    ATTR_FORECAST_NATIVE_WIND_SPEED:
+                        forecast_entry.get("wind_speed"),
+                    ATTR_FORECAST_WIND_BEARING:
+                        forecast_entry.get("wind_bearing"),
+                    ATTR_FORECAST_NATIVE_DEW_POINT:
+                        forecast_entry.get("dew_point"),
+                }
+                wral_cond = forecast_entry.get("icon_condition")
+                data[ATTR_FORECAST_CONDITION] = wral2ha_condition(wral_cond)
+
+                wral_forecast.append(data)
+            _LOGGER.debug("WRAL Twice Daily Forecast for HA: %d entries",
+                          len(wral_forecast))
+
+            return wral_forecast
+
         #TJL Adder
         if mode == HOURLY:
             _LOGGER.debug("Building WRAL hourly forecast for HA") #TJL Adder
+            # Apparent Temperature for all the hours in one pass
+            apparent_temps = apparent_temperatures_hourly(generic_forecast)
             for forecast_entry in generic_forecast:
                 data = {
                     ATTR_FORECAST_TIME:
@@ -474,21 +477,12 @@ class WRALWeather(CoordinatorWeatherEntity):
                 wral_ha_cond = wral2ha_condition(wral_cond)
                 data[ATTR_FORECAST_CONDITION] = wral_ha_cond
 
-                #Compute Apparent Temperature
-                temperature = forecast_entry.get("temperature")
-                heat_index = forecast_entry.get("heat_index")
-                wind_chill = forecast_entry.get("wind_chill")
-                if temperature <= 50:
-                    apparent_temp = wind_chill
-                elif temperature > 80:
-                    apparent_temp = heat_index
-                else:
-                    apparent_temp = temperature
-                data[ATTR_FORECAST_NATIVE_APPARENT_TEMP] = apparent_temp
+                data[ATTR_FORECAST_NATIVE_APPARENT_TEMP] = apparent_temps[i]
 
                 wral_forecast.append(data)
                 i = i + 1
-            _LOGGER.debug("WRAL Hourly Forecast List for HA %s", wral_forecast)
+            _LOGGER.debug("WRAL Hourly Forecast for HA: %d entries",
+                          len(wral_forecast))
 
             return wral_forecast
 
@@ -496,24 +490,26 @@ class WRALWeather(CoordinatorWeatherEntity):
     def _async_forecast_hourly(self) -> list[Forecast] | None:
         """Return the hourly forecast in native units."""
         _LOGGER.debug("async forecast hourly") #TJL Adder
-        return self._forecast(self._forecast_hourly, HOURLY)
+        with self._watchdog.measure("weather.forecast_hourly"):
+            return self._forecast(self._forecast_hourly, HOURLY)
 
     @callback
     def _async_forecast_twice_daily(self) -> list[Forecast] | None:
         """Return the twice daily forecast in native units."""
         _LOGGER.debug("async forecast twice daily") #TJL Adder
-        return self._forecast(self._forecast_twice_daily, DAYNIGHT)
+        with self._watchdog.measure("weather.forecast_twice_daily"):
+            return self._forecast(self.wral.forecast_twice_daily_list, DAYNIGHT)
 
     @callback #TJL ADDER
     def _async_forecast_daily(self) -> list[Forecast] | None:
         """Return the daily forecast in native units."""
         _LOGGER.debug("async forecast daily") #TJL Adder
-        return self._forecast(self._forecast_daily, DAILY)
+        with self._watchdog.measure("weather.forecast_daily"):
+            return self._forecast(self._forecast_daily, DAILY)
 
     @property
     def available(self) -> bool:
         """Return if state is available."""
-        _LOGGER.debug("Checking weather entity for availability") #TJL Adder
         last_success = (
             self.coordinator.last_update_success
           # and self.coordinator_forecast_legacy.last_update_success  #TJL Change
@@ -532,6 +528,45 @@ class WRALWeather(CoordinatorWeatherEntity):
             last_success_time = False
         return last_success or last_success_time
 
+    async def async_get_forecast_insights(
+        self,
+        precipitation_above: float = INSIGHT_RAIN_POP,
+        temperature_below: float = INSIGHT_FREEZING,
+        hours: int = INSIGHT_HOURS,
+    ) -> ServiceResponse:
+        """Return forecast insights from the index built at the last update."""
+        forecast_index = self.wral.forecast_index
+        next_rain = forecast_index.first_hour_above(
+            "precipitation", precipitation_above
+        )
+        first_below = forecast_index.first_hour_below(
+            "temperature", temperature_below
+        )
+        max_temp, min_temp = forecast_index.hourly_extremes("temperature", hours)
+        return {
+            "next_precipitation": dict(next_rain) if next_rain else None,
+            "first_temperature_below": dict(first_below) if first_below else None,
+            "max_temperature": max_temp,
+            "min_temperature": min_temp,
+        }
+
+    async def async_get_forecast_range(
+        self,
+        start: datetime,
+        end: datetime,
+        type: str = FORECAST_HOURLY,
+        fields: list[str] | None = None,
+    ) -> ServiceResponse:
+        """Return the forecast entries between start and end (inclusive)."""
+        # Naive datetimes are taken to be in the HA time zone
+        forecast = self.wral.forecast_index.forecast_range(
+            type,
+            as_utc(start).timestamp(),
+            as_utc(end).timestamp(),
+            fields,
+        )
+        return {"forecast": forecast}
+
     async def async_update(self) -> None:
         """Update the entity.
 
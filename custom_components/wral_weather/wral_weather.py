@@ -1,7 +1,20 @@
 """Weather component that handles meteorological data from WRAL TV."""
 import logging
 import aiohttp
+import asyncio
+import bisect
+import collections
+import concurrent.futures
+import contextvars
 import datetime
+import importlib.util
+import json
+import multiprocessing
+import os
+import site
+import sys
+import threading
+import time
 import pytz
 
 ERRORS = (aiohttp.ClientError)
@@ -141,23 +154,482 @@ def search_for_item(scope_start, scope_end, category_search_string,
                 return None
     return item_value
 
-def wind_degrees2direction(degrees):
+# Most forecast timestamps are the same from one poll to the next
+#   (and for every zipcode), so their ISO strings are cached.
+#   7 days plus 7 days of hours, with room to spare.
+TIMESTAMP_CACHE_SIZE = 512
+
+class TimestampConverter:
+    """
+    Convert WRAL forecast timestamps to local time ISO strings
+      and day names.
+    'refresh()' resolves the local time zone, once per parse rather
+      than once per forecast entry.  If the zone (UTC offset) has
+      changed since the last parse the cached strings are dropped.
+    """
+    def __init__(self, max_size=TIMESTAMP_CACHE_SIZE):
+        self.tz = None
+        self.max_size = max_size
+        self._iso_cache = {}
+        self._day_cache = {}
+        self.hits = 0
+        self.misses = 0
+        # Parses can run in executor threads (see PARSE_MODE_THREAD)
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Resolve the local time zone for the parse about to start."""
+        tz = datetime.datetime.now().astimezone().tzinfo
+        if tz != self.tz:
+            with self._lock:
+                self.tz = tz
+                self._iso_cache.clear()
+                self._day_cache.clear()
+        return tz
+
+    def _put(self, cache, key, value, max_size):
+        """Add to a cache, dropping the oldest entry when full."""
+        with self._lock:
+            if len(cache) >= max_size:
+                cache.pop(next(iter(cache)), None)
+            cache[key] = value
+
+    def isoformat(self, timestamp):
+        """Return the ISO string of a timestamp in the local time zone."""
+        try:
+            iso = self._iso_cache[timestamp]
+        except KeyError:
+            self.misses += 1
+            iso = datetime.datetime.fromtimestamp(timestamp, self.tz).isoformat()
+            self._put(self._iso_cache, timestamp, iso, self.max_size)
+        else:
+            self.hits += 1
+        return iso
+
+    def isoformat_many(self, timestamps):
+        """Return the ISO strings of a list of timestamps."""
+        return [self.isoformat(timestamp) for timestamp in timestamps]
+
+    def day_name(self, timestamp):
+        """Return the abbreviated local day name (ex. 'Mon')."""
+        try:
+            return self._day_cache[timestamp]
+        except KeyError:
+            day = datetime.datetime.fromtimestamp(timestamp).strftime("%a")
+            self._put(self._day_cache, timestamp, day, self.max_size)
+            return day
+
+    def clear(self):
+        """Drop all cached strings."""
+        with self._lock:
+            self._iso_cache.clear()
+            self._day_cache.clear()
+
+
+# Shared by all WralWeather instances
+TIMESTAMPS = TimestampConverter()
+
+# Conditions, icon names, wind directions and sunrise/sunset strings
+#   repeat across days, hours and zipcodes (the sunrise/sunset of a day
+#   on every poll, and for every zipcode around).  Instead of keeping a
+#   new copy of each from every poll, keep one shared copy of each.
+#   Free text (the day and night descriptions) rarely repeats, so it is
+#   not shared.
+#   The table is bounded so an odd feed can't grow it forever; when
+#   full, the least recently used string makes room.
+STRING_TABLE_SIZE = 2048
+
+class StringTable:
+    """A bounded (LRU) table of shared copies of repeated strings."""
+    def __init__(self, max_size=STRING_TABLE_SIZE):
+        self.max_size = max_size
+        self._table = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Parses can run in executor threads (see PARSE_MODE_THREAD)
+        self._lock = threading.Lock()
+
+    def intern(self, value):
+        """
+        Return the shared copy of a string, adding it (and dropping the
+          least recently used one if full) if it is new.
+        Anything that isn't a string is returned as is.
+        """
+        if type(value) is not str:
+            return value
+        if self.max_size <= 0:
+            # A table of no size shares nothing
+            return value
+        table = self._table
+        with self._lock:
+            shared = table.get(value)
+            if shared is not None:
+                self.hits += 1
+                table.move_to_end(value)
+                return shared
+            self.misses += 1
+            if table and len(table) >= self.max_size:
+                table.popitem(last=False)
+                self.evictions += 1
+            table[value] = value
+            return value
+
+    def __len__(self):
+        return len(self._table)
+
+    def clear(self):
+        """Forget all the shared strings."""
+        with self._lock:
+            self._table.clear()
+
+
+# Shared by all WralWeather instances
+STRINGS = StringTable()
+
+def intern(value):
+    """Return the shared copy of a repeated string (see StringTable)."""
+    return STRINGS.intern(value)
+
+def _compute_wind_direction(degrees):
     """
     Compute the direction of the wind ex. 'North','East", etc.
     from degrees where 'North' is 0 degrees.
+    Degrees outside 0-360 are wrapped around first.
     """
+    degrees = degrees % 360
     quadrant = int(degrees/22.5)
     if (degrees % 22.5 > 11.25):
         quadrant = quadrant +1
-    return wind_directions[quadrant] 
+    return wind_directions[quadrant]
+
+# Wind direction for each whole degree 0-360, built once at import.
+WIND_DEGREES_TABLE = tuple(
+    _compute_wind_direction(degrees) for degrees in range(0, 361))
+
+def wind_degrees2direction(degrees):
+    """
+    Return the direction of the wind ex. 'North','East", etc.
+    from degrees where 'North' is 0 degrees.
+    """
+    if type(degrees) is int and 0 <= degrees <= 360:
+        return WIND_DEGREES_TABLE[degrees]
+    return _compute_wind_direction(degrees)
+
+def wind_degrees2directions(degrees_list):
+    """Return the wind direction of each of a list of degrees."""
+    table = WIND_DEGREES_TABLE
+    return [table[degrees] if type(degrees) is int and 0 <= degrees <= 360
+            else _compute_wind_direction(degrees)
+            for degrees in degrees_list]
+
+#
+# Tolerant lookup of wind direction labels to bearings.
+#   Besides the exact WRAL labels this accepts any case/spacing,
+#   ex. 'north-northeast', and the abbreviations, ex. 'NNE'.
+#
+_WIND_WORD_ABBREVIATIONS = {
+    'north': 'N', 'northeast': 'NE', 'east': 'E', 'southeast': 'SE',
+    'south': 'S', 'southwest': 'SW', 'west': 'W', 'northwest': 'NW',
+    }
+
+def _normalize_wind_label(label):
+    """Lower case a wind direction label and drop spaces, '-' and '_'."""
+    return label.lower().replace(' ', '').replace('-', '').replace('_', '')
+
+def _build_wind_label_bearings():
+    """Map every normalized label and abbreviation to its bearing."""
+    bearings = {}
+    for label, bearing in wind_direction2degrees.items():
+        bearings[_normalize_wind_label(label)] = bearing
+        abbreviation = ''.join(_WIND_WORD_ABBREVIATIONS[word.lower()]
+                               for word in label.split())
+        bearings[abbreviation.lower()] = bearing
+    return bearings
+
+WIND_LABEL_BEARINGS = _build_wind_label_bearings()
 
-def parse_current_conditions(curr_json):
+def wind_direction2bearing(label):
+    """
+    Return the bearing in degrees of a wind direction label.
+    An unknown label (ex. 'Calm' or 'Variable') gives None
+      rather than raising, so it can't fail a whole update.
+    """
+    try:
+        return wind_direction2degrees[label]
+    except (KeyError, TypeError):
+        pass
+    if not isinstance(label, str):
+        return None
+    bearing = WIND_LABEL_BEARINGS.get(_normalize_wind_label(label))
+    if bearing is None:
+        # Some feeds give the bearing itself
+        try:
+            bearing = float(label) % 360
+        except ValueError:
+            _LOGGER.debug("Unknown wind direction: %s", label)
+    return bearing
+
+def wind_directions2bearings(labels):
+    """Return the bearing of each of a list of wind direction labels."""
+    exact = wind_direction2degrees
+    return [exact[label] if label in exact
+            else wind_direction2bearing(label)
+            for label in labels]
+
+# WRAL icon conditions (see CURRENT_WEATHER_SEARCH_STRINGS) by the
+#   HA condition (hui-weather-forecast-card weatherIcons) they map to.
+WRAL_CONDITION_CLASSES = {
+      "exceptional": ["very-cold", "very-hot", "freezing",
+                      "frost", "humid", "smoke"],
+      "snowy": ["snow", "day-chance-snow", "night-chance-snow",
+                "snow-sleet", "day-chance-snow-sleet",
+                "night-chance-snow-sleet"],
+      "snowy-rainy": ["day-chance-sleet", "night-chance-sleet",
+                      "day-chance-snow-and-sleet",
+                      "night-chance-snow-and-sleet",
+                      "rain-snow", "day-chance-rain-and-snow",
+                      "night-chance-rain-and-snow",
+                      "rain-sleet", "day-chance-rain-and-sleet",
+                      "night-chance-rain-and-sleet", "sleet",
+                      "freezing-rain", "day-chance-freezing-rain",
+                      "night-chance-freezing-rain"],
+      "hail": [],
+      "lightning-rainy": ["thunderstorms-rain",
+                          "day-chance-rain-and-tstorms",
+                          "night-chance-rain-and-tstorms"],
+      "lightning": ["thunderstorm", "day-chance-tstorm",
+                    "night-chance-tstorm"],
+      "pouring": [],
+      "rainy": ["rain", "day-chance-rain", "night-chance-rain",
+                "rain-showers", "day-chance-rain-showers",
+                "night-chance-rain-showers",
+                "drizzle", "day-chance-drizzle", "night-chance-drizzle"],
+      "windy-variant": [],
+      "windy": ["windy"],
+      "fog": ["misc-fog"],
+      "clear": ["day-clear", "night-clear",
+                "day-dry", "night-dry"],
+      "cloudy": ["cloudy", "day-mostly-cloudy", "night-mostly-cloudy"],
+      "partlycloudy": ["day-mostly-clear", "night-mostly-clear",
+                       "day-partly-cloudy", "night-partly-cloudy",
+                       "day-haze", "night-haze",
+                       "day-dust", "night-dust"],
+    }
+# A condition not listed above is shown as partly cloudy
+WRAL_CONDITION_DEFAULT = "partlycloudy"
+
+# WRAL condition -> HA condition, built once from the classes above
+#   (the first class listing a condition wins).
+WRAL_CONDITION_LOOKUP = {}
+for _ha_cond, _wral_conds in WRAL_CONDITION_CLASSES.items():
+    for _wral_cond in _wral_conds:
+        WRAL_CONDITION_LOOKUP.setdefault(_wral_cond, _ha_cond)
+del _ha_cond, _wral_conds, _wral_cond
+
+def wral2ha_condition(wral_cond):
+    """
+    Convert WRAL Condition (current or forecast)
+    to HA hui-weather-forecast-card weatherIcons.
+    """
+    cond = WRAL_CONDITION_LOOKUP.get(wral_cond, WRAL_CONDITION_DEFAULT)
+    if cond == "clear":
+        if isinstance(wral_cond, str) and "night" in wral_cond:
+            return "clear-night"
+        return "sunny"
+    return cond
+
+# Apparent Temperature (see https://digital.weather.gov/staticpages/definitions.php)
+#   At or below this it is the wind chill, above it is the heat index,
+#   otherwise it is just the temperature.
+APPARENT_WIND_CHILL_MAX = 50
+APPARENT_HEAT_INDEX_MIN = 80
+
+def apparent_temperature(temperature, heat_index=None, wind_chill=None):
+    """
+    Return the apparent temperature.
+    A missing heat index or wind chill falls back to the temperature,
+      and a missing temperature gives None.
+    """
+    if temperature is None:
+        return None
+    if temperature <= APPARENT_WIND_CHILL_MAX:
+        return temperature if wind_chill is None else wind_chill
+    if temperature > APPARENT_HEAT_INDEX_MIN:
+        return temperature if heat_index is None else heat_index
+    return temperature
+
+def apparent_temperatures_hourly(forecast_hourly_list):
+    """
+    Return the apparent temperature of every hour of a parsed forecast.
+    The same rules as apparent_temperature(), inlined so a whole week
+      of hours doesn't pay a function call per hour.
+      Note: NumPy was tried here and dropped, as getting the hours in
+      and out of arrays costs more than it saves even for 50 zipcodes
+      of 168 hours (see benchmarks/bench_apparent.py).
+    """
+    apparent = []
+    append = apparent.append
+    for hour in forecast_hourly_list:
+        temperature = hour.get("temperature")
+        if temperature is None:
+            append(None)
+        elif temperature <= APPARENT_WIND_CHILL_MAX:
+            wind_chill = hour.get("wind_chill")
+            append(temperature if wind_chill is None else wind_chill)
+        elif temperature > APPARENT_HEAT_INDEX_MIN:
+            heat_index = hour.get("heat_index")
+            append(temperature if heat_index is None else heat_index)
+        else:
+            append(temperature)
+    return apparent
+
+
+#
+# Debug logging of the parsers.  Whether debug is on is checked once
+#   per section rather than per entry, and then only every Nth parsed
+#   entry of a section is logged, as its parsed record rather than the
+#   raw payload.  A rate of 0 logs none of the section's entries.
+#
+DEBUG_SAMPLE_RATES = {"current": 1, "daily": 1, "hourly": 24}
+
+def _debug_sample_rate(section):
+    """Return every how many entries of 'section' to log, 0 for none."""
+    if not _LOGGER.isEnabledFor(logging.DEBUG):
+        return 0
+    return DEBUG_SAMPLE_RATES.get(section, 0)
+
+def _parse_summary(body_size, snapshot, timings, errors):
+    """Return a one line summary of a parse for the debug log."""
+    curr_dict, daily, hourly, _ = snapshot
+    return (
+        f"{body_size} bytes, decode {timings['decode'] * 1000:.2f} ms, "
+        + ", ".join(
+            f"{section} " + (f"{len(result)} {unit} "
+                             if result is not None else "failed ")
+            + f"{timings[section] * 1000:.2f} ms"
+            for section, result, unit in (("current", curr_dict, "fields"),
+                                          ("daily", daily, "days"),
+                                          ("hourly", hourly, "hours")))
+        + f", index {timings['index'] * 1000:.2f} ms, "
+        f"{sum(errors.values())} field errors")
+
+
+#
+# Field readers for the parsers.  A field that can't be read gives
+#   its default and is counted in 'errors' (a collections.Counter,
+#   keyed by "section.field") so one bad value doesn't cost the
+#   whole update.  None and empty strings are expected from WRAL
+#   from time to time, so those just give the default.
+#
+def _count_error(errors, section, field):
+    """Count a field that could not be read."""
+    if errors is not None:
+        errors[f"{section}.{field}"] += 1
+
+def _raw_field(data, key, errors, section):
+    """Return data[key], or None (counted) if there is no such field."""
+    try:
+        return data[key]
+    except (KeyError, TypeError, IndexError):
+        _count_error(errors, section, key)
+        return None
+
+def _int_field(data, key, default, errors, section):
+    """Return the int value of a field (which may be a string)."""
+    value = _raw_field(data, key, errors, section)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            _count_error(errors, section, key)
+            return default
+
+def _float_field(data, key, default, errors, section):
+    """Return the float value of a field (which may be a string)."""
+    value = _raw_field(data, key, errors, section)
+    if value is None or value == "":
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        _count_error(errors, section, key)
+        return default
+
+def _text_field(data, key, default, errors, section):
+    """Return the string value of a field, as is (ex. free text)."""
+    value = _raw_field(data, key, errors, section)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        _count_error(errors, section, key)
+        return default
+    return value
+
+def _str_field(data, key, default, errors, section):
+    """
+    Return the (shared, see intern()) string value of a field.
+    Only for labels with a few distinct values, ex. conditions.
+    """
+    value = _text_field(data, key, default, errors, section)
+    if value is default:
+        return default
+    return intern(value)
+
+def _icon_condition(data, key, search_strings, errors, section):
+    """Return the icon name from a field holding a legacy icon URL."""
+    icon = _raw_field(data, key, errors, section)
+    if icon is None:
+        return None
+    if not isinstance(icon, str):
+        _count_error(errors, section, key)
+        return None
+    ss = search_strings
+    return intern(search_for_item(0, None, ss['conditions'][0],
+                                  ss['conditions'][1],
+                                  ss['conditions'][2],
+                                  icon))
+
+def _timestamped_entries(entries, iterations, errors, section):
+    """
+    Return (timestamp, entry) of the first 'iterations' forecast entries.
+    An entry without a usable timestamp is left out (and counted).
+    """
+    timestamped = []
+    for entry in entries[:iterations]:
+        try:
+            timestamped.append((int(entry['forecastDate']['timestamp']), entry))
+        except (KeyError, TypeError, ValueError):
+            _count_error(errors, section, 'forecastDate')
+    return timestamped
+
+
+def parse_city_search(city_json):
+    """
+    Return the city id of a decoded '/api/city/search' response (the
+      first city found), or None if it found none.
+    """
+    cities = city_json.get('data')
+    if not cities:
+        return None
+    return cities[0]['id']
+
+def parse_current_conditions(curr_json, errors=None):
     """
     Get the Current Conditions from the 
       'currentObservations' JSON data.
       Note: some of the numbers are strings, so need to convert.
+      Fields that can't be read are counted in 'errors'.
     """
+    section = "current"
+    if not isinstance(curr_json, dict):
+        raise ValueError("No current observations")
     curr_dict = {}
+    cwss = CURRENT_WEATHER_SEARCH_STRINGS
 
     # Get Current Conditions
     #  JSON data contains both a current Conditions string,
@@ -166,23 +638,22 @@ def parse_current_conditions(curr_json):
     #  The legacy icon uses a URL that has a string nearly identical
     #  to the old way of parsing, so we'll use the old way 
     #  of parsing to find the name of this icon.
-    curr_dict["current_conditions"] = curr_json['skyCondition']
-    cwss = CURRENT_WEATHER_SEARCH_STRINGS
-    curr_icon = curr_json['icon']
-    curr_icon_condition = search_for_item(0, None, cwss['conditions'][0],
-                                      cwss['conditions'][1],
-                                      cwss['conditions'][2],
-                                      curr_icon)
-    curr_dict["current_icon_conditions"]= curr_icon_condition
+    curr_dict["current_conditions"] = \
+        _str_field(curr_json, 'skyCondition', None, errors, section)
+    curr_dict["current_icon_conditions"] = \
+        _icon_condition(curr_json, 'icon', cwss, errors, section)
 
     # Get the Current Temperature
-    curr_dict["current_temperature"] = int(curr_json['temperature'])
+    curr_dict["current_temperature"] = \
+        _int_field(curr_json, 'temperature', None, errors, section)
 
     # Get the Current Dew Point Temperature
-    curr_dict["current_dew_point"] = int(curr_json['dewPoint'])
+    curr_dict["current_dew_point"] = \
+        _int_field(curr_json, 'dewPoint', None, errors, section)
 
     # Get the Current Humidity
-    curr_dict["current_relative_humidity"] = curr_json['relativeHumidity']
+    curr_dict["current_relative_humidity"] = \
+        _int_field(curr_json, 'relativeHumidity', None, errors, section)
 
     # Get the Current Wind Speed, Direction, and Gusts
     #   New API does not provide wind direction string
@@ -190,16 +661,12 @@ def parse_current_conditions(curr_json):
     #  Note: 'windDirection' is in degrees but can be None or -1 (make it 0).
     #  Note: 'windSpeed' can be None (make it 0)
     #  Note: 'windGusts' can be None (make it 0)
-    wind_speed = curr_json['windSpeed']
-    if ( wind_speed != None):
-        curr_dict['current_wind_speed'] = int(curr_json['windSpeed'])
-    else:
-        curr_dict['current_wind_speed'] = 0
-    
+    curr_dict['current_wind_speed'] = \
+        _int_field(curr_json, 'windSpeed', 0, errors, section)
+
     curr_dict['current_wind_direction'] = None    
-    wind_dir = curr_json['windDirection']
+    wind_dir = _int_field(curr_json, 'windDirection', None, errors, section)
     if ( wind_dir != None ):
-        wind_dir =  int(wind_dir)
         if ( wind_dir < 0 or wind_dir > 360 ):
             wind_dir = 0
         else:
@@ -210,72 +677,72 @@ def parse_current_conditions(curr_json):
 
     curr_dict['current_wind_bearing'] = wind_dir
 
-    wind_gusts = curr_json['windGusts']
-    if ( wind_gusts != None):
-        curr_dict['current_wind_gusts'] = int(curr_json['windGusts'])
-    else:
-        curr_dict['current_wind_gusts'] = 0
+    curr_dict['current_wind_gusts'] = \
+        _int_field(curr_json, 'windGusts', 0, errors, section)
         
     # Get the Current Wind Chill/Heat Index. 
     #  Note: Could possibly be empty string
-    wc = curr_json['windChill']
-    if ( wc.isnumeric() ):
-        curr_dict["current_wind_chill"] = int(wc)
-    else:
-        curr_dict["current_wind_chill"] = None
-    hi = curr_json['heatIndex']
-    if ( hi.isnumeric() ):
-        curr_dict["current_heat_index"] = int(hi)
-    else:
-        curr_dict["current_heat_index"] = None
+    curr_dict["current_wind_chill"] = \
+        _int_field(curr_json, 'windChill', None, errors, section)
+    curr_dict["current_heat_index"] = \
+        _int_field(curr_json, 'heatIndex', None, errors, section)
 
     # Get the Current Hourly Precipitation
     #  Note: Could possibly be None (make it 0)
-    hp = curr_json['hourlyPrecip']
-    if ( hp == None ):
-        curr_dict["current_hourly_precip"] = float(0)
-    else:
-        curr_dict["current_hourly_precip"] = float(hp)
+    curr_dict["current_hourly_precip"] = \
+        _float_field(curr_json, 'hourlyPrecip', float(0), errors, section)
 
     # Get the Current Barometric Pressure
-    curr_dict["current_pressure"] = float(curr_json['pressure'])
+    curr_dict["current_pressure"] = \
+        _float_field(curr_json, 'pressure', None, errors, section)
 
     # Get the Current visibility
-    curr_dict["current_visibility"] = float(curr_json['visibility'])
+    curr_dict["current_visibility"] = \
+        _float_field(curr_json, 'visibility', None, errors, section)
+
+    if _debug_sample_rate(section):
+        _LOGGER.debug("Current conditions: %s", curr_dict)
 
     return curr_dict
 
 
-def parse_forecast_daily(forecast_day_data):
+def parse_forecast_daily(forecast_day_data, errors=None):
     """
     Get the 7 Day Forecast from the 
       'forecastDetails' JSON data list of days.
       Note: there is also "hours" data for the next
         7 days or so, but this data is ignored
+      Fields that can't be read are counted in 'errors',
+        and a day without a timestamp is left out.
     """
+    section = "daily"
 
    #fdss = FORECAST_DAY_SEARCH_STRINGS
     day_dict = {}
     forecast_daily_list = []
 
-    iterations = NUM_FORECAST_DAYS
+    forecast_details = forecast_day_data['forecastDetails']
+    iterations = min(NUM_FORECAST_DAYS, len(forecast_details))
+    days = _timestamped_entries(forecast_details, iterations, errors, section)
 
     dwss = DAY_WEATHER_SEARCH_STRINGS
+    sample_rate = _debug_sample_rate(section)
 
-    for i in range(0, iterations):
-        forecast_dayN_data = forecast_day_data['forecastDetails'][i]
-        _LOGGER.debug("========Forecast Day %i Details======== ", i)
-        _LOGGER.debug("%s", forecast_dayN_data)
-        _LOGGER.debug("")
+    # Convert all the day timestamps in one go.
+    TIMESTAMPS.refresh()
+    day_isos = TIMESTAMPS.isoformat_many(
+        [day_timestamp for day_timestamp, _ in days])
+    # And all the wind directions to bearings.
+    day_bearings = wind_directions2bearings(
+        [day_data.get('windDirection') for _, day_data in days])
 
+    for i, (day_timestamp, forecast_dayN_data) in enumerate(days):
         # re-init data_dict to empty.
         # Otherwise the append to forecast will mess up
         day_dict = {}
-        day_timestamp = forecast_dayN_data['forecastDate']['timestamp']
-        dt_object = datetime.datetime.fromtimestamp(day_timestamp)
-        day_dict["which_day"] = dt_object.strftime("%a")
-        tz = datetime.datetime.now().astimezone().tzinfo
-        day_dict["which_day_dt"] = datetime.datetime.fromtimestamp(day_timestamp, tz).isoformat()
+        day_dict["which_day"] = TIMESTAMPS.day_name(day_timestamp)
+        day_dict["which_day_ts"] = day_timestamp
+        day_dict["which_day_dt"] = day_isos[i]
 
 
         # Find forecast Condition for day N. Ex. clear-night
@@ -288,116 +755,128 @@ def parse_forecast_daily(forecast_day_data):
         # Note: I find from time to time that parameters
         #   that should contain a string numeric value are sometimes empty string
         #   for example forecast low temperature.
-        day_day_icon = forecast_dayN_data['dayIcon']
-        day_icon_condition = search_for_item(0, None, dwss['conditions'][0],
-                                      dwss['conditions'][1],
-                                      dwss['conditions'][2],
-                                      day_day_icon)
+        day_icon_condition = \
+            _icon_condition(forecast_dayN_data, 'dayIcon', dwss, errors, section)
         day_dict["icon_condition"]= day_icon_condition
-        day_dict["condition"] = forecast_dayN_data['dayCondition']
+        day_dict["condition"] = \
+            _str_field(forecast_dayN_data, 'dayCondition', None, errors, section)
 
         # Find forecast high temperature for day N.
-        temp_data = forecast_dayN_data['high']
-        if ( temp_data.isnumeric() ):
-            day_dict["high_temperature"] = int(temp_data)
-        else:
-            day_dict["high_temperature"] = 0
+        day_dict["high_temperature"] = \
+            _int_field(forecast_dayN_data, 'high', 0, errors, section)
 
         # Find forecast low temperature for day N.
-        temp_data = forecast_dayN_data['low']
-        if ( temp_data.isnumeric() ):
-            day_dict["low_temperature"] = int(temp_data)
-        else:
-            day_dict["low_temperature"] = 0
+        day_dict["low_temperature"] = \
+            _int_field(forecast_dayN_data, 'low', 0, errors, section)
 
         # Find forecast day descriptions for day N.
-        day_dict["detailed_day"] = forecast_dayN_data['textDay']
+        day_dict["detailed_day"] = \
+            _text_field(forecast_dayN_data, 'textDay', "", errors, section)
 
         # Find forecast night descriptions for day N.
-        day_dict["detailed_night"] = forecast_dayN_data['textNight']
+        day_dict["detailed_night"] = \
+            _text_field(forecast_dayN_data, 'textNight', "", errors, section)
 
         # Combine forecast day and night descriptions for day N into one.
+        #   The separate ones are kept for the twice daily forecast.
         day_dict["detailed_description"] = \
             day_dict["detailed_day"] + "For the night: " + \
             day_dict["detailed_night"]
-        del day_dict["detailed_day"]
-        del day_dict["detailed_night"]
+
+        # Find forecast night icon condition for day N.
+        #   Use the night icon if there is one, otherwise the
+        #   night version of the day icon.
+        if forecast_dayN_data.get('nightIcon'):
+            night_icon_condition = _icon_condition(
+                forecast_dayN_data, 'nightIcon', dwss, errors, section)
+        elif day_icon_condition and day_icon_condition.startswith("day-"):
+            night_icon_condition = "night-" + day_icon_condition[4:]
+        else:
+            night_icon_condition = day_icon_condition
+        day_dict["night_icon_condition"] = intern(night_icon_condition)
 
         # Find forecast Sunrise for day N.
-        day_dict["sunrise"] = forecast_dayN_data['sunrise']['string']
+        day_dict["sunrise"] = _str_field(
+            forecast_dayN_data.get('sunrise'), 'string', None, errors,
+            section + ".sunrise")
 
         # Find forecast Sunset for day N.
-        day_dict["sunset"] = forecast_dayN_data['sunset']['string']
+        day_dict["sunset"] = _str_field(
+            forecast_dayN_data.get('sunset'), 'string', None, errors,
+            section + ".sunset")
 
         # Find forecast precipitation probability for day N.
-        day_dict["precipitation"] = int(forecast_dayN_data['dayPop'])
+        day_dict["precipitation"] = \
+            _int_field(forecast_dayN_data, 'dayPop', 0, errors, section)
 
         # Find forecast wind information for day N.
         #   Note: New API does not provide a wind bearing in degrees
         #     so we'll compute one.
-        temp_data = forecast_dayN_data['windSpeed']
-        if ( temp_data.isnumeric() ):
-            day_dict["wind_speed"] = int(temp_data)
-        else:
-            day_dict["wind_speed"] = 0
-        day_dict["wind_direction"] = forecast_dayN_data['windDirection']
-        day_dict["wind_bearing"] = \
-                wind_direction2degrees[day_dict['wind_direction']]
+        day_dict["wind_speed"] = \
+            _int_field(forecast_dayN_data, 'windSpeed', 0, errors, section)
+        day_dict["wind_direction"] = _str_field(
+            forecast_dayN_data, 'windDirection', None, errors, section)
+        day_dict["wind_bearing"] = day_bearings[i]
+        if day_dict["wind_bearing"] is None and day_dict["wind_direction"]:
+            _count_error(errors, section, 'windDirection')
 
         # Find Heat Index for day N.
-        temp_data = forecast_dayN_data['heatIndex']
-        if ( temp_data.isnumeric() ):
-            day_dict["heat_index"] = int(temp_data)
-        else:
-            day_dict["heat_index"] = day_dict["high_temperature"]
+        day_dict["heat_index"] = _int_field(
+            forecast_dayN_data, 'heatIndex',
+            day_dict["high_temperature"], errors, section)
 
         # Find Wind Chill for day N.
-        temp_data = forecast_dayN_data['windChill']
-        if ( temp_data.isnumeric() ):
-            day_dict["wind_chill"] = int(temp_data)
-        else:
-            day_dict["wind_chill"] = day_dict["low_temperature"]
+        day_dict["wind_chill"] = _int_field(
+            forecast_dayN_data, 'windChill',
+            day_dict["low_temperature"], errors, section)
 
         # Find Dew Point for day N.
-        temp_data = forecast_dayN_data['dewPoint']
-        if ( temp_data.isnumeric() ):
-            day_dict["dew_point"] = int(temp_data)
-        else:
-            day_dict["dew_point"] = 0
+        day_dict["dew_point"] = \
+            _int_field(forecast_dayN_data, 'dewPoint', 0, errors, section)
 
         forecast_daily_list.append(day_dict)
+        if sample_rate and i % sample_rate == 0:
+            _LOGGER.debug("Forecast day %i: %s", i, day_dict)
 
     return forecast_daily_list
 
 
-def parse_forecast_hourly(forecast_hour_data):
+def parse_forecast_hourly(forecast_hour_data, num_hours=NUM_FORECAST_HOURS,
+                          errors=None):
     """
     Get the N Hour Forecast from the 
       'forecastHourlyDetails' JSON data list of hours.
+      'num_hours' limits how many hours are kept.
+      Fields that can't be read are counted in 'errors',
+        and an hour without a timestamp is left out.
     """
+    section = "hourly"
 
     hour_dict = {}
     forecast_hourly_list = []
 
-    iterations = NUM_FORECAST_HOURS
+    forecast_details = forecast_hour_data['forecastHourlyDetails']
+    iterations = min(num_hours, len(forecast_details))
+    hours = _timestamped_entries(forecast_details, iterations, errors, section)
 
     hwss = HOUR_WEATHER_SEARCH_STRINGS
+    sample_rate = _debug_sample_rate(section)
 
-    for i in range(0, iterations):
-        forecast_hourN_data = forecast_hour_data['forecastHourlyDetails'][i]
-        _LOGGER.debug("========Forecast Hour %i Details======== ", i)
-        _LOGGER.debug("%s", forecast_hourN_data)
-        _LOGGER.debug("")
+    # Convert all the hour timestamps in one go.
+    TIMESTAMPS.refresh()
+    hour_isos = TIMESTAMPS.isoformat_many(
+        [hour_timestamp for hour_timestamp, _ in hours])
+    # And all the wind directions to bearings.
+    hour_bearings = wind_directions2bearings(
+        [hour_data.get('windDirection') for _, hour_data in hours])
 
+    for i, (hour_timestamp, forecast_hourN_data) in enumerate(hours):
         # re-init data_dict to empty.
         # Otherwise the append to forecast will mess up
         hour_dict = {}
-        hour_timestamp = forecast_hourN_data['forecastDate']['timestamp']
-    
-        tz = datetime.datetime.now().astimezone().tzinfo
-       #dt_object = datetime.datetime.fromtimestamp(hour_timestamp)
-       #hour_dict["which_hour"] = dt_object.strftime("%a")
-        hour_dict["which_hour_dt"] = datetime.datetime.fromtimestamp(hour_timestamp, tz).isoformat()
+        hour_dict["which_hour_ts"] = hour_timestamp
+       #hour_dict["which_hour"] = TIMESTAMPS.day_name(hour_timestamp)
+        hour_dict["which_hour_dt"] = hour_isos[i]
 
 
         # Find forecast Condition for hour N. Ex. clear-night
@@ -410,127 +889,1174 @@ def parse_forecast_hourly(forecast_hour_data):
         # Note: I find from time to time that parameters
         #   that should contain a string numeric value are sometimes empty string
         #   so protect against such cases.
-        hour_icon = forecast_hourN_data['icon']
-        hour_icon_condition = search_for_item(0, None, hwss['conditions'][0],
-                                      hwss['conditions'][1],
-                                      hwss['conditions'][2],
-                                      hour_icon)
-        hour_dict["icon_condition"]= hour_icon_condition
-        hour_dict["condition"] = forecast_hourN_data['conditions']
+        hour_dict["icon_condition"] = \
+            _icon_condition(forecast_hourN_data, 'icon', hwss, errors, section)
+        hour_dict["condition"] = \
+            _str_field(forecast_hourN_data, 'conditions', None, errors, section)
 
         # Find forecast temperature for hour N.
-        temp_data = forecast_hourN_data['temperature']
-        if ( temp_data.isnumeric() ):
-            hour_dict["temperature"] = int(temp_data)
-        else:
-            hour_dict["temperature"] = 0
+        #   A missing one stays None (not 0), so the insights skip
+        #   the hour rather than taking it for a freezing one.
+        hour_dict["temperature"] = \
+            _int_field(forecast_hourN_data, 'temperature', None, errors, section)
 
         # Find forecast precipitation probability for hour N.
-        hour_dict["precipitation"] = int(forecast_hourN_data['pop'])
+        hour_dict["precipitation"] = \
+            _int_field(forecast_hourN_data, 'pop', None, errors, section)
 
         # Find forecast wind information for hour N.
         #   Note: New API does not provide a wind bearing in degrees
         #     so we'll compute one.
-        temp_data = forecast_hourN_data['windSpeed']
-        if ( temp_data.isnumeric() ):
-            hour_dict["wind_speed"] = int(temp_data)
-        else:
-            hour_dict["wind_speed"] = 0
-        hour_dict["wind_direction"] = forecast_hourN_data['windDirection']
-        hour_dict["wind_bearing"] = \
-                wind_direction2degrees[hour_dict['wind_direction']]
+        hour_dict["wind_speed"] = \
+            _int_field(forecast_hourN_data, 'windSpeed', 0, errors, section)
+        hour_dict["wind_direction"] = _str_field(
+            forecast_hourN_data, 'windDirection', None, errors, section)
+        hour_dict["wind_bearing"] = hour_bearings[i]
+        if hour_dict["wind_bearing"] is None and hour_dict["wind_direction"]:
+            _count_error(errors, section, 'windDirection')
 
         # Find forecast humidity (an int not a string) for hour N.
-        hour_dict["humidity"] = forecast_hourN_data['humidity']
+        hour_dict["humidity"] = \
+            _int_field(forecast_hourN_data, 'humidity', None, errors, section)
 
         # Find forecast dewpoint for hour N.
-        temp_data = forecast_hourN_data['dewPoint']
-        if ( temp_data.isnumeric() ):
-            hour_dict["dew_point"] = int(temp_data)
-        else:
-            hour_dict["dew_point"] = 0
+        hour_dict["dew_point"] = \
+            _int_field(forecast_hourN_data, 'dewPoint', 0, errors, section)
 
         # Find forecast heat index (an int not a string) for hour N.
-        hour_dict["heat_index"] = forecast_hourN_data['heatIndex']
+        hour_dict["heat_index"] = \
+            _int_field(forecast_hourN_data, 'heatIndex', None, errors, section)
 
         # Find forecast wind chill (an int not a string) for hour N.
-        hour_dict["wind_chill"] = forecast_hourN_data['windChill']
+        hour_dict["wind_chill"] = \
+            _int_field(forecast_hourN_data, 'windChill', None, errors, section)
 
         # Find forecast cloud cover for hour N.
-        hour_dict["cloud_cover"] = int(forecast_hourN_data['cloudCover'])
-        temp_data = forecast_hourN_data['cloudCover']
-        if ( temp_data.isnumeric() ):
-            hour_dict["cloud_cover"] = int(temp_data)
-        else:
-            hour_dict["cloud_cover"] = 0
+        hour_dict["cloud_cover"] = \
+            _int_field(forecast_hourN_data, 'cloudCover', 0, errors, section)
 
         forecast_hourly_list.append(hour_dict)
+        if sample_rate and i % sample_rate == 0:
+            _LOGGER.debug("Forecast hour %i: %s", i, hour_dict)
 
     return forecast_hourly_list
 
+# The night period of a day in the twice daily forecast starts at
+#   that day's sunset, or at this local time (hour, minute) if there
+#   is no usable sunset.  (The day's forecast timestamp is local
+#   midnight, so a fixed offset from it would put night at noon.)
+NIGHT_START_DEFAULT = (18, 0)
+
+def _clock_time(text):
+    """Return (hour, minute) of a WRAL time string (ex. '6:52 PM'), or None."""
+    if not isinstance(text, str):
+        return None
+    try:
+        clock = datetime.datetime.strptime(text.strip(), "%I:%M %p")
+    except ValueError:
+        return None
+    return clock.hour, clock.minute
+
+def _night_timestamp(day_dict):
+    """Return the timestamp the night of a parsed forecast day starts at."""
+    hour, minute = _clock_time(day_dict.get("sunset")) or NIGHT_START_DEFAULT
+    day = datetime.datetime.fromtimestamp(day_dict["which_day_ts"],
+                                          TIMESTAMPS.tz)
+    night = day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return int(night.timestamp())
+
+def build_forecast_twice_daily(forecast_daily_list):
+    """
+    Split each parsed forecast day into a day and a night period.
+    Everything comes from the daily forecast already parsed,
+      'textDay'/'textNight', the icons and the high/low.
+    The night period starts at the day's sunset (see _night_timestamp).
+    """
+    TIMESTAMPS.refresh()
+    forecast_twice_daily_list = []
+    for day_dict in forecast_daily_list:
+        night_timestamp = _night_timestamp(day_dict)
+        shared = {
+            "precipitation": day_dict["precipitation"],
+            "wind_speed": day_dict["wind_speed"],
+            "wind_bearing": day_dict["wind_bearing"],
+            "dew_point": day_dict["dew_point"],
+        }
+        forecast_twice_daily_list.append({
+            "which_dt": day_dict["which_day_dt"],
+            "is_daytime": True,
+            "temperature": day_dict["high_temperature"],
+            "icon_condition": day_dict["icon_condition"],
+            "detailed_description": day_dict["detailed_day"],
+            **shared,
+            })
+        forecast_twice_daily_list.append({
+            "which_dt": TIMESTAMPS.isoformat(night_timestamp),
+            "is_daytime": False,
+            "temperature": day_dict["low_temperature"],
+            "icon_condition": day_dict["night_icon_condition"],
+            "detailed_description": day_dict["detailed_night"],
+            **shared,
+            })
+    return forecast_twice_daily_list
+
+
+FORECAST_DAILY = "daily"
+FORECAST_HOURLY = "hourly"
+FORECAST_INSIGHTS = "insights"
+
+# Defaults for the precomputed forecast insights
+INSIGHT_RAIN_POP = 50        # next hour with precipitation > this (%)
+INSIGHT_FREEZING = 32        # first hour with temperature < this (F)
+INSIGHT_HOURS = 24           # extremes are over this many hours
+
+# The keys the forecast sensors read (see sensor.py's FORECAST_DAY_FIELDS,
+#   FORECAST_HOUR_FIELDS and day 0 sensors), the only ones flattened
+#   into ForecastIndex.values.  Flattening every key of every hour
+#   was most of the memory of an entry keeping 168 hours.
+FORECAST_INDEX_KEYS = {
+    FORECAST_DAILY: ("condition", "high_temperature", "low_temperature",
+                     "precipitation", "wind_speed"),
+    FORECAST_HOURLY: ("condition", "temperature", "precipitation",
+                      "wind_speed", "humidity", "dew_point", "cloud_cover"),
+}
+
+class ForecastIndex:
+    """
+    Snapshot of the daily and hourly forecasts, ordered by timestamp.
+    It is built once per update.  Every value of the 'index_keys'
+    (see FORECAST_INDEX_KEYS) is stored under (section, offset, key),
+    ex. (FORECAST_HOURLY, 5, 'temperature'), so any number of sensors
+    each get their value with a single dict lookup, and a missing day,
+    hour or value simply gives None.
+    """
+    def __init__(self, forecast_daily_list=(), forecast_hourly_list=(),
+                 generation=0, index_keys=FORECAST_INDEX_KEYS):
+        self.generation = generation
+        self.daily = sorted(forecast_daily_list,
+                            key=lambda entry: entry['which_day_ts'])
+        self.hourly = sorted(forecast_hourly_list,
+                             key=lambda entry: entry['which_hour_ts'])
+        self.daily_ts = [entry['which_day_ts'] for entry in self.daily]
+        self.hourly_ts = [entry['which_hour_ts'] for entry in self.hourly]
+
+        values = {}
+        for section, entries in ((FORECAST_DAILY, self.daily),
+                                 (FORECAST_HOURLY, self.hourly)):
+            keys = index_keys[section]
+            for offset, entry in enumerate(entries):
+                for key in keys:
+                    value = entry.get(key)
+                    if value is not None:
+                        values[(section, offset, key)] = value
+        self.values = values
+
+        # Running max/min and record highs/lows of hourly series,
+        #   built on first use.
+        self._prefix = {}
+        self._records = {}
+
+        insights = self.insights()
+        for key, value in insights.items():
+            values[(FORECAST_INSIGHTS, 0, key)] = value
+
+    def get(self, section, offset, key):
+        """Return the value of 'key' for day/hour 'offset', or None."""
+        return self.values.get((section, offset, key))
+
+    def forecast_range(self, section, start_ts, end_ts, fields=None):
+        """
+        Return the daily or hourly entries with start_ts <= timestamp
+        <= end_ts, found by binary search on the sorted timestamps.
+        If 'fields' is given only those keys (plus the entry's
+        datetime) are returned.
+        """
+        if section == FORECAST_DAILY:
+            entries, timestamps, dt_key = \
+                self.daily, self.daily_ts, 'which_day_dt'
+        else:
+            entries, timestamps, dt_key = \
+                self.hourly, self.hourly_ts, 'which_hour_dt'
+        first = bisect.bisect_left(timestamps, start_ts)
+        last = bisect.bisect_right(timestamps, end_ts)
+        if not fields:
+            return [dict(entry) for entry in entries[first:last]]
+        keys = [dt_key] + [key for key in fields if key != dt_key]
+        return [{key: entry.get(key) for key in keys}
+                for entry in entries[first:last]]
+
+    def _hourly_series(self, key):
+        """Return the hourly values of 'key' (None where missing)."""
+        return [entry.get(key) for entry in self.hourly]
+
+    def _prefix_extremes(self, key):
+        """
+        Return (running max, running min) lists of an hourly series,
+        so the extremes over the first N hours are a single index.
+        """
+        if key not in self._prefix:
+            running_max = []
+            running_min = []
+            high = low = None
+            for value in self._hourly_series(key):
+                if value is not None:
+                    high = value if high is None else max(high, value)
+                    low = value if low is None else min(low, value)
+                running_max.append(high)
+                running_min.append(low)
+            self._prefix[key] = (running_max, running_min)
+        return self._prefix[key]
+
+    def _record_crossings(self, key, rising):
+        """
+        Return (values, hours) of the hours that set a new record high
+        (rising) or record low of an hourly series.  The first hour
+        above (below) any threshold is always one of these records and
+        the record values are sorted, so it is found with bisect.
+        Record lows are stored negated to keep the list ascending.
+        """
+        cache_key = (key, rising)
+        if cache_key not in self._records:
+            record_values = []
+            record_hours = []
+            sign = 1 if rising else -1
+            for hour, value in enumerate(self._hourly_series(key)):
+                if value is None:
+                    continue
+                value = sign * value
+                if not record_values or value > record_values[-1]:
+                    record_values.append(value)
+                    record_hours.append(hour)
+            self._records[cache_key] = (record_values, record_hours)
+        return self._records[cache_key]
+
+    def first_hour_above(self, key, threshold):
+        """Return the first hourly entry with 'key' > threshold, or None."""
+        record_values, record_hours = self._record_crossings(key, True)
+        i = bisect.bisect_right(record_values, threshold)
+        if i == len(record_values):
+            return None
+        return self.hourly[record_hours[i]]
+
+    def first_hour_below(self, key, threshold):
+        """Return the first hourly entry with 'key' < threshold, or None."""
+        record_values, record_hours = self._record_crossings(key, False)
+        i = bisect.bisect_right(record_values, -threshold)
+        if i == len(record_values):
+            return None
+        return self.hourly[record_hours[i]]
+
+    def hourly_extremes(self, key, hours=INSIGHT_HOURS):
+        """Return (max, min) of 'key' over the next 'hours' hours."""
+        running_max, running_min = self._prefix_extremes(key)
+        n = min(hours, len(running_max))
+        if n <= 0:
+            return None, None
+        return running_max[n - 1], running_min[n - 1]
+
+    def insights(self, rain_pop=INSIGHT_RAIN_POP,
+                 freezing=INSIGHT_FREEZING, hours=INSIGHT_HOURS):
+        """
+        Answers automations commonly want from the hourly forecast:
+          the next hour likely to rain, the first hour below freezing,
+          and the temperature extremes over the next 'hours' hours.
+        Hours WRAL sent no value for are skipped.
+        """
+        next_rain = self.first_hour_above('precipitation', rain_pop)
+        first_freezing = self.first_hour_below('temperature', freezing)
+        max_temp, min_temp = self.hourly_extremes('temperature', hours)
+        return {
+            "next_rain_hour":
+                next_rain['which_hour_dt'] if next_rain else None,
+            "first_freezing_hour":
+                first_freezing['which_hour_dt'] if first_freezing else None,
+            "max_temperature": max_temp,
+            "min_temperature": min_temp,
+        }
+
+
+# Where the weather response is decoded and parsed.
+#   'loop':    in the caller (the HA event loop).
+#   'thread':  in the event loop's default executor.
+#   'process': in a process pool, for very large horizons/entry counts.
+#     The workers have their own STRINGS and TIMESTAMPS, so the shared
+#     cache metrics (hit rates, evictions) don't cover these parses.
+#   In all cases only the swap of the results happens in the caller.
+PARSE_MODE_LOOP = "loop"
+PARSE_MODE_THREAD = "thread"
+PARSE_MODE_PROCESS = "process"
+PARSE_MODES = (PARSE_MODE_LOOP, PARSE_MODE_THREAD, PARSE_MODE_PROCESS)
+PROCESS_POOL_WORKERS = 2
+
+# The name the process pool workers import this file by, from its own
+#   directory, rather than as custom_components.wral_weather.wral_weather
+#   which would run the package's __init__ and so import all of HA.
+PARSER_MODULE = "wral_weather"
+
+_process_pool = None
+
+def _parser_module():
+    """
+    Return this file loaded as PARSER_MODULE, the module whose functions
+      are handed to the process pool (they are pickled by module name).
+    """
+    if __name__ == PARSER_MODULE:  # ex. app_wral.py, the benchmarks
+        return sys.modules[__name__]
+    module = sys.modules.get(PARSER_MODULE)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(PARSER_MODULE, __file__)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[PARSER_MODULE] = module
+        spec.loader.exec_module(module)
+    return module
+
+def _get_process_pool():
+    """
+    Return the shared parse process pool, starting it if needed.
+    Blocking the first time (it loads the parser module), so it is
+      meant to be run in an executor.
+    """
+    global _process_pool
+    if _process_pool is None:
+        _parser_module()
+        # 'spawn' as forking a threaded process (like HA) is unsafe.
+        #   The workers get this file's directory on their path to
+        #   import PARSER_MODULE from.
+        _process_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=PROCESS_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=site.addsitedir,
+            initargs=(os.path.dirname(os.path.abspath(__file__)),))
+    return _process_pool
+
+def release_process_pool():
+    """
+    Return the shared parse process pool (None if not started) and
+      forget it, so the next process mode parse starts a new one.
+    The caller shuts it down, ex. in an executor as it waits for the
+      worker processes.
+    """
+    global _process_pool
+    pool, _process_pool = _process_pool, None
+    return pool
+
+def _timed(func, *args):
+    """Return (func(*args), seconds it took)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def _parse_section(section, func, *args):
+    """
+    Run one section parser so that its failure doesn't cost the others.
+    Returns (result, seconds it took, errors) where result is None if
+      the section could not be parsed at all, and errors counts the
+      fields (or the whole section) that could not be read.
+    """
+    errors = collections.Counter()
+    start = time.perf_counter()
+    try:
+        result = func(*args, errors=errors)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Failed to parse the %s section: %r", section, err)
+        errors[section] += 1
+        result = None
+    return result, time.perf_counter() - start, errors
+
+# The fields the parsers read.  Only these are kept (see project_weather)
+#   so the rest of the decoded payload, like the 'hours' of each day or
+#   the hours past 'num_hours', can be dropped before parsing.
+CURRENT_FIELDS = (
+    'skyCondition', 'icon', 'temperature', 'dewPoint', 'relativeHumidity',
+    'windSpeed', 'windDirection', 'windGusts', 'windChill', 'heatIndex',
+    'hourlyPrecip', 'pressure', 'visibility',
+    )
+DAY_FIELDS = (
+    'forecastDate', 'dayIcon', 'nightIcon', 'dayCondition', 'high', 'low',
+    'textDay', 'textNight', 'sunrise', 'sunset', 'dayPop', 'windSpeed',
+    'windDirection', 'heatIndex', 'windChill', 'dewPoint',
+    )
+HOUR_FIELDS = (
+    'forecastDate', 'icon', 'conditions', 'temperature', 'pop', 'windSpeed',
+    'windDirection', 'humidity', 'dewPoint', 'heatIndex', 'windChill',
+    'cloudCover',
+    )
+
+def _project(entry, fields):
+    """Return a copy of entry with just 'fields' (those it has)."""
+    if not isinstance(entry, dict):
+        return entry  # left for the parser to count
+    return {field: entry[field] for field in fields if field in entry}
+
+def _project_list(entries, fields, count):
+    """Return the first 'count' entries, each with just 'fields'."""
+    if not isinstance(entries, list):
+        return entries  # left for the parser to count
+    return [_project(entry, fields) for entry in entries[:count]]
+
+def project_weather(weather_json, num_hours=NUM_FORECAST_HOURS):
+    """
+    Return the (current, daily, hourly) sections of a decoded
+      '/api/weather' response holding only what the parsers read,
+      so nothing refers back into the decoded document.
+    A missing section only fails its own parse.
+    """
+    data = weather_json.get('data') if isinstance(weather_json, dict) \
+        else None
+    if not isinstance(data, dict):
+        raise ValueError("No 'data' in the weather response")
+    forecast = data.get('forecast')
+    if not isinstance(forecast, dict):
+        forecast = {}
+    current_json = data.get('currentObservations')
+    if isinstance(current_json, dict):
+        current_json = _project(current_json, CURRENT_FIELDS)
+    return (current_json,
+            {'forecastDetails': _project_list(
+                forecast.get('forecastDetails'),
+                DAY_FIELDS, NUM_FORECAST_DAYS)},
+            {'forecastHourlyDetails': _project_list(
+                forecast.get('forecastHourlyDetails'),
+                HOUR_FIELDS, num_hours)})
+
+def decode_weather(body, num_hours=NUM_FORECAST_HOURS):
+    """
+    Decode a raw '/api/weather' response body into its projected
+      sections (see project_weather).  The decoded document is
+      released on return, before any parsing.
+    """
+    return project_weather(json.loads(body), num_hours)
+
+def parse_sections(sections, num_hours=NUM_FORECAST_HOURS):
+    """
+    Parse the (current, daily, hourly) sections, one after another.
+    Returns ((curr_dict, forecast_daily_list, forecast_hourly_list,
+      forecast_index), timings, errors) where timings has the seconds
+      each section took, and errors counts what could not be read
+      (see _parse_section).  A section that failed is None, as is the
+      index then if it was the daily or hourly one.
+    """
+    timings = {}
+    errors = collections.Counter()
+    current_json, forecast_day_json, forecast_hour_json = sections
+
+    curr_dict, timings["current"], section_errors = \
+        _parse_section("current", parse_current_conditions, current_json)
+    errors.update(section_errors)
+
+    #Process 7 day Forecast
+    forecast_daily_list, timings["daily"], section_errors = \
+        _parse_section("daily", parse_forecast_daily, forecast_day_json)
+    errors.update(section_errors)
+
+    #Process Hourly Forecast
+    forecast_hourly_list, timings["hourly"], section_errors = \
+        _parse_section("hourly", parse_forecast_hourly, forecast_hour_json,
+                       num_hours)
+    errors.update(section_errors)
+
+    if forecast_daily_list is None or forecast_hourly_list is None:
+        forecast_index, timings["index"] = None, 0.0
+    else:
+        forecast_index, timings["index"] = \
+            _timed(ForecastIndex, forecast_daily_list, forecast_hourly_list)
+    return (curr_dict, forecast_daily_list, forecast_hourly_list,
+            forecast_index), timings, errors
+
+def parse_weather(weather_json, num_hours=NUM_FORECAST_HOURS):
+    """Parse a decoded '/api/weather' response (see parse_sections)."""
+    return parse_sections(project_weather(weather_json, num_hours), num_hours)
+
+def decode_and_parse_weather(body, num_hours=NUM_FORECAST_HOURS):
+    """Decode a raw '/api/weather' response body and parse it."""
+    sections, decode_time = _timed(decode_weather, body, num_hours)
+    snapshot, timings, errors = parse_sections(sections, num_hours)
+    timings["decode"] = decode_time
+    return snapshot, timings, errors
+
+def add_timing_totals(timings):
+    """
+    Add the serial total of the stages, and the critical path when the
+      three sections run at the same time (decode, the slowest section,
+      then the index).
+    """
+    timings["serial"] = sum(
+        timings[stage]
+        for stage in ("decode", "current", "daily", "hourly", "index"))
+    timings["critical_path"] = timings["decode"] + timings["index"] + \
+        max(timings["current"], timings["daily"], timings["hourly"])
+    return timings
+
+
+# How many city lookups are kept, and for how long (seconds) before
+#   a zipcode is looked up again.
+CITY_ID_CACHE_SIZE = 256
+CITY_ID_TTL = 24 * 3600
+
+class CityIdCache:
+    """
+    The WRAL city id of each zipcode, so it is looked up once a day
+      rather than on every update.
+    """
+    def __init__(self, max_size=CITY_ID_CACHE_SIZE, ttl=CITY_ID_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        # zipcode -> (city_id, time.monotonic() it was looked up)
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, zipcode):
+        """Return the city id of a zipcode, None if not known or stale."""
+        entry = self._cache.get(zipcode)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def put(self, zipcode, city_id):
+        """Remember the city id of a zipcode."""
+        if zipcode not in self._cache and len(self._cache) >= self.max_size:
+            del self._cache[next(iter(self._cache))]
+        self._cache[zipcode] = (city_id, time.monotonic())
+
+    def items(self):
+        """Return (zipcode, city_id, age in seconds) of each entry."""
+        now = time.monotonic()
+        return [(zipcode, city_id, now - looked_up)
+                for zipcode, (city_id, looked_up) in self._cache.items()]
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        """Forget all the city ids."""
+        self._cache.clear()
+
+
+# Shared by all WralWeather instances
+CITY_IDS = CityIdCache()
+
+
+def hit_rate(hits, misses):
+    """Return hits as a fraction of all lookups, None before any."""
+    lookups = hits + misses
+    return hits / lookups if lookups else None
+
+
+# Samples kept per metric
+METRICS_WINDOW = 100
+
+class RollingHistogram:
+    """
+    The last 'size' samples of a metric, for percentiles, plus the
+      count and total of all the samples ever added.
+    """
+    def __init__(self, size=METRICS_WINDOW):
+        self._samples = collections.deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        """Add a sample."""
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def __len__(self):
+        return len(self._samples)
+
+    def samples(self):
+        """Return the samples in the window, oldest first."""
+        return list(self._samples)
+
+    @property
+    def last(self):
+        """The latest sample, None if there are none."""
+        return self._samples[-1] if self._samples else None
+
+    def percentile(self, pct, ordered=None):
+        """Return the 'pct' (0-100) percentile (nearest rank) of the window."""
+        if ordered is None:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        rank = max(1, -(-len(ordered) * pct // 100))  # ceil
+        return ordered[int(rank) - 1]
+
+    def summary(self):
+        """Return the window's last/min/mean/p50/p90/p99/max and the count."""
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "last": self._samples[-1],
+            "min": ordered[0],
+            "mean": sum(ordered) / len(ordered),
+            "p50": self.percentile(50, ordered),
+            "p90": self.percentile(90, ordered),
+            "p99": self.percentile(99, ordered),
+            "max": ordered[-1],
+        }
+
+
+class WralMetrics:
+    """
+    Performance metrics of one WralWeather instance, kept in memory.
+    Times are in seconds, the payload size in bytes.
+    """
+    HISTOGRAMS = (
+        "city_lookup",    # city search request, when not cached
+        "weather_fetch",  # weather request, up to the whole body read
+        "ttfb",           # weather request, up to the response headers
+        "payload_bytes",
+        "decode", "current", "daily", "hourly", "index",  # parse stages
+        )
+
+    def __init__(self, size=METRICS_WINDOW):
+        self.histograms = {name: RollingHistogram(size)
+                           for name in self.HISTOGRAMS}
+        self.updates = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+
+    def observe(self, name, value):
+        """Add a sample to the 'name' histogram."""
+        self.histograms[name].add(value)
+
+    def observe_parse(self, timings):
+        """Add the per stage timings of a parse (see add_timing_totals)."""
+        for stage in ("decode", "current", "daily", "hourly", "index"):
+            if stage in timings:
+                self.histograms[stage].add(timings[stage])
+
+    def record_success(self):
+        """Count a successful update."""
+        self.updates += 1
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        """Count a failed update."""
+        self.failures += 1
+        self.consecutive_failures += 1
+
+    @staticmethod
+    def cache_hit_rates():
+        """Return the hit rate of each of the shared caches."""
+        return {
+            "city_id": hit_rate(CITY_IDS.hits, CITY_IDS.misses),
+            "timestamps": hit_rate(TIMESTAMPS.hits, TIMESTAMPS.misses),
+            "strings": hit_rate(STRINGS.hits, STRINGS.misses),
+        }
+
+    @staticmethod
+    def cache_evictions():
+        """Return how many entries the shared caches have dropped when full."""
+        return {
+            "strings": STRINGS.evictions,
+        }
+
+    def as_dict(self):
+        """Return all the metrics as plain data."""
+        return {
+            "updates": self.updates,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "cache_hit_rates": self.cache_hit_rates(),
+            "cache_evictions": self.cache_evictions(),
+            "histograms": {name: histogram.summary()
+                           for name, histogram in self.histograms.items()},
+        }
+
+
+#
+# Tracing.  A span times one stage of an update (city lookup, weather
+#   GET, decode, each parse, state writes...) and is nested under the
+#   span it ran in, so slow updates can be pinned on a stage.  Spans
+#   are only built when the Tracer has an exporter; the finished spans
+#   of a trace go to the exporter together when its root span ends.
+#
+_current_span = contextvars.ContextVar("wral_weather_span", default=None)
+
+class Span:
+    """One timed stage of an update."""
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start",
+                 "duration", "attributes", "_root", "_finished")
+
+    def __init__(self, name, parent, attributes):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        if parent is None:
+            self.trace_id = os.urandom(16).hex()
+            self.parent_id = None
+            self._root = self
+            self._finished = []
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self._root = parent._root
+            self._finished = None
+        self.start = time.time()
+        self.duration = None
+        self.attributes = attributes
+
+    def set(self, **attributes):
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    def as_dict(self):
+        """Return the span as plain data."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": self.attributes,
+        }
+
+
+class _NoSpan:
+    """Stands in for a span when tracing is off."""
+    __slots__ = ()
+
+    def set(self, **attributes):
+        """Nothing to add to."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+
+class _SpanContext:
+    """Runs a span over a 'with' block."""
+    __slots__ = ("_tracer", "_span", "_token", "_started")
+
+    def __init__(self, tracer, span):
+        self._tracer = tracer
+        self._span = span
+
+    def __enter__(self):
+        self._token = _current_span.set(self._span)
+        self._started = time.perf_counter()
+        return self._span
+
+    def __exit__(self, exc_type, exc, traceback):
+        span = self._span
+        span.duration = time.perf_counter() - self._started
+        if exc_type is not None:
+            span.attributes["error"] = exc_type.__name__
+        _current_span.reset(self._token)
+        self._tracer._finish(span)
+        return False
+
+
+class Tracer:
+    """Makes spans and hands the finished traces to an exporter."""
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self):
+        """If spans are being recorded."""
+        return self.exporter is not None
+
+    def span(self, name, **attributes):
+        """Return a context manager timing a span of the 'with' block."""
+        if self.exporter is None:
+            return _NO_SPAN
+        return _SpanContext(self, Span(name, _current_span.get(), attributes))
+
+    def record(self, name, start, duration, **attributes):
+        """
+        Add an already timed span under the current one, ex. for a
+          stage that ran in an executor and only reported its time.
+        """
+        if self.exporter is None:
+            return
+        span = Span(name, _current_span.get(), attributes)
+        span.start = start
+        span.duration = duration
+        self._finish(span)
+
+    def _finish(self, span):
+        """Keep a finished span, exporting its trace once the root ends."""
+        root = span._root
+        root._finished.append(span)
+        if span is root:
+            spans, root._finished = root._finished, []
+            try:
+                self.exporter.export(spans)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Failed to export trace: %r", err)
+
+
+# Tracing is off unless an exporter is given (see WralWeather)
+NO_TRACER = Tracer()
+
+
+# The span file is rotated (like logging's RotatingFileHandler) at
+#   this size, keeping this many old files (path.1 is the newest).
+TRACE_FILE_MAX_BYTES = 10 * 1024 * 1024
+TRACE_FILE_BACKUPS = 2
+
+class JsonLinesExporter:
+    """
+    Write finished spans to a file, one JSON object per line.
+    Spans are kept in memory until flush(), which does the (blocking)
+      file write, so it is meant to be run in an executor.
+    The file is rotated when a flush would take it over 'max_bytes',
+      so tracing left on doesn't fill the disk.
+    """
+    def __init__(self, path, max_pending=10000,
+                 max_bytes=TRACE_FILE_MAX_BYTES, backups=TRACE_FILE_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._pending = collections.deque(maxlen=max_pending)
+
+    def export(self, spans):
+        """Queue the spans of a trace for the next flush()."""
+        self._pending.extend(span.as_dict() for span in spans)
+
+    def _rotate(self):
+        """Shift path -> path.1 -> ... -> path.'backups', dropping the oldest."""
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def flush(self):
+        """Append the queued spans to the file, rotating it if full."""
+        if not self._pending:
+            return
+        lines = []
+        while self._pending:
+            lines.append(json.dumps(self._pending.popleft(), default=str))
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "ab") as trace_file:
+            trace_file.write(data)
+
+
+class OpenTelemetryExporter:
+    """
+    Hand finished traces to OpenTelemetry, if it is installed (it is
+      not a requirement of this integration), with the OpenTelemetry
+      SDK/exporter set up by whoever runs it.
+    """
+    def __init__(self, name=__name__):
+        from opentelemetry import trace  # pylint: disable=import-outside-toplevel
+        self._trace = trace
+        self._tracer = trace.get_tracer(name)
+
+    def export(self, spans):
+        """Replay a trace, parents first, as OpenTelemetry spans."""
+        by_id = {}
+        for span in sorted(spans, key=lambda span: span.start):
+            parent = by_id.get(span.parent_id)
+            context = self._trace.set_span_in_context(parent) \
+                if parent is not None else None
+            start_ns = int(span.start * 1e9)
+            otel_span = self._tracer.start_span(
+                span.name, context=context, start_time=start_ns,
+                attributes={key: value for key, value
+                            in span.attributes.items()
+                            if isinstance(value, (str, bool, int, float))})
+            by_id[span.span_id] = otel_span
+            otel_span.end(end_time=start_ns + int(span.duration * 1e9))
+
+    def flush(self):
+        """OpenTelemetry exports on its own."""
+
+
 class WralWeather:
     """WRAL object for gleaning and storing information from Web page"""
-    def __init__(self, session, zipcode='27606'):
+    def __init__(self, session, zipcode='27606',
+                 num_hours=NUM_FORECAST_HOURS, parse_mode=PARSE_MODE_LOOP,
+                 tracer=None, urls=None):
         _LOGGER.debug("Initing wral zipcode: %s", zipcode)
         if zipcode is None:
             self.zipcode = DEFAULT_ZIPCODE
         else:
             self.zipcode = zipcode
+        self.num_hours = num_hours
+        self.parse_mode = parse_mode
+        # Time (seconds) the last update held the caller's event loop
+        #   while decoding/parsing/swapping in the weather data.
+        self.loop_stall = 0.0
+        # Seconds each parse stage took in the last update
+        #   (see add_timing_totals)
+        self.parse_timings = {}
+        # Fields/sections that could not be parsed ("section.field"
+        #   or "section"), since setup and in the last update
+        self.parse_errors = collections.Counter()
+        self.last_parse_errors = collections.Counter()
+        self.metrics = WralMetrics()
+        # Spans of the update stages, off unless given a tracer
+        self.tracer = tracer if tracer is not None else NO_TRACER
         self.client = session
-        self._get_city_url = URLS['city_search_pre'] + self.zipcode
-        self._get_weather_url = URLS['weather_pre']
+        # The WRAL API, unless pointed elsewhere (ex. a local stand-in)
+        self.urls = urls if urls is not None else URLS
+        self._get_city_url = self.urls['city_search_pre'] + self.zipcode
+        self._get_weather_url = self.urls['weather_pre']
         self.curr_dict = {}
         self.forecast_daily_list = []
+        self.forecast_hourly_list = []
+        # Bumped on every successful update
+        self.generation = 0
+        # Whether the last update brought new current observations
+        #   (see polling.AdaptivePolling), None before the first one
+        self.observations_changed = None
+        self.forecast_index = ForecastIndex()
+        self._forecast_twice_daily_list = []
+        self._forecast_twice_daily_generation = 0
+
+    @property
+    def forecast_twice_daily_list(self):
+        """
+        Day/night forecast derived from the daily forecast.
+        Only built when asked for, and then once per update.
+        """
+        if self._forecast_twice_daily_generation != self.generation:
+            self._forecast_twice_daily_list = \
+                build_forecast_twice_daily(self.forecast_daily_list)
+            self._forecast_twice_daily_generation = self.generation
+        return self._forecast_twice_daily_list
 
     async def update_observation_and_forecast(self):
         """Retrieve Current Observation Web page"""
-
+        try:
+            with self.tracer.span("update", zipcode=self.zipcode):
+                await self._async_update()
+        except Exception:
+            # Nothing is known about the observations of a failed update
+            self.observations_changed = None
+            self.metrics.record_failure()
+            raise
+        self.metrics.record_success()
+        return True
+
+    async def _async_get_city_id(self):
+        """Look up the WRAL city id of the zipcode."""
         _LOGGER.debug("First query for city id ... ")
-        async with self.client.get(self._get_city_url) as resp:
-            try:
-                # assert resp.status == 200
-                resp.raise_for_status()
-            except ERRORS as status:
-                # except:
-                _LOGGER.debug("Failed to get City ID %s", status)
-                city_id = DEFAULT_CITYID
-            finally:
-                _LOGGER.debug("Getting City ID..Status= %s",
-                              resp.status)
-                city_json = await resp.json()
-                _LOGGER.debug("city_json: %s", city_json)
-                city_id = city_json['data'][0]['id']
-
-            _LOGGER.debug("city_id %s", city_id)
+        start = time.perf_counter()
+        with self.tracer.span("city_lookup") as span:
+            async with self.client.get(self._get_city_url) as resp:
+                span.set(status=resp.status)
+                try:
+                    # assert resp.status == 200
+                    resp.raise_for_status()
+                    found = True
+                except ERRORS as status:
+                    # except:
+                    _LOGGER.debug("Failed to get City ID %s", status)
+                    city_id = DEFAULT_CITYID
+                    found = False
+                finally:
+                    _LOGGER.debug("Getting City ID..Status= %s",
+                                  resp.status)
+                    city_json = await resp.json()
+                    _LOGGER.debug("City search found %d cities",
+                                  len(city_json.get('data') or ()))
+                    city_id = parse_city_search(city_json)
+                    if city_id is None:
+                        _LOGGER.debug("No city for zipcode %s", self.zipcode)
+                        city_id = DEFAULT_CITYID
+                        found = False
+
+                _LOGGER.debug("city_id %s", city_id)
+        self.metrics.observe("city_lookup", time.perf_counter() - start)
+        if found:
+            CITY_IDS.put(self.zipcode, city_id)
+        return city_id
+
+    async def _async_update(self):
+        """Get the city id (if not cached), then the weather."""
+        city_id = CITY_IDS.get(self.zipcode)
+        if city_id is None:
+            city_id = await self._async_get_city_id()
+        else:
+            _LOGGER.debug("city_id %s (cached)", city_id)
 
         _LOGGER.debug("Now query for weather... ")
-        self._get_weather_url = URLS['weather_pre'] + city_id
-        async with self.client.get(self._get_weather_url) as resp:
-            try:
-                # assert resp.status == 200
-                resp.raise_for_status()
-            except ERRORS as status:
-                # except:
-                _LOGGER.debug("Failed to get Weather %s", status)
-            finally:
-                _LOGGER.debug("Getting Weather..Status= %s",
-                              resp.status)
-            weather_json = await resp.json()
-            current_json = weather_json['data']['currentObservations']
-            _LOGGER.debug("========Update Current Observations======== ")
-            _LOGGER.debug("current_json: %s", current_json)
-            _LOGGER.debug("")
-
-            self.curr_dict = parse_current_conditions(current_json)
-
-            #Process 7 day Forecast
-            _LOGGER.debug("========Update Daily Forecasts========")
-            forecast_day_json = weather_json['data']['forecast']
-            self.forecast_daily_list = parse_forecast_daily(forecast_day_json)
-
-            #Process Hourly Forecast
-            _LOGGER.debug("========Update Hourly Forecasts========")
-            forecast_hour_json = weather_json['data']['forecast']
-            self.forecast_hourly_list = parse_forecast_hourly(forecast_hour_json)
-
-            return True
+        self._get_weather_url = self.urls['weather_pre'] + str(city_id)
+        start = time.perf_counter()
+        with self.tracer.span("weather_get") as span:
+            async with self.client.get(self._get_weather_url) as resp:
+                ttfb = time.perf_counter() - start
+                self.metrics.observe("ttfb", ttfb)
+                try:
+                    # assert resp.status == 200
+                    resp.raise_for_status()
+                except ERRORS as status:
+                    # except:
+                    _LOGGER.debug("Failed to get Weather %s", status)
+                finally:
+                    _LOGGER.debug("Getting Weather..Status= %s",
+                                  resp.status)
+                body = await resp.read()
+            span.set(status=resp.status, ttfb=ttfb, bytes=len(body))
+        self.metrics.observe("weather_fetch", time.perf_counter() - start)
+        self.metrics.observe("payload_bytes", len(body))
+
+        # Nothing new (ex. from a caching proxy), keep the current data
+        if resp.status == 304 and self.generation:
+            _LOGGER.debug("Weather not modified, keeping update %d",
+                          self.generation)
+            self.observations_changed = False
+            return
+
+        with self.tracer.span("parse", mode=self.parse_mode):
+            await self.async_parse_weather(body)
+
+    def _record_parse_spans(self, wall_start, timings, errors):
+        """
+        Add a span for each parse stage from its timing.  The stages ran
+          one after another on the loop, or else the sections ran at the
+          same time between the decode and the index.
+        """
+        stage_start = wall_start
+        self.tracer.record("decode", stage_start, timings["decode"])
+        stage_start += timings["decode"]
+        sections_end = stage_start
+        for section in ("current", "daily", "hourly"):
+            section_errors = sum(count for key, count in errors.items()
+                                 if key.split(".", 1)[0] == section)
+            self.tracer.record(section, stage_start, timings[section],
+                               errors=section_errors)
+            if self.parse_mode == PARSE_MODE_LOOP:
+                stage_start += timings[section]
+                sections_end = stage_start
+            else:
+                sections_end = max(sections_end,
+                                   stage_start + timings[section])
+        self.tracer.record("index", sections_end, timings["index"])
+
+    async def async_parse_weather(self, body):
+        """
+        Decode and parse a '/api/weather' response body, per 'parse_mode',
+          then swap the results in.
+        A section that could not be parsed keeps its previous data, only
+          when none of them could be is it an error.
+        """
+        wall_start = time.time()
+        if self.parse_mode == PARSE_MODE_LOOP:
+            start = time.perf_counter()
+            snapshot, timings, errors = \
+                decode_and_parse_weather(body, self.num_hours)
+        else:
+            snapshot, timings, errors = await self._async_parse_sections(body)
+            start = time.perf_counter()
+
+        self.last_parse_errors = errors
+        self.parse_errors.update(errors)
+        curr_dict, daily, hourly, forecast_index = snapshot
+        failed = [section for section, result in (("current", curr_dict),
+                                                  ("daily", daily),
+                                                  ("hourly", hourly))
+                  if result is None]
+        if len(failed) == 3:
+            raise ValueError("None of the weather sections could be parsed")
+        if failed:
+            _LOGGER.warning("Could not parse the %s weather for %s, "
+                            "keeping the previous data",
+                            ", ".join(failed), self.zipcode)
+        elif errors:
+            _LOGGER.debug("Weather fields that could not be read: %s",
+                          dict(errors))
+
+        self.observations_changed = \
+            curr_dict is not None and curr_dict != self.curr_dict
+        if curr_dict is not None:
+            self.curr_dict = curr_dict
+        if daily is not None:
+            self.forecast_daily_list = daily
+        if hourly is not None:
+            self.forecast_hourly_list = hourly
+        if forecast_index is None:
+            forecast_index, timings["index"] = _timed(
+                ForecastIndex, self.forecast_daily_list,
+                self.forecast_hourly_list)
+        self.forecast_index = forecast_index
+        self.generation += 1
+        self.forecast_index.generation = self.generation
+
+        self.loop_stall = time.perf_counter() - start
+        self.parse_timings = add_timing_totals(timings)
+        self.metrics.observe_parse(timings)
+        if self.tracer.enabled:
+            self._record_parse_spans(wall_start, timings, errors)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Weather for %s parsed (%s): %s, "
+                          "event loop held for %.2f ms", self.zipcode,
+                          self.parse_mode,
+                          _parse_summary(len(body), snapshot, timings, errors),
+                          self.loop_stall * 1000)
+
+    async def _async_parse_sections(self, body):
+        """
+        Decode in an executor thread, then parse the current, daily and
+          hourly sections at the same time in the 'parse_mode' executor,
+          and build the index from the joined results.
+        Only the projected part of the payload a section needs is handed
+          to it (see project_weather), which matters for the process
+          pool as it has to be pickled.
+        Returns the same as parse_weather().
+        """
+        loop = asyncio.get_running_loop()
+        if self.parse_mode == PARSE_MODE_PROCESS:
+            executor = await loop.run_in_executor(None, _get_process_pool)
+            parser = _parser_module()
+        else:
+            executor = None  # the loop's default executor
+            parser = sys.modules[__name__]
+
+        (current_json, forecast_day_json, forecast_hour_json), decode_time = \
+            await loop.run_in_executor(
+                None, _timed, decode_weather, body, self.num_hours)
+        (curr_dict, current_time, current_errors), \
+            (daily, daily_time, daily_errors), \
+            (hourly, hourly_time, hourly_errors) = await asyncio.gather(
+                loop.run_in_executor(
+                    executor, parser._parse_section, "current",
+                    parser.parse_current_conditions, current_json),
+                loop.run_in_executor(
+                    executor, parser._parse_section, "daily",
+                    parser.parse_forecast_daily, forecast_day_json),
+                loop.run_in_executor(
+                    executor, parser._parse_section, "hourly",
+                    parser.parse_forecast_hourly, forecast_hour_json,
+                    self.num_hours),
+            )
+        del current_json, forecast_day_json, forecast_hour_json
+        if daily is None or hourly is None:
+            forecast_index, index_time = None, 0.0
+        else:
+            forecast_index, index_time = await loop.run_in_executor(
+                None, _timed, ForecastIndex, daily, hourly)
+        timings = {
+            "decode": decode_time,
+            "current": current_time,
+            "daily": daily_time,
+            "hourly": hourly_time,
+            "index": index_time,
+        }
+        errors = current_errors + daily_errors + hourly_errors
+        return (curr_dict, daily, hourly, forecast_index), timings, errors